@@ -1,8 +1,10 @@
 """Flask 웹 애플리케이션 메인"""
-from flask import Flask, render_template, request, jsonify, send_file
+from flask import Flask, render_template, request, jsonify, send_file, g, abort, Response
 from config import Config
 from modules import PubMedSearcher, PaperAnalyzer, BlogGenerator
+from modules.metrics import CONTENT_TYPE, get_registry
 import os
+import time
 from datetime import datetime
 import traceback
 
@@ -12,6 +14,25 @@ app.config.from_object(Config)
 # 출력 디렉토리 생성
 os.makedirs(Config.OUTPUT_DIR, exist_ok=True)
 
+# HTTP 요청 메트릭
+_HTTP_REQUESTS = get_registry().counter('blog_http_requests_total', 'HTTP 요청 수', ('method', 'endpoint', 'status'))
+_HTTP_LATENCY = get_registry().histogram('blog_http_request_duration_seconds', 'HTTP 요청 처리 시간', ('endpoint',))
+
+
+@app.before_request
+def _start_timer():
+    g.request_start = time.time()
+
+
+@app.after_request
+def _record_request(response):
+    # 라우트 이름 기준 (경로 파라미터별로 라벨이 늘어나지 않도록)
+    endpoint = request.endpoint or 'unknown'
+    _HTTP_REQUESTS.inc(method=request.method, endpoint=endpoint, status=response.status_code)
+    if 'request_start' in g:
+        _HTTP_LATENCY.observe(time.time() - g.request_start, endpoint=endpoint)
+    return response
+
 
 @app.route('/')
 def index():
@@ -154,6 +175,14 @@ def health_check():
         return jsonify({'status': 'unhealthy', 'error': str(e)}), 500
 
 
+@app.route('/metrics')
+def metrics():
+    """Prometheus 메트릭 (로컬 요청만 허용)"""
+    if request.remote_addr not in ('127.0.0.1', '::1'):
+        abort(404)
+    return Response(get_registry().render(), content_type=CONTENT_TYPE)
+
+
 if __name__ == '__main__':
     # 설정 검증
     try:
@@ -22,6 +22,7 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from modules.smart_topic_extractor import SmartTopicExtractor
 from modules.pubmed_search import PubMedSearcher
+from modules.tracing import get_tracer, trace_context
 from config import Config
 
 
@@ -167,4 +168,13 @@ if __name__ == "__main__":
         sys.exit(1)
 
     keyword = sys.argv[1]
-    run_pipeline(keyword)
+    trace_id = f"pipeline_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    with trace_context(trace_id):
+        run_pipeline(keyword)
+
+    # 단계별 소요 시간 (chrome://tracing 또는 Perfetto에서 열기)
+    tracer = get_tracer()
+    if tracer.enabled:
+        trace_path = tracer.export_chrome_trace(os.path.join(Config.TRACE_DIR, f"{trace_id}.json"), trace_id)
+        print(f"\n⏱️ 단계별 소요 시간 (trace: {trace_path})")
+        print(tracer.format_histograms())
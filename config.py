@@ -21,6 +21,20 @@ class Config:
 
     # Telegram Bot
     TELEGRAM_BOT_TOKEN = os.environ.get('TELEGRAM_BOT_TOKEN')
+    # /stats 명령을 쓸 수 있는 관리자 텔레그램 사용자 ID (쉼표 구분)
+    ADMIN_USER_IDS = {int(x) for x in os.environ.get('ADMIN_USER_IDS', '').split(',') if x.strip().isdigit()}
+
+    # 텔레그램 봇 실행 모드 ('polling' 또는 'webhook')
+    BOT_MODE = os.environ.get('BOT_MODE', 'polling')
+    BOT_WORKERS = int(os.environ.get('BOT_WORKERS', 4))  # 웹훅 모드 워커 프로세스 수 (user_id로 분배)
+    WEBHOOK_URL = os.environ.get('WEBHOOK_URL', '')  # 텔레그램에 등록할 외부 URL (예: https://bot.example.com)
+    WEBHOOK_PATH = os.environ.get('WEBHOOK_PATH', '/telegram')
+    WEBHOOK_LISTEN = os.environ.get('WEBHOOK_LISTEN', '0.0.0.0')
+    WEBHOOK_PORT = int(os.environ.get('WEBHOOK_PORT', 8443))
+    WEBHOOK_SECRET = os.environ.get('WEBHOOK_SECRET', '')  # X-Telegram-Bot-Api-Secret-Token 검증값
+    WEBHOOK_CERT = os.environ.get('WEBHOOK_CERT', '')  # 직접 HTTPS 종단할 때 인증서/키 경로
+    WEBHOOK_KEY = os.environ.get('WEBHOOK_KEY', '')
+    WEBHOOK_PUBLIC_CERT = os.environ.get('WEBHOOK_PUBLIC_CERT', '0') == '1'  # 자체 서명 인증서를 텔레그램에 업로드
 
     # 검색 설정
     DEFAULT_PAPER_COUNT = 12
@@ -30,6 +44,8 @@ class Config:
     # 시리즈 블로그 설정
     MAX_RELATED_KEYWORDS = 15  # 웹 검색에서 추출할 최대 연관 키워드 수
     MIN_PAPERS_PER_CATEGORY = 3  # 시리즈 글 생성에 필요한 카테고리당 최소 논문 수
+    SERIES_WORKERS = int(os.environ.get('SERIES_WORKERS', 3))  # 동시에 생성할 에피소드 수
+    SERIES_MAX_RETRIES = 2  # 에피소드 생성 실패 시 재시도 횟수
 
     # 논문 카테고리 설정
     PAPER_CATEGORIES = [
@@ -41,6 +57,60 @@ class Config:
         'complications' # 합병증
     ]
 
+    # 관련성 점수 로컬 사전평가 (BM25) - 중간 구간만 Claude로 평가
+    PRERANK_ENABLED = os.environ.get('PRERANK_DISABLED', '0') != '1'
+    PRERANK_ACCEPT_SCORE = 85  # 이상이면 로컬 채택
+    PRERANK_REJECT_SCORE = 15  # 미만이면 로컬 미채택 (키워드 용어가 거의 없음)
+
+    # LLM 프롬프트 토큰 예산 (공통 지시문 제외, 호출 종류별)
+    PROMPT_TOKEN_BUDGETS = {
+        'scoring': 6000,    # 관련성 점수 평가 배치
+        'analysis': 5000,   # 논문 분석
+        'paper_analysis': 1500,  # 논문 한 편 분석 (파이프라인)
+        'topics': 15000,    # 블로그 토픽 추출
+        'html': 2500,       # HTML 생성 시 분석 결과
+    }
+    # 호출 종류별 목표 응답 시간 (초) - 관측 지연에 따라 예산 자동 축소
+    LLM_LATENCY_TARGETS = {
+        'scoring': 90,
+        'analysis': 150,
+        'paper_analysis': 60,
+        'topics': 90,
+        'html': 150,
+    }
+
+    # HTML 생성 스트리밍 (stream-json) - 파일 이어쓰기 + 텔레그램 미리보기
+    LLM_STREAMING = os.environ.get('LLM_STREAMING', '1') == '1'
+    STREAM_PREVIEW_INTERVAL = 10  # 미리보기 갱신 최소 간격 (초)
+
+    # 프로세스 전체 동시 LLM 호출 수 (Claude CLI 프로세스 + API 요청, 파이프라인/작업 내부 스레드 풀 포함)
+    LLM_MAX_CONCURRENCY = int(os.environ.get('LLM_MAX_CONCURRENCY', 4))
+
+    # 점수 평가 → 분석 파이프라인 (Hook 스타일 선택 중 백그라운드 분석)
+    PIPELINE_ENABLED = os.environ.get('PIPELINE_DISABLED', '0') != '1'
+    PIPELINE_MAX_PAPERS = 12  # 미리 분석할 최대 채택 논문 수
+    PIPELINE_WORKERS = 3      # 동시 분석 수 (모든 세션이 공유하는 스레드 풀 크기)
+    PIPELINE_COLLECT_TIMEOUT = 300  # 블로그 생성 시 남은 분석 대기 시간 (초)
+
+    # 텔레그램 봇 백그라운드 작업 (토픽 분석, 논문 검색, 블로그 생성)
+    # 웹훅 모드에서는 워커 프로세스마다 작업 관리자가 따로 있어 아래 전체/종류별 상한을 BOT_WORKERS로 나눠 적용 (워커당 최소 1)
+    JOB_WORKERS = int(os.environ.get('JOB_WORKERS', 4))  # 동시에 실행할 작업 수 (전체)
+    JOB_MAX_PER_USER = 1  # 사용자당 동시 실행 작업 수 (나머지는 대기열)
+    JOB_KIND_LIMITS = {'papers': 3, 'blog': 2, 'prefetch': 1}  # 종류별 동시 실행 상한 (NCBI 요청, Claude CLI 프로세스 수 제한)
+    JOB_PRIORITIES = {'topics': 0, 'papers': 1, 'blog': 2, 'prefetch': 3}  # 낮을수록 먼저 실행 (짧은 단계 우선)
+    JOB_DISPATCH_INTERVAL = 1.0  # 작업 진행/완료 이벤트 전달 주기 (초)
+
+    # 텔레그램 발신 속도 제한 (Bot API 권장 한도)
+    TG_GLOBAL_RATE = 25.0             # 봇 전체 초당 요청 수 (한도 30)
+    TG_PRIVATE_CHAT_RATE = 1.0        # 개인 채팅 초당 요청 수
+    TG_GROUP_CHAT_RATE = 20 / 60      # 그룹 채팅 초당 요청 수 (분당 20건)
+    TG_CHAT_BURST = 3                 # 채팅별 순간 최대 요청 수
+    TG_MAX_RETRIES = 3                # 429 RetryAfter 재시도 횟수
+
+    # PaperAnalyzer 맵-리듀스 분석 (논문별 구조화 추출 → 종합)
+    MAP_REDUCE_MIN_PAPERS = 8   # 이 수 이상이면 맵-리듀스 사용 (미만은 단일 호출)
+    MAP_REDUCE_WORKERS = 6      # 논문별 추출 동시 호출 수
+
     # 출력 설정
     OUTPUT_DIR = 'output'
     ALLOWED_FORMATS = ['html', 'markdown']
@@ -48,6 +118,44 @@ class Config:
     # 블로그 글 스타일
     BLOG_STYLE = 'hybrid'  # 'academic', 'casual', 'hybrid'
 
+    # 캐시 설정
+    CACHE_DIR = os.environ.get('CACHE_DIR', 'cache')
+    SESSION_DIR = os.environ.get('SESSION_DIR', 'session_data')  # 봇 세션 저장소 (sessions.db)
+    # 기존 session_data/*.json 세션을 가져올 텔레그램 사용자 ID (파일에 소유자가 없으므로 지정해야 가져옴)
+    LEGACY_SESSION_OWNER = int(os.environ['LEGACY_SESSION_OWNER']) if os.environ.get('LEGACY_SESSION_OWNER', '').isdigit() else None
+    SESSION_CACHE_MAX_ENTRIES = int(os.environ.get('SESSION_CACHE_MAX_ENTRIES', 200))  # 메모리에 둘 최대 세션 수
+    SESSION_CACHE_TTL = int(os.environ.get('SESSION_CACHE_TTL', 30 * 60))  # 이 시간(초) 동안 안 쓰면 저장소로 내보냄
+    SESSION_CACHE_MAX_PAPERS = int(os.environ.get('SESSION_CACHE_MAX_PAPERS', 5000))  # 메모리 전체 논문 수 상한
+    SESSION_CACHE_SWEEP_INTERVAL = 60  # 유휴 세션 정리 주기 (초)
+    CHECKPOINT_TTL = int(os.environ.get('CHECKPOINT_TTL', 7 * 24 * 3600))  # 이 시간(초)이 지난 단계 체크포인트는 삭제
+    CHECKPOINT_PURGE_INTERVAL = 3600  # 체크포인트 정리 주기 (초)
+    LLM_CACHE_ENABLED = os.environ.get('LLM_CACHE_DISABLED', '0') != '1'  # LLM_CACHE_DISABLED=1 이면 캐시 우회
+    LLM_CACHE_TTL = int(os.environ.get('LLM_CACHE_TTL', 7 * 24 * 3600))  # 7일
+    LLM_CACHE_MAX_BYTES = int(os.environ.get('LLM_CACHE_MAX_BYTES', 200 * 1024 * 1024))  # 200MB
+    # Anthropic 프롬프트 캐싱 (공통 프리픽스에 cache_control 브레이크포인트)
+    PROMPT_CACHING_ENABLED = os.environ.get('PROMPT_CACHING_DISABLED', '0') != '1'
+
+    # 번역 서비스 ('google' 또는 오프라인/테스트용 'local')
+    TRANSLATION_BACKEND = os.environ.get('TRANSLATION_BACKEND', 'google')
+    TRANSLATION_WORKERS = 4  # 동시 번역 요청 수
+    INSIGHT_WAIT_TIMEOUT = 60  # 목록 표시 전 백그라운드 인사이트 생성 대기 (초)
+
+    # 단계별 소요 시간 추적 (Chrome trace JSON + 단계별 히스토그램)
+    TRACING_ENABLED = os.environ.get('TRACING_DISABLED', '0') != '1'
+    TRACE_MAX_SPANS = 50000  # 메모리에 보관할 최근 스팬 수
+    TRACE_DIR = os.environ.get('TRACE_DIR', 'traces')  # 세션별 trace / 단계 히스토그램 저장 위치
+
+    # 메트릭 (Prometheus 텍스트 형식 /metrics - 로컬에서만 수집)
+    METRICS_HOST = os.environ.get('METRICS_HOST', '127.0.0.1')
+    METRICS_PORT = int(os.environ.get('METRICS_PORT', 9464))  # 봇 메트릭 포트 (0이면 끔, 웹훅 워커는 +워커 번호)
+
+    # 인기 키워드 사전 수집 (한가한 시간대에 토픽/검색/PMC/점수/인사이트 캐시 갱신)
+    WARM_CACHE_TTL = int(os.environ.get('WARM_CACHE_TTL', 2 * 24 * 3600))  # 토픽/검색/PMC 결과 유효 시간 (2일)
+    PREFETCH_KEYWORDS = [k.strip() for k in os.environ.get('PREFETCH_KEYWORDS', '').split(',') if k.strip()]
+    PREFETCH_HOUR = int(os.environ.get('PREFETCH_HOUR', 4))  # 매일 실행 시각 (서버 시간, 시)
+    PREFETCH_TOPICS = 3   # 키워드당 미리 검색할 상위 토픽 수 (키워드 단독, 토픽별, 상위 토픽 전체 조합으로 실행)
+    PREFETCH_PAUSE = 30   # 키워드 사이 대기 시간 (초, NCBI/Claude 호출 분산)
+
     @staticmethod
     def validate():
         """필수 설정 검증"""
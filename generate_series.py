@@ -201,6 +201,8 @@ def main():
                         help='블로그 글 생성 건너뛰기 (논문 수집만)')
     parser.add_argument('--output-dir', type=str, default='output',
                         help='출력 디렉토리 (기본값: output)')
+    parser.add_argument('--force-regenerate', action='store_true',
+                        help='변경되지 않은 에피소드도 모두 다시 생성')
 
     args = parser.parse_args()
 
@@ -313,7 +315,7 @@ def main():
             output_dir=args.output_dir
         )
 
-        results = generator.generate_all_posts(args.topic, valid_categories)
+        results = generator.generate_all_posts(args.topic, valid_categories, force=args.force_regenerate)
 
         if results:
             print("\n" + "=" * 70)
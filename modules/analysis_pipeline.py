@@ -0,0 +1,116 @@
+"""
+점수 평가 → 논문 분석 파이프라인
+- 점수 평가 배치가 끝날 때마다 채택 논문 분석을 백그라운드에서 바로 시작
+- 사용자가 Hook 스타일을 고르는 동안 분석이 진행되어, 블로그 생성 시 HTML 단계만 남음
+- 모든 세션이 스레드 풀 하나(PIPELINE_WORKERS)를 공유하고, 실제 Claude 호출은 llm_runner 슬롯으로 제한
+"""
+
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from config import Config
+from modules.auto_blog_generator import analyze_single_paper_with_claude, combine_paper_analyses
+from modules.tracing import bind
+
+
+# 프로세스 전역 분석 스레드 풀 (세션 수와 무관하게 PIPELINE_WORKERS개)
+_shared_executor = None
+_shared_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _shared_executor
+    with _shared_executor_lock:
+        if _shared_executor is None:
+            _shared_executor = ThreadPoolExecutor(max_workers=Config.PIPELINE_WORKERS, thread_name_prefix='analysis')
+        return _shared_executor
+
+
+class AnalysisPipeline:
+    """채택 논문 조기 분석 파이프라인 (세션당 1개)"""
+
+    def __init__(self, keyword: str, topics: List[str], max_papers: int = None,
+                 executor: ThreadPoolExecutor = None):
+        """
+        Args:
+            keyword: 메인 키워드
+            topics: 선택된 토픽
+            max_papers: 미리 분석할 최대 논문 수
+            executor: 분석을 실행할 스레드 풀 (기본: 모든 세션 공유 풀)
+        """
+        self.keyword = keyword
+        self.topics = list(topics or [])
+        self.max_papers = Config.PIPELINE_MAX_PAPERS if max_papers is None else max_papers
+        self._executor = executor or _get_executor()
+        self._futures: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def submit(self, papers: List[Dict]):
+        """채택된 논문 분석 예약 (점수 평가 콜백으로 사용, 이미 예약된 논문은 무시)"""
+        with self._lock:
+            if self._closed:
+                return
+            for paper in papers:
+                pmid = paper.get('pmid')
+                if not pmid or pmid in self._futures:
+                    continue
+                if len(self._futures) >= self.max_papers:
+                    break
+                self._futures[pmid] = self._executor.submit(
+                    bind(analyze_single_paper_with_claude), paper, self.keyword, self.topics
+                )
+
+    def progress(self) -> Tuple[int, int]:
+        """(완료된 분석 수, 예약된 분석 수)"""
+        with self._lock:
+            futures = list(self._futures.values())
+        return sum(1 for f in futures if f.done()), len(futures)
+
+    def collect(self, papers: List[Dict], timeout: float = None) -> Optional[str]:
+        """
+        남은 분석을 기다린 뒤 papers 순서대로 합친 분석 텍스트 반환
+
+        Args:
+            papers: 블로그에 사용할 논문 (예약되지 않은 논문은 건너뜀)
+            timeout: 전체 대기 시간 (초)
+
+        Returns:
+            분석 텍스트 (성공한 분석이 하나도 없으면 None)
+        """
+        timeout = Config.PIPELINE_COLLECT_TIMEOUT if timeout is None else timeout
+        deadline = time.time() + timeout
+
+        with self._lock:
+            futures = dict(self._futures)
+
+        analyses = {}
+        for paper in papers:
+            future = futures.get(paper.get('pmid'))
+            if future is None:
+                continue
+            try:
+                result, error = future.result(timeout=max(0.0, deadline - time.time()))
+            except Exception as e:
+                print(f"[파이프라인] PMID {paper.get('pmid')} 분석 대기 실패: {type(e).__name__}")
+                continue
+            if result:
+                analyses[paper.get('pmid')] = result
+            else:
+                print(f"[파이프라인] PMID {paper.get('pmid')} 분석 실패: {error}")
+
+        if not analyses:
+            return None
+
+        print(f"[파이프라인] 미리 분석된 논문 {len(analyses)}/{len(futures)}편 사용")
+        return combine_paper_analyses(papers, analyses)
+
+    def close(self):
+        """이 세션의 대기 중인 분석 취소 (실행 중인 분석은 끝까지 실행, 공유 풀은 유지)"""
+        with self._lock:
+            self._closed = True
+            futures = list(self._futures.values())
+        for future in futures:
+            future.cancel()
@@ -3,41 +3,68 @@
 - Claude CLI로 논문 분석 → 블로그 HTML 생성까지 자동화
 """
 
+import contextvars
 import subprocess
 import json
 import os
+import time
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional
 
+from config import Config
+from modules.extraction_store import get_extraction_store
+from modules.llm_paper_analyzer import (
+    build_paper_content, create_paper_analysis_prompt, format_paper_analysis, parse_paper_analysis
+)
+from modules.llm_runner import CLI_MODEL, run_claude_cli, stream_claude_cli
+from modules.metrics import record_cache
+from modules.prompt_packer import fit_texts, token_budget, truncate_to_tokens
+from modules.tracing import annotate, traced
 
-# 전역 에러 로그 저장
-_last_error_log = []
 
-def get_last_error_log() -> List[str]:
-    """마지막 에러 로그 반환"""
-    global _last_error_log
-    return _last_error_log.copy()
+# 분석 프롬프트에 넣을 논문당 최소 토큰 (예산이 부족하면 뒤쪽 논문 제외)
+ANALYSIS_MIN_TOKENS = 200
+
+
+# 호출별 로그 (여러 사용자의 블로그를 동시에 생성해도 섞이지 않도록 컨텍스트 변수로 보관)
+_error_log: contextvars.ContextVar[Optional[List[str]]] = contextvars.ContextVar('blog_error_log', default=None)
 
 def _log(msg: str):
     """로그 저장 및 출력"""
-    global _last_error_log
-    _last_error_log.append(msg)
+    log = _error_log.get()
+    if log is not None:
+        log.append(msg)
     print(msg)
 
-def generate_blog_auto(session_data: Dict, output_dir: str = "output") -> Optional[str]:
+@traced('blog')
+def generate_blog_auto(session_data: Dict, output_dir: str = "output",
+                       on_partial: Optional[Callable[[str], None]] = None,
+                       on_analysis: Optional[Callable[[str], None]] = None,
+                       error_log: Optional[List[str]] = None) -> Optional[str]:
     """
     세션 데이터로 블로그 HTML 자동 생성
 
     Args:
         session_data: 키워드, 토픽, 논문, 스타일 정보 포함
         output_dir: HTML 저장 디렉토리
+        on_partial: 스트리밍 중 부분 HTML을 받을 콜백 (주기적으로 호출, 작업 스레드에서 실행)
+        on_analysis: 1단계(논문 분석) 완료 시 분석 결과를 받을 콜백 (체크포인트 기록용)
+        error_log: 이 호출의 진행/에러 로그를 받을 리스트 (실패 시 사용자에게 표시)
 
     Returns:
         생성된 HTML 파일 경로 (실패 시 None)
     """
-    global _last_error_log
-    _last_error_log = []  # 에러 로그 초기화
+    token = _error_log.set(error_log if error_log is not None else [])
+    try:
+        return _generate_blog(session_data, output_dir, on_partial, on_analysis)
+    finally:
+        _error_log.reset(token)
+
 
+def _generate_blog(session_data: Dict, output_dir: str,
+                   on_partial: Optional[Callable[[str], None]],
+                   on_analysis: Optional[Callable[[str], None]]) -> Optional[str]:
+    """generate_blog_auto 본체 (로그는 _log로 현재 호출의 로그에 기록)"""
     try:
         os.makedirs(output_dir, exist_ok=True)
 
@@ -53,9 +80,14 @@ def generate_blog_auto(session_data: Dict, output_dir: str = "output") -> Option
             _log("[오류] 논문이 없습니다")
             return None
 
-        # 1단계: 논문 분석
-        _log(f"[1단계] 논문 {len(papers)}편 분석 중...")
-        analysis_result, analysis_error = analyze_papers_with_claude(papers, keyword, topics)
+        # 1단계: 논문 분석 (파이프라인에서 미리 분석한 결과가 있으면 재사용)
+        analysis_result = session_data.get('analysis_result')
+        analysis_error = None
+        if analysis_result:
+            _log(f"[1단계] 미리 분석된 결과 사용 ({len(analysis_result)}자)")
+        else:
+            _log(f"[1단계] 논문 {len(papers)}편 분석 중...")
+            analysis_result, analysis_error = analyze_papers_with_claude(papers, keyword, topics)
 
         if not analysis_result:
             _log(f"[오류] 논문 분석 실패")
@@ -64,6 +96,13 @@ def generate_blog_auto(session_data: Dict, output_dir: str = "output") -> Option
             return None
 
         _log(f"[1단계 완료] 분석 결과 {len(analysis_result)}자")
+        if on_analysis:
+            on_analysis(analysis_result)
+
+        # 파일 경로 결정 (스트리밍 모드에서는 생성 중에 이어쓰기)
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        filename = f"{keyword}_blog_{timestamp}.html"
+        filepath = os.path.join(output_dir, filename)
 
         # 2단계: 블로그 HTML 생성
         _log(f"[2단계] 블로그 HTML 생성 중...")
@@ -72,7 +111,9 @@ def generate_blog_auto(session_data: Dict, output_dir: str = "output") -> Option
             topics=topics,
             analysis_result=analysis_result,
             hook_style=hook_style,
-            hook_template=hook_template
+            hook_template=hook_template,
+            stream_path=filepath if Config.LLM_STREAMING else None,
+            on_partial=on_partial
         )
 
         if not html_content:
@@ -83,11 +124,7 @@ def generate_blog_auto(session_data: Dict, output_dir: str = "output") -> Option
 
         _log(f"[2단계 완료] HTML {len(html_content)}자 생성")
 
-        # 3단계: 파일 저장
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        filename = f"{keyword}_blog_{timestamp}.html"
-        filepath = os.path.join(output_dir, filename)
-
+        # 3단계: 파일 저장 (스트리밍 중 쓴 내용을 최종 HTML로 교체)
         with open(filepath, 'w', encoding='utf-8') as f:
             f.write(html_content)
 
@@ -101,6 +138,7 @@ def generate_blog_auto(session_data: Dict, output_dir: str = "output") -> Option
         return None
 
 
+@traced('analysis')
 def analyze_papers_with_claude(papers: List[Dict], keyword: str, topics: List[str]) -> tuple:
     """Claude CLI로 논문 분석
 
@@ -114,19 +152,35 @@ def analyze_papers_with_claude(papers: List[Dict], keyword: str, topics: List[st
     if not accepted_papers:
         accepted_papers = papers[:10]  # fallback: 상위 10개
 
-    # 논문 요약 텍스트 생성 (더 짧게)
+    # 구조화 추출 결과가 저장된 논문은 다시 분석하지 않음
+    stored = get_extraction_store().get_for_papers(accepted_papers)
+    known = {pmid: format_paper_analysis(extraction) for pmid, extraction in stored.items()}
+    known_text = combine_paper_analyses(accepted_papers, known)
+    pending_papers = [p for p in accepted_papers if p.get('pmid') not in known]
+    annotate(keyword=keyword, papers=len(accepted_papers), cache_hits=len(known))
+    record_cache('extraction', hits=len(known), misses=len(pending_papers))
+
+    if not pending_papers:
+        _log(f"[분석] 저장된 추출 결과로 논문 {len(known)}편 분석 생략")
+        return known_text, None
+
+    # 논문 요약 텍스트 생성 (토큰 예산 안에서 최대한 많은 논문 포함)
+    contents = []
+    for paper in pending_papers:
+        abstract = paper.get('abstract', '')
+        conclusion = paper.get('conclusion', '')
+        contents.append(conclusion if conclusion else abstract)
+
+    fitted = fit_texts(contents, token_budget('analysis'), min_tokens=ANALYSIS_MIN_TOKENS)
+    analyzed_count = len(fitted)
+
     papers_text = ""
-    for i, paper in enumerate(accepted_papers[:8], 1):  # 최대 8편으로 줄임
+    for i, (paper, content) in enumerate(zip(pending_papers, fitted), len(known) + 1):
         title = paper.get('title', '')[:100]  # 제목 100자로 제한
-        abstract = paper.get('abstract', '')[:400]  # 초록 400자로 제한
-        conclusion = paper.get('conclusion', '')[:400]
-        score = paper.get('관련성점수', 'N/A')
-
-        content = conclusion if conclusion else abstract
 
         papers_text += f"""
 [논문 {i}] {title}
-{content[:400]}
+{content}
 """
 
     topics_str = ", ".join(topics) if topics else "없음"
@@ -138,41 +192,9 @@ def analyze_papers_with_claude(papers: List[Dict], keyword: str, topics: List[st
 각 논문의 핵심 발견과 실용 조언을 요약해주세요."""
 
     try:
-        import uuid
-
-        # 현재 디렉토리에 임시 파일 생성 (경로 문제 회피)
-        prompt_file = f'_claude_temp_{uuid.uuid4().hex[:8]}.txt'
-        with open(prompt_file, 'w', encoding='utf-8') as f:
-            f.write(prompt)
+        _log(f"[분석] 프롬프트 길이: {len(prompt)}자, 논문 {analyzed_count}편 (저장된 추출 {len(known)}편)")
 
-        _log(f"[분석] 프롬프트 길이: {len(prompt)}자, 논문 {len(accepted_papers[:8])}편")
-
-        try:
-            # 환경 변수 설정 (Claude CLI 인증용)
-            env = os.environ.copy()
-            home_dir = os.path.expanduser('~')
-            env['HOME'] = home_dir
-            env['USERPROFILE'] = home_dir
-
-            # ANTHROPIC_API_KEY 제거 (있으면 CLI가 OAuth 대신 API키 사용 시도)
-            if 'ANTHROPIC_API_KEY' in env:
-                del env['ANTHROPIC_API_KEY']
-
-            # cmd /c로 실행 (Windows 콘솔 환경 상속)
-            result = subprocess.run(
-                ['cmd', '/c', f'type {prompt_file} | claude -p --output-format text'],
-                capture_output=True,
-                text=True,
-                timeout=300,
-                encoding='utf-8',
-                env=env
-            )
-        finally:
-            # 임시 파일 삭제
-            try:
-                os.remove(prompt_file)
-            except:
-                pass
+        result = run_claude_cli(prompt, timeout=300, kind='analysis')
 
         if result.returncode != 0:
             error_msg = f"returncode={result.returncode}\nstderr: {result.stderr[:300] if result.stderr else 'empty'}\nstdout: {result.stdout[:300] if result.stdout else 'empty'}"
@@ -183,6 +205,9 @@ def analyze_papers_with_claude(papers: List[Dict], keyword: str, topics: List[st
         if not output:
             return None, "빈 응답"
 
+        if known_text:
+            output = f"{known_text}\n\n{output}"
+
         return output, None
 
     except subprocess.TimeoutExpired:
@@ -193,18 +218,80 @@ def analyze_papers_with_claude(papers: List[Dict], keyword: str, topics: List[st
         return None, f"{type(e).__name__}: {e}"
 
 
+@traced('analysis.paper')
+def analyze_single_paper_with_claude(paper: Dict, keyword: str, topics: List[str]) -> tuple:
+    """Claude CLI로 논문 한 편 구조화 추출 (파이프라인에서 점수 평가와 동시에 실행)
+    - 키워드와 무관한 PAPER_ANALYSIS_PROMPT를 사용하여 결과를 PMID별로 저장/재사용
+
+    Returns:
+        (result, error) - 성공 시 (result, None), 실패 시 (None, error_message)
+    """
+    store = get_extraction_store()
+    stored = store.get_for_papers([paper])
+    annotate(pmid=paper.get('pmid'), cache_hit=paper.get('pmid') in stored)
+    record_cache('extraction', hits=len(stored), misses=1 - len(stored))
+    if paper.get('pmid') in stored:
+        return format_paper_analysis(stored[paper['pmid']]), None
+
+    content = truncate_to_tokens(build_paper_content(paper), token_budget('paper_analysis'))
+    prompt = create_paper_analysis_prompt(paper, content)
+
+    try:
+        result = run_claude_cli(prompt, timeout=180, kind='paper_analysis')
+
+        if result.returncode != 0:
+            return None, f"returncode={result.returncode}\nstderr: {result.stderr[:300] if result.stderr else 'empty'}"
+
+        output = result.stdout.strip()
+        if not output:
+            return None, "빈 응답"
+
+        extraction = parse_paper_analysis(output)
+        if not extraction:
+            # JSON이 아니면 응답 그대로 사용 (저장하지 않음)
+            return output, None
+
+        store.save(paper, extraction, model=CLI_MODEL)
+        return format_paper_analysis(extraction), None
+
+    except subprocess.TimeoutExpired:
+        return None, "시간 초과 (3분)"
+    except FileNotFoundError:
+        return None, "Claude CLI를 찾을 수 없습니다"
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}"
+
+
+def combine_paper_analyses(papers: List[Dict], analyses: Dict[str, str]) -> str:
+    """논문별 분석 결과를 논문 순서대로 하나의 분석 텍스트로 합치기"""
+    parts = []
+    for paper in papers:
+        summary = analyses.get(paper.get('pmid'))
+        if summary:
+            parts.append(f"[논문 {len(parts) + 1}] {paper.get('title', '')[:100]}\n{summary}")
+    return "\n\n".join(parts)
+
+
+@traced('html')
 def generate_html_with_claude(keyword: str, topics: List[str], analysis_result: str,
-                              hook_style: str, hook_template: str) -> tuple:
+                              hook_style: str, hook_template: str,
+                              stream_path: Optional[str] = None,
+                              on_partial: Optional[Callable[[str], None]] = None) -> tuple:
     """Claude CLI로 블로그 HTML 생성
 
+    Args:
+        stream_path: 지정하면 스트리밍 모드 - 생성되는 HTML을 임시 파일(stream_path + '.part')에
+            이어쓰고 성공하면 stream_path로 교체 (실패하면 임시 파일 삭제)
+        on_partial: 스트리밍 중 부분 HTML 콜백
+
     Returns:
         (result, error) - 성공 시 (result, None), 실패 시 (None, error_message)
     """
 
     topics_str = ", ".join(topics) if topics else ""
 
-    # 분석 결과 길이 제한
-    analysis_short = analysis_result[:2000] if analysis_result else ""
+    # 분석 결과 길이 제한 (토큰 예산 기준)
+    analysis_short = truncate_to_tokens(analysis_result, token_budget('html')) if analysis_result else ""
 
     prompt = f"""키워드 '{keyword}'에 대한 블로그 HTML을 작성하세요.
 
@@ -213,42 +300,20 @@ def generate_html_with_claude(keyword: str, topics: List[str], analysis_result:
 
 HTML 형식으로 2000자 내외로 작성하세요."""
 
+    annotate(keyword=keyword, streaming=bool(stream_path))
     try:
-        import uuid
-
-        # 현재 디렉토리에 임시 파일 생성 (경로 문제 회피)
-        prompt_file = f'_claude_temp_{uuid.uuid4().hex[:8]}.txt'
-        with open(prompt_file, 'w', encoding='utf-8') as f:
-            f.write(prompt)
-
         _log(f"[HTML] 프롬프트 길이: {len(prompt)}자")
 
-        try:
-            # 환경 변수 설정 (Claude CLI 인증용)
-            env = os.environ.copy()
-            home_dir = os.path.expanduser('~')
-            env['HOME'] = home_dir
-            env['USERPROFILE'] = home_dir
-
-            # ANTHROPIC_API_KEY 제거 (있으면 CLI가 OAuth 대신 API키 사용 시도)
-            if 'ANTHROPIC_API_KEY' in env:
-                del env['ANTHROPIC_API_KEY']
-
-            # cmd /c로 실행 (Windows 콘솔 환경 상속)
-            result = subprocess.run(
-                ['cmd', '/c', f'type {prompt_file} | claude -p --output-format text'],
-                capture_output=True,
-                text=True,
-                timeout=300,
-                encoding='utf-8',
-                env=env
-            )
-        finally:
-            # 임시 파일 삭제
+        if stream_path:
+            writer = StreamingHTMLWriter(stream_path, on_partial=on_partial)
             try:
-                os.remove(prompt_file)
-            except:
-                pass
+                result = stream_claude_cli(prompt, writer.feed, timeout=300, kind='html')
+                if result.returncode == 0 and result.stdout.strip():
+                    writer.commit()
+            finally:
+                writer.discard()  # commit 후에는 아무것도 하지 않음
+        else:
+            result = run_claude_cli(prompt, timeout=300, kind='html')
 
         if result.returncode != 0:
             error_msg = f"returncode={result.returncode}\nstderr: {result.stderr[:300] if result.stderr else 'empty'}\nstdout: {result.stdout[:300] if result.stdout else 'empty'}"
@@ -271,8 +336,82 @@ HTML 형식으로 2000자 내외로 작성하세요."""
         return None, f"{type(e).__name__}: {e}"
 
 
+class StreamingHTMLWriter:
+    """
+    스트리밍 응답을 임시 HTML 파일에 이어쓰고 주기적으로 부분 HTML 전달
+
+    생성이 끝나기 전에는 최종 경로에 파일을 만들지 않음
+    → 성공하면 commit()으로 최종 경로로 교체, 실패하면 discard()로 임시 파일 삭제
+    """
+
+    def __init__(self, filepath: str, on_partial: Optional[Callable[[str], None]] = None,
+                 interval: float = None):
+        """
+        Args:
+            filepath: 최종 HTML 파일 (생성 중에는 filepath + '.part'에 씀)
+            on_partial: 부분 HTML 콜백
+            interval: 파일 갱신/콜백 최소 간격 (초)
+        """
+        self.filepath = filepath
+        self.part_path = filepath + '.part'
+        self.on_partial = on_partial
+        self.interval = Config.STREAM_PREVIEW_INTERVAL if interval is None else interval
+        self.chunks: List[str] = []
+        self.written = ""
+        self._last_flush = time.time()
+        self._file = open(self.part_path, 'w', encoding='utf-8')
+
+    def feed(self, chunk: str):
+        """텍스트 조각 추가 (HTML 추출/파일 쓰기는 interval마다 한 번)"""
+        self.chunks.append(chunk)
+        now = time.time()
+        if now - self._last_flush >= self.interval:
+            self._last_flush = now
+            self._flush(notify=True)
+
+    def close(self):
+        """남은 내용 쓰고 파일 닫기"""
+        if self._file.closed:
+            return
+        self._flush(notify=False)
+        self._file.close()
+
+    def commit(self):
+        """임시 파일을 최종 경로로 교체 (생성 성공 시)"""
+        self.close()
+        os.replace(self.part_path, self.filepath)
+
+    def discard(self):
+        """임시 파일 삭제 (생성 실패 시, commit 후에는 아무것도 하지 않음)"""
+        if not self._file.closed:
+            self._file.close()
+        try:
+            os.remove(self.part_path)
+        except FileNotFoundError:
+            pass
+
+    def _flush(self, notify: bool):
+        html = _extract_html(''.join(self.chunks))
+
+        if html.startswith(self.written):
+            # 코드 블록 표시 등이 바뀌지 않았으면 새 부분만 이어쓰기
+            self._file.write(html[len(self.written):])
+        else:
+            self._file.seek(0)
+            self._file.truncate()
+            self._file.write(html)
+        self._file.flush()
+        self.written = html
+
+        if notify and self.on_partial and html:
+            try:
+                self.on_partial(html)
+            except Exception as e:
+                print(f"[스트리밍 미리보기 오류] {e}")
+
+
 def _extract_html(response: str) -> str:
-    """응답에서 HTML 추출"""
+    """응답에서 HTML 추출 (스트리밍 중인 미완성 응답도 처리)"""
     import re
 
     # ```html 블록 찾기
@@ -285,6 +424,11 @@ def _extract_html(response: str) -> str:
     if code_match:
         return code_match.group(1).strip()
 
+    # 아직 닫히지 않은 코드 블록 (스트리밍 중)
+    open_match = re.search(r'```(?:html)?\s*(.*)$', response, re.DOTALL)
+    if open_match:
+        return open_match.group(1).rstrip('`').strip()
+
     # HTML 태그로 시작하면 전체 반환
     if response.strip().startswith('<'):
         return response.strip()
@@ -3,6 +3,10 @@ from anthropic import Anthropic
 from typing import Dict
 from datetime import datetime
 
+from .extraction_store import get_extraction_store
+from .llm_paper_analyzer import format_paper_analysis
+from .llm_runner import build_cached_messages, create_message
+
 
 class BlogGenerator:
     """Claude API를 사용한 블로그 글 생성"""
@@ -30,20 +34,17 @@ class BlogGenerator:
         """
         print(f"\n✍️  블로그 글 생성 중...")
 
-        # 스타일별 프롬프트
-        blog_prompt = self._create_blog_prompt(topic, analysis, style)
+        # 스타일별 프롬프트 (정적 지시문 → 분석 결과 → 작성 요청 순서, 프롬프트 캐싱)
+        system, messages = self._create_blog_messages(topic, analysis, style)
 
         try:
-            response = self.client.messages.create(
+            blog_content = create_message(
+                self.client,
                 model=self.model,
                 max_tokens=8000,
-                messages=[{
-                    "role": "user",
-                    "content": blog_prompt
-                }]
+                system=system,
+                messages=messages
             )
-
-            blog_content = response.content[0].text
             print("✓ 블로그 글 생성 완료")
 
             # HTML로 래핑
@@ -54,8 +55,11 @@ class BlogGenerator:
             print(f"✗ 블로그 글 생성 실패: {str(e)}")
             return f"<p>오류: {str(e)}</p>"
 
-    def _create_blog_prompt(self, topic: str, analysis: Dict, style: str) -> str:
-        """블로그 글 생성용 프롬프트"""
+    def _create_blog_messages(self, topic: str, analysis: Dict, style: str) -> tuple:
+        """
+        블로그 글 생성용 메시지 (system, messages)
+        - 스타일별 지시문/글 구성은 주제와 무관하게 고정 → 캐시 프리픽스
+        """
 
         style_instructions = {
             "academic": """
@@ -83,12 +87,7 @@ class BlogGenerator:
 
         analysis_summary = self._format_analysis_for_prompt(analysis)
 
-        return f"""당신은 건강/의학 블로그 작가입니다. 아래 논문 분석 결과를 바탕으로 "{topic}"에 대한 블로그 글을 작성해주세요.
-
-# 주제: {topic}
-
-# 논문 분석 결과:
-{analysis_summary}
+        static = f"""당신은 건강/의학 블로그 작가입니다. 주어진 논문 분석 결과를 바탕으로 주제에 대한 블로그 글을 작성합니다.
 
 # 글 스타일: {style.upper()}
 {style_instructions[style]}
@@ -172,10 +171,18 @@ class BlogGenerator:
 5. 읽기 쉬운 문단 길이 (3-5문장)
 6. 소제목으로 스캔 가능하게
 7. 실천 가능한 조언 우선
+"""
+
+        context = f"""# 주제: {topic}
 
-이제 블로그 글을 작성해주세요 (HTML 형식):
+# 논문 분석 결과:
+{analysis_summary}
 """
 
+        instructions = f'이제 "{topic}"에 대한 블로그 글을 작성해주세요 (HTML 형식):'
+
+        return build_cached_messages(static, context, instructions)
+
     def _format_analysis_for_prompt(self, analysis: Dict) -> str:
         """분석 결과를 프롬프트용으로 포맷"""
         if 'raw_analysis' in analysis:
@@ -218,6 +225,17 @@ class BlogGenerator:
             for warning in analysis['warnings']:
                 formatted.append(f"- {warning}")
 
+        # 논문별 구조화 추출 결과 (분석 결과에 없으면 저장소에서 조회)
+        papers = analysis.get('papers', [])
+        extractions = analysis.get('paper_extractions') or get_extraction_store().get_for_papers(papers)
+        if extractions:
+            formatted.append("\n논문별 핵심 정보:")
+            for i, paper in enumerate(papers, 1):
+                if paper.get('pmid') in extractions:
+                    formatted.append(f"[논문 {i}] {paper.get('title', '')[:100]}")
+                    formatted.append(format_paper_analysis(extractions[paper['pmid']]))
+                    formatted.append("")
+
         return "\n".join(formatted)
 
     def _wrap_in_html(self, topic: str, blog_content: str, analysis: Dict) -> str:
@@ -0,0 +1,138 @@
+"""
+단계 내부 체크포인트 저장소
+- 긴 단계를 작업 단위(검색 쿼리, PMC 논문 1편, 블로그 분석 단계)로 나눠 완료될 때마다 기록
+- /retry로 같은 세션을 다시 실행하면 완료된 단위는 저장된 결과를 그대로 사용
+- 점수 평가 배치는 관련성 점수 저장소, LLM 호출은 LLM 응답 캐시가 같은 역할을 함
+- 실패한 단위는 기록하지 않음 (호출하는 쪽에서 성공한 결과만 put)
+- 버려진 세션의 체크포인트는 CHECKPOINT_TTL이 지나면 purge로 삭제
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Optional
+
+from config import Config
+
+
+class CheckpointStore:
+    """(세션, 단계, 단위) → 결과 테이블"""
+
+    def __init__(self, db_path: str = None):
+        self.db_path = db_path or os.path.join(Config.SESSION_DIR, 'checkpoints.db')
+        os.makedirs(os.path.dirname(self.db_path) or '.', exist_ok=True)
+        self._lock = threading.Lock()
+        # 웹훅 모드에서는 여러 워커 프로세스가 같은 파일을 사용 (WAL + 잠금 대기)
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS checkpoints (
+                session_key TEXT NOT NULL,
+                stage TEXT NOT NULL,
+                unit TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                done_at REAL NOT NULL,
+                created_at REAL,
+                PRIMARY KEY (session_key, stage, unit)
+            )
+        """)
+        # 이전 버전 테이블에는 created_at이 없음 → 추가 후 done_at으로 채움
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(checkpoints)")}
+        if 'created_at' not in columns:
+            self._conn.execute("ALTER TABLE checkpoints ADD COLUMN created_at REAL")
+        self._conn.execute("UPDATE checkpoints SET created_at = done_at WHERE created_at IS NULL")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_checkpoints_created ON checkpoints (created_at)")
+        self._conn.commit()
+
+    def get(self, session_key: str, stage: str, unit: str) -> Optional[Any]:
+        """완료된 단위의 결과 (없으면 None)"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload FROM checkpoints WHERE session_key = ? AND stage = ? AND unit = ?",
+                (session_key, stage, unit)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, session_key: str, stage: str, unit: str, payload: Any):
+        """단위 완료 기록 (성공한 결과만 넘길 것, 다시 기록해도 created_at은 유지)"""
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                INSERT INTO checkpoints (session_key, stage, unit, payload, done_at, created_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT (session_key, stage, unit) DO UPDATE SET
+                    payload = excluded.payload, done_at = excluded.done_at
+                """,
+                (session_key, stage, unit, json.dumps(payload, ensure_ascii=False), now, now)
+            )
+
+    def count(self, session_key: str, stage: str) -> int:
+        """단계의 완료된 단위 수"""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM checkpoints WHERE session_key = ? AND stage = ?", (session_key, stage)
+            ).fetchone()[0]
+
+    def clear(self, session_key: str, stage: str = None):
+        """세션(또는 세션의 한 단계) 체크포인트 삭제"""
+        with self._lock, self._conn:
+            if stage:
+                self._conn.execute("DELETE FROM checkpoints WHERE session_key = ? AND stage = ?", (session_key, stage))
+            else:
+                self._conn.execute("DELETE FROM checkpoints WHERE session_key = ?", (session_key,))
+
+    def purge(self, max_age: float = None) -> int:
+        """
+        오래된 체크포인트 삭제 (버려진 세션 정리)
+
+        Args:
+            max_age: 이 시간(초)보다 먼저 만든 단위를 삭제 (기본: Config.CHECKPOINT_TTL)
+
+        Returns:
+            삭제한 단위 수
+        """
+        cutoff = time.time() - (Config.CHECKPOINT_TTL if max_age is None else max_age)
+        with self._lock, self._conn:
+            return self._conn.execute("DELETE FROM checkpoints WHERE created_at < ?", (cutoff,)).rowcount
+
+
+class StageCheckpoints:
+    """한 세션·한 단계의 체크포인트 (작업 스레드에서 사용)"""
+
+    def __init__(self, session_key: str, stage: str, store: CheckpointStore = None):
+        self.session_key = session_key
+        self.stage = stage
+        self.store = store or get_checkpoint_store()
+        self.reused = 0
+
+    def get(self, unit: str) -> Optional[Any]:
+        result = self.store.get(self.session_key, self.stage, unit)
+        if result is not None:
+            self.reused += 1
+        return result
+
+    def put(self, unit: str, payload: Any):
+        self.store.put(self.session_key, self.stage, unit, payload)
+
+    def count(self) -> int:
+        return self.store.count(self.session_key, self.stage)
+
+    def clear(self):
+        self.store.clear(self.session_key, self.stage)
+
+
+# 프로세스 전역 저장소
+_default_store = None
+_default_store_lock = threading.Lock()
+
+
+def get_checkpoint_store() -> CheckpointStore:
+    """기본 체크포인트 저장소 반환"""
+    global _default_store
+    with _default_store_lock:
+        if _default_store is None:
+            _default_store = CheckpointStore()
+        return _default_store
@@ -7,13 +7,34 @@ Claude CLI 기반 논문 관련성 점수 평가 모듈
 import subprocess
 import json
 import re
-from typing import List, Dict, Tuple
+from typing import Callable, List, Dict, Optional, Tuple
 
+from config import Config
+from modules.lexical_ranker import prerank_papers
+from modules.llm_runner import run_claude_cli
+from modules.prompt_packer import pack_batches, token_budget, truncate_to_tokens
+from modules.metrics import record_cache
+from modules.relevance_store import get_relevance_store, make_signature
+from modules.tracing import annotate, span, traced
 
-def score_papers_with_claude(papers: List[Dict], keyword: str, keyword_en: str, topics: List[str]) -> Tuple[List[Dict], List[Dict]]:
+
+# 배치 구성 (배치 크기는 토큰 예산으로 결정)
+MAX_BATCH_PAPERS = 40  # 응답 JSON 길이 제한
+TITLE_TOKENS = 50
+ABSTRACT_TOKENS = 200
+
+
+@traced('scoring')
+def score_papers_with_claude(papers: List[Dict], keyword: str, keyword_en: str, topics: List[str],
+                             on_accepted: Optional[Callable[[List[Dict]], None]] = None) -> Tuple[List[Dict], List[Dict]]:
     """
     Claude CLI를 사용하여 논문 관련성 점수 평가
     - 배치 처리로 안정성 향상
+    - (PMID, 키워드/토픽) 점수 저장소에 있는 논문은 Claude에 보내지 않음
+    - 로컬 BM25 사전평가로 확실한 논문은 직접 결정, 불확실한 논문만 Claude 평가
+
+    Args:
+        on_accepted: 채택 논문이 확정될 때마다(저장소/로컬 평가 직후, 각 배치 완료 시) 호출되는 콜백
 
     Returns:
         (채택된 논문 리스트, 미채택 논문 리스트)
@@ -24,30 +45,90 @@ def score_papers_with_claude(papers: List[Dict], keyword: str, keyword_en: str,
     all_accepted = []
     all_rejected = []
 
-    # 20편씩 배치 처리
-    batch_size = 20
-    for batch_start in range(0, len(papers), batch_size):
-        batch_papers = papers[batch_start:batch_start + batch_size]
-        accepted, rejected = _score_batch(batch_papers, keyword, keyword_en, topics, batch_start)
+    # 저장된 점수 병합
+    store = get_relevance_store()
+    signature = make_signature(keyword, topics)
+    cached_scores = store.get_scores(signature, [p.get('pmid') for p in papers])
+
+    unscored = []
+    for paper in papers:
+        cached = cached_scores.get(paper.get('pmid'))
+        if cached is None:
+            unscored.append(paper)
+            continue
+        paper['관련성점수'] = cached['score']
+        if cached.get('reason'):
+            paper['점수근거'] = cached['reason']
+        if cached['accepted']:
+            all_accepted.append(paper)
+        else:
+            all_rejected.append(paper)
+
+    annotate(keyword=keyword, papers=len(papers), cache_hits=len(cached_scores))
+    record_cache('relevance', hits=len(cached_scores), misses=len(unscored))
+    if cached_scores:
+        print(f"[점수 저장소] {len(cached_scores)}편 재사용, {len(unscored)}편 평가 필요")
+
+    # 로컬 사전평가: 확실한 채택/미채택은 Claude에 보내지 않음
+    if Config.PRERANK_ENABLED and unscored:
+        with span('scoring.prerank', papers=len(unscored)) as s:
+            local_accepted, local_rejected, unscored = prerank_papers(
+                unscored, keyword, keyword_en, topics, corpus=papers
+            )
+            s.set(uncertain=len(unscored))
+        all_accepted.extend(local_accepted)
+        all_rejected.extend(local_rejected)
+        print(f"[로컬 사전평가] 채택 {len(local_accepted)}편, 미채택 {len(local_rejected)}편, Claude 평가 {len(unscored)}편")
+
+    if on_accepted and all_accepted:
+        on_accepted(list(all_accepted))
+
+    # 토큰 예산에 맞춰 최소 개수의 배치로 분할
+    batches = pack_batches(unscored, _render_paper, token_budget('scoring'), max_items=MAX_BATCH_PAPERS)
+    batch_start = 0
+    for batch_papers in batches:
+        with span('scoring.batch', papers=len(batch_papers)) as s:
+            accepted, rejected, llm_scores = _score_batch(batch_papers, keyword, keyword_en, topics, batch_start)
+            s.set(accepted=len(accepted), llm_scored=len(llm_scores))
+        batch_start += len(batch_papers)
         all_accepted.extend(accepted)
         all_rejected.extend(rejected)
+        # Claude가 직접 매긴 점수만 저장 (fallback 점수는 저장하지 않음)
+        store.save_scores(signature, llm_scores)
+        if on_accepted and accepted:
+            on_accepted(accepted)
 
+    annotate(accepted=len(all_accepted), batches=len(batches))
     return all_accepted, all_rejected
 
 
-def _score_batch(papers: List[Dict], keyword: str, keyword_en: str, topics: List[str], start_idx: int) -> Tuple[List[Dict], List[Dict]]:
-    """배치 단위로 점수 평가"""
+def _render_paper(paper: Dict) -> str:
+    """점수 평가 프롬프트용 논문 텍스트 (제목 + 초록 앞부분)"""
+    title = truncate_to_tokens(paper.get('title', ''), TITLE_TOKENS)
+    abstract = truncate_to_tokens(paper.get('abstract', ''), ABSTRACT_TOKENS)
+    return f"""PMID: {paper.get('pmid', 'N/A')}
+제목: {title}
+초록: {abstract}...
+"""
+
+
+def _score_batch(papers: List[Dict], keyword: str, keyword_en: str, topics: List[str], start_idx: int) -> Tuple[List[Dict], List[Dict], Dict[str, Dict]]:
+    """
+    배치 단위로 점수 평가
+
+    Args:
+        start_idx: 이 배치 첫 논문의 전체 순번 (0부터, 로그 표시용)
+
+    Returns:
+        (채택 리스트, 미채택 리스트, Claude가 매긴 점수 {pmid: {'score', 'accepted'}})
+    """
+
+    batch_label = f"논문 {start_idx + 1}-{start_idx + len(papers)}"
 
     # 논문 요약 텍스트 생성 (제목 + 초록 앞부분만)
     papers_summary = ""
     for i, paper in enumerate(papers, 1):
-        title = paper.get('title', '')[:150]
-        abstract = paper.get('abstract', '')[:300]
-        papers_summary += f"""
-[논문 {i}] PMID: {paper.get('pmid', 'N/A')}
-제목: {title}
-초록: {abstract[:300]}...
-"""
+        papers_summary += f"\n[논문 {i}] " + _render_paper(paper)
 
     topics_str = ", ".join(topics) if topics else "없음"
 
@@ -67,55 +148,24 @@ JSON만 출력:
 [{{"번호":1,"점수":85,"채택":true}},{{"번호":2,"점수":50,"채택":false}}]"""
 
     try:
-        import uuid
-        import os
-
-        # 현재 디렉토리에 임시 파일 생성 (경로 문제 회피)
-        prompt_file = f'_claude_temp_{uuid.uuid4().hex[:8]}.txt'
-        with open(prompt_file, 'w', encoding='utf-8') as f:
-            f.write(prompt)
-
-        try:
-            # 환경 변수 설정 (Claude CLI 인증용)
-            env = os.environ.copy()
-            home_dir = os.path.expanduser('~')
-            env['HOME'] = home_dir
-            env['USERPROFILE'] = home_dir
-
-            # ANTHROPIC_API_KEY 제거 (있으면 CLI가 OAuth 대신 API키 사용 시도)
-            if 'ANTHROPIC_API_KEY' in env:
-                del env['ANTHROPIC_API_KEY']
-
-            # cmd /c로 실행 (Windows 콘솔 환경 상속)
-            result = subprocess.run(
-                ['cmd', '/c', f'type {prompt_file} | claude -p --output-format text'],
-                capture_output=True,
-                text=True,
-                timeout=180,
-                encoding='utf-8',
-                env=env
-            )
-        finally:
-            try:
-                os.remove(prompt_file)
-            except:
-                pass
+        result = run_claude_cli(prompt, timeout=180, kind='scoring')
 
         if result.returncode != 0:
-            print(f"[Claude CLI 오류] returncode={result.returncode}")
+            print(f"[Claude CLI 오류] {batch_label} returncode={result.returncode}")
             print(f"[stderr] {result.stderr[:300] if result.stderr else 'empty'}")
             # 오류 시 제목 기반으로 간단히 필터링
-            return _fallback_filter(papers, keyword, keyword_en)
+            return _fallback_batch(papers, keyword, keyword_en)
 
         response = result.stdout.strip()
         scores = _parse_scores(response)
 
         if not scores:
-            print("[파싱 실패] 점수를 파싱할 수 없습니다")
-            return _fallback_filter(papers, keyword, keyword_en)
+            print(f"[파싱 실패] {batch_label} 점수를 파싱할 수 없습니다")
+            return _fallback_batch(papers, keyword, keyword_en)
 
         accepted = []
         rejected = []
+        llm_scores = {}
 
         for i, paper in enumerate(papers, 1):
             # 번호로 찾기
@@ -127,10 +177,12 @@ JSON만 출력:
 
             if score_info:
                 paper['관련성점수'] = score_info.get('점수', 0)
-                if score_info.get('채택', False) or score_info.get('점수', 0) >= 75:
+                is_accepted = bool(score_info.get('채택', False) or score_info.get('점수', 0) >= 75)
+                if is_accepted:
                     accepted.append(paper)
                 else:
                     rejected.append(paper)
+                llm_scores[paper.get('pmid')] = {'score': paper['관련성점수'], 'accepted': is_accepted}
             else:
                 # 점수 없으면 fallback 필터링
                 if _is_relevant(paper, keyword, keyword_en):
@@ -140,17 +192,23 @@ JSON만 출력:
                     paper['관련성점수'] = 0
                     rejected.append(paper)
 
-        return accepted, rejected
+        return accepted, rejected, llm_scores
 
     except subprocess.TimeoutExpired:
-        print("[타임아웃] Claude CLI 응답 시간 초과")
-        return _fallback_filter(papers, keyword, keyword_en)
+        print(f"[타임아웃] {batch_label} Claude CLI 응답 시간 초과")
+        return _fallback_batch(papers, keyword, keyword_en)
     except FileNotFoundError:
         print("[오류] Claude CLI를 찾을 수 없습니다")
-        return _fallback_filter(papers, keyword, keyword_en)
+        return _fallback_batch(papers, keyword, keyword_en)
     except Exception as e:
-        print(f"[오류] {e}")
-        return _fallback_filter(papers, keyword, keyword_en)
+        print(f"[오류] {batch_label} {e}")
+        return _fallback_batch(papers, keyword, keyword_en)
+
+
+def _fallback_batch(papers: List[Dict], keyword: str, keyword_en: str) -> Tuple[List[Dict], List[Dict], Dict[str, Dict]]:
+    """배치 평가 실패 시 fallback 필터링 (저장할 Claude 점수 없음)"""
+    accepted, rejected = _fallback_filter(papers, keyword, keyword_en)
+    return accepted, rejected, {}
 
 
 def _fallback_filter(papers: List[Dict], keyword: str, keyword_en: str) -> Tuple[List[Dict], List[Dict]]:
@@ -9,6 +9,13 @@ import json
 import re
 from typing import List, Dict
 
+from modules.llm_runner import run_claude_cli
+from modules.prompt_packer import fit_texts, token_budget
+
+
+# 블로그당 최소 토큰 (예산이 부족하면 뒤쪽 블로그 제외)
+BLOG_MIN_TOKENS = 300
+
 
 def extract_topics_with_claude(blogs: List[Dict], main_keyword: str) -> Dict:
     """
@@ -22,14 +29,15 @@ def extract_topics_with_claude(blogs: List[Dict], main_keyword: str) -> Dict:
         {
             'topics': [{'topic': '토픽명', 'count': 횟수, 'category': '카테고리'}, ...],
             'trending': [...],
-            'topic_counts': {...}
+            'topic_counts': {...},
+            'fallback': True  # Claude 실패로 기본 추출을 사용한 경우만
         }
     """
-    # 블로그 내용 요약 (토큰 제한 고려)
+    # 블로그 내용 요약 (토큰 예산 안에서 최대한 많은 블로그 포함)
+    contents = fit_texts([blog.get('content', '') for blog in blogs], token_budget('topics'), min_tokens=BLOG_MIN_TOKENS)
     blogs_summary = ""
-    for i, blog in enumerate(blogs[:10], 1):  # 최대 10개
+    for i, (blog, content) in enumerate(zip(blogs, contents), 1):
         title = blog.get('title', '')[:100]
-        content = blog.get('content', '')[:1500]  # 각 블로그 1500자
         blogs_summary += f"\n[블로그 {i}] {title}\n{content}\n"
 
     # Claude에게 보낼 프롬프트
@@ -57,39 +65,7 @@ def extract_topics_with_claude(blogs: List[Dict], main_keyword: str) -> Dict:
 JSON만 반환하세요."""
 
     try:
-        import uuid
-        import os
-
-        # 현재 디렉토리에 임시 파일 생성 (경로 문제 회피)
-        prompt_file = f'_claude_temp_{uuid.uuid4().hex[:8]}.txt'
-        with open(prompt_file, 'w', encoding='utf-8') as f:
-            f.write(prompt)
-
-        try:
-            # 환경 변수 설정 (Claude CLI 인증용)
-            env = os.environ.copy()
-            home_dir = os.path.expanduser('~')
-            env['HOME'] = home_dir
-            env['USERPROFILE'] = home_dir
-
-            # ANTHROPIC_API_KEY 제거 (있으면 CLI가 OAuth 대신 API키 사용 시도)
-            if 'ANTHROPIC_API_KEY' in env:
-                del env['ANTHROPIC_API_KEY']
-
-            # cmd /c로 실행 (Windows 콘솔 환경 상속)
-            result = subprocess.run(
-                ['cmd', '/c', f'type {prompt_file} | claude -p --output-format text'],
-                capture_output=True,
-                text=True,
-                timeout=180,
-                encoding='utf-8',
-                env=env
-            )
-        finally:
-            try:
-                os.remove(prompt_file)
-            except:
-                pass
+        result = run_claude_cli(prompt, timeout=180, kind='topics')
 
         if result.returncode != 0:
             print(f"[Claude CLI 오류] returncode={result.returncode}")
@@ -184,7 +160,7 @@ def _group_by_category(topics: List[Dict]) -> Dict:
 
 
 def _fallback_extraction(blogs: List[Dict], main_keyword: str) -> Dict:
-    """Claude CLI 실패 시 기본 추출 (auto_topic_extractor 사용)"""
+    """Claude CLI 실패 시 기본 추출 (auto_topic_extractor 사용, 결과에 fallback 표시)"""
     print("[폴백] 기본 토픽 추출 사용")
     from modules.auto_topic_extractor import extract_topics_auto
-    return extract_topics_auto(blogs, main_keyword)
+    return {**extract_topics_auto(blogs, main_keyword), 'fallback': True}
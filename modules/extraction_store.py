@@ -0,0 +1,118 @@
+"""
+논문별 구조화 추출 결과 저장소
+- PAPER_ANALYSIS_PROMPT 추출 결과(연구유형, 주요결과, 핵심결론 등)를 PMID별로 SQLite에 영구 저장
+- 프롬프트 템플릿 해시(PAPER_ANALYSIS_VERSION)로 버전 관리 - 템플릿이 바뀌면 자동으로 다시 추출
+- 모든 생성기(자동 블로그, 시리즈, PaperAnalyzer, BlogGenerator)가 LLM 호출 전에 먼저 조회
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List
+
+from config import Config
+from modules.llm_paper_analyzer import PAPER_ANALYSIS_VERSION, content_source
+
+
+# 출처 우선순위 - 전문이 생긴 논문은 초록 기반 추출을 재사용하지 않음
+_SOURCE_RANK = {'none': 0, 'abstract': 1, 'fulltext': 2}
+
+
+class PaperExtractionStore:
+    """PMID + 템플릿 버전 기반 추출 결과 테이블"""
+
+    def __init__(self, db_path: str = None, version: str = PAPER_ANALYSIS_VERSION):
+        """
+        Args:
+            db_path: SQLite 파일 경로
+            version: 프롬프트 템플릿 버전
+        """
+        self.db_path = db_path or os.path.join(Config.CACHE_DIR, 'paper_extractions.db')
+        self.version = version
+        os.makedirs(os.path.dirname(self.db_path) or '.', exist_ok=True)
+        self._lock = threading.Lock()
+        # 웹훅 모드에서는 여러 워커 프로세스가 같은 파일을 사용 (WAL + 잠금 대기)
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS paper_extractions (
+                pmid TEXT NOT NULL,
+                template_version TEXT NOT NULL,
+                source TEXT NOT NULL,
+                extraction TEXT NOT NULL,
+                model TEXT,
+                extracted_at REAL NOT NULL,
+                PRIMARY KEY (pmid, template_version)
+            )
+        """)
+        self._conn.commit()
+
+    def get_for_papers(self, papers: List[Dict]) -> Dict[str, Dict]:
+        """
+        논문 목록에 대한 저장된 추출 결과 조회
+        (현재 논문보다 빈약한 출처로 추출된 결과는 제외 - 예: 초록 추출 후 전문 확보)
+
+        Returns:
+            {pmid: 추출 결과}
+        """
+        wanted = {p['pmid']: content_source(p) for p in papers if p.get('pmid')}
+        if not wanted:
+            return {}
+
+        pmids = list(wanted)
+        results = {}
+        with self._lock:
+            # SQLite 변수 개수 제한 고려하여 나눠서 조회
+            for i in range(0, len(pmids), 500):
+                chunk = pmids[i:i + 500]
+                placeholders = ','.join('?' * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT pmid, source, extraction FROM paper_extractions "
+                    f"WHERE template_version = ? AND pmid IN ({placeholders})",
+                    [self.version] + chunk
+                ).fetchall()
+                for pmid, source, extraction in rows:
+                    if _SOURCE_RANK.get(source, 0) < _SOURCE_RANK.get(wanted[pmid], 0):
+                        continue
+                    try:
+                        results[pmid] = json.loads(extraction)
+                    except json.JSONDecodeError:
+                        continue
+        return results
+
+    def save(self, paper: Dict, extraction: Dict, model: str = None):
+        """추출 결과 저장 (빈 결과는 저장하지 않음)"""
+        if not extraction or not paper.get('pmid'):
+            return
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO paper_extractions "
+                "(pmid, template_version, source, extraction, model, extracted_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (paper['pmid'], self.version, content_source(paper),
+                 json.dumps(extraction, ensure_ascii=False), model, time.time())
+            )
+            self._conn.commit()
+
+    def count(self) -> int:
+        """현재 템플릿 버전의 저장된 추출 결과 개수"""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM paper_extractions WHERE template_version = ?", (self.version,)
+            ).fetchone()[0]
+
+
+# 프로세스 전역 저장소
+_default_store = None
+_default_store_lock = threading.Lock()
+
+
+def get_extraction_store() -> PaperExtractionStore:
+    """기본 추출 결과 저장소 반환"""
+    global _default_store
+    with _default_store_lock:
+        if _default_store is None:
+            _default_store = PaperExtractionStore()
+        return _default_store
@@ -0,0 +1,399 @@
+"""
+백그라운드 작업 관리 모듈
+- 무거운 단계(토픽 분석, 논문 검색/평가, 블로그 생성)를 장기 실행 스레드 풀에서 처리
+- 작업마다 ID/상태/취소 플래그 관리, 진행 상황과 완료는 이벤트 큐로 전달
+- 전체/사용자별/종류별 동시 실행 상한, 나머지는 우선순위별 사용자 라운드로빈 대기열
+- 이벤트 큐는 봇 이벤트 루프(job_queue)에서 주기적으로 비워 콜백 실행 → 작업 스레드는 텔레그램 API를 직접 호출하지 않음
+"""
+
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from config import Config
+from modules.metrics import get_registry
+from modules.tracing import span, trace_context
+
+
+_JOBS_FINISHED = get_registry().counter('blog_jobs_finished_total', '끝난 작업 수', ('kind', 'state'))
+_JOB_QUEUE_WAIT = get_registry().histogram('blog_job_queue_wait_seconds', '작업 대기열 대기 시간', ('kind',))
+
+
+class JobCancelled(Exception):
+    """작업이 취소되어 중단됨"""
+    pass
+
+
+class Job:
+    """백그라운드 작업 한 건"""
+
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    CANCELLED = 'cancelled'
+
+    def __init__(self, user_id: int, kind: str, manager: 'JobManager', priority: int = 0,
+                 on_progress: Optional[Callable[['Job'], Awaitable[None]]] = None,
+                 on_done: Optional[Callable[['Job'], Awaitable[None]]] = None, trace_id: str = None):
+        self.job_id = uuid.uuid4().hex[:8]
+        self.trace_id = trace_id or self.job_id  # 단계 추적 묶음 키 (보통 세션 ID)
+        self.user_id = user_id
+        self.kind = kind
+        self.priority = priority
+        self.state = self.QUEUED
+        self.progress = ''
+        self.queue_position: Optional[int] = None  # 대기 중일 때 대기열 순번 (1부터)
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.log: List[str] = []  # 작업 함수가 남기는 로그 (완료 콜백에서 사용자에게 표시)
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.on_progress = on_progress
+        self.on_done = on_done
+        self.future: Optional[Future] = None
+        self._call: Optional[Tuple[Callable, tuple, dict]] = None
+        self._cancel_event = threading.Event()
+        self._manager = manager
+
+    @property
+    def cancelled(self) -> bool:
+        """취소 요청 여부"""
+        return self._cancel_event.is_set()
+
+    @property
+    def finished(self) -> bool:
+        return self.state in (self.DONE, self.FAILED, self.CANCELLED)
+
+    def check_cancelled(self):
+        """취소 요청이 있으면 JobCancelled 발생 (작업 함수에서 단계 사이마다 호출)"""
+        if self._cancel_event.is_set():
+            raise JobCancelled(self.job_id)
+
+    def report(self, message: str):
+        """진행 상황 전달 (작업 스레드에서 호출, 같은 작업의 연속 메시지는 마지막 것만 표시)"""
+        self.check_cancelled()
+        self.progress = message
+        if self.on_progress:
+            self._manager._emit(self, 'progress')
+
+    def __repr__(self):
+        return f"<Job {self.job_id} {self.kind} user={self.user_id} {self.state}>"
+
+
+class JobManager:
+    """
+    작업 레지스트리 + 공정 스케줄러
+    - 실행 중 작업 수가 상한(전체/사용자별/종류별) 미만일 때만 스레드 풀에 넘김
+    - 대기열은 우선순위(낮을수록 먼저)별로 사용자 라운드로빈 - 한 사용자가 여러 작업을 넣어도 다른 사용자를 막지 않음
+    """
+
+    def __init__(self, max_workers: int = None, max_per_user: int = None,
+                 kind_limits: Dict[str, int] = None, priorities: Dict[str, int] = None,
+                 history: int = 200):
+        """
+        Args:
+            max_workers: 동시에 실행할 작업 수 (전체)
+            max_per_user: 사용자당 동시 실행 작업 수
+            kind_limits: 작업 종류별 동시 실행 상한
+            priorities: 작업 종류별 기본 우선순위
+            history: 보관할 완료 작업 수
+        """
+        self.max_workers = max_workers or Config.JOB_WORKERS
+        self.max_per_user = max_per_user or Config.JOB_MAX_PER_USER
+        self.kind_limits = Config.JOB_KIND_LIMITS if kind_limits is None else kind_limits
+        self.priorities = Config.JOB_PRIORITIES if priorities is None else priorities
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix='job'
+        )
+        self._jobs: 'OrderedDict[str, Job]' = OrderedDict()
+        self._events: 'OrderedDict[Tuple[str, str], Job]' = OrderedDict()
+        # 우선순위 → 사용자 순서(라운드로빈) / 사용자별 대기 작업
+        self._user_order: Dict[int, deque] = {}
+        self._pending: Dict[int, Dict[int, deque]] = {}
+        self._running: List[Job] = []
+        # 사용자별 마지막 실행 시작 순번 - 가장 오래전에 실행된 사용자부터 (라운드로빈)
+        self._served: Dict[int, int] = {}
+        self._serve_counter = 0
+        self._lock = threading.Lock()
+        self._history = history
+
+    def submit(self, user_id: int, kind: str, func: Callable[..., Any], *args,
+               priority: int = None,
+               on_progress: Optional[Callable[[Job], Awaitable[None]]] = None,
+               on_done: Optional[Callable[[Job], Awaitable[None]]] = None,
+               trace_id: str = None, **kwargs) -> Job:
+        """
+        작업 등록 후 즉시 반환 (실행 여유가 없으면 대기열에 추가)
+
+        Args:
+            user_id: 요청 사용자
+            kind: 작업 종류 ('topics', 'papers', 'blog' 등)
+            func: 작업 함수 - 첫 인자로 Job을 받음 (job.report / job.check_cancelled 사용)
+            priority: 우선순위 (없으면 종류별 기본값, 낮을수록 먼저)
+            on_progress: 진행 상황/대기 순번 변경 콜백 (async, 이벤트 루프에서 실행)
+            on_done: 완료/실패/취소 콜백 (async, 이벤트 루프에서 실행 - job.state로 구분)
+            trace_id: 단계 추적 묶음 키 (같은 세션의 작업은 같은 값, 없으면 작업 ID)
+
+        Returns:
+            등록된 Job
+        """
+        if priority is None:
+            priority = self.priorities.get(kind, max(self.priorities.values(), default=0) + 1)
+        job = Job(user_id, kind, self, priority=priority, on_progress=on_progress, on_done=on_done,
+                  trace_id=trace_id)
+        job._call = (func, args, kwargs)
+
+        with self._lock:
+            self._jobs[job.job_id] = job
+            self._trim()
+            users = self._user_order.setdefault(priority, deque())
+            queue = self._pending.setdefault(priority, {}).setdefault(user_id, deque())
+            if not queue and user_id not in users:
+                users.append(user_id)
+            queue.append(job)
+
+        print(f"[작업] {job.job_id} 등록 ({kind}, 사용자 {user_id}, 우선순위 {priority})")
+        self._schedule()
+        return job
+
+    def _can_start(self, job: Job) -> bool:
+        """상한 확인 (락 안에서 호출)"""
+        if sum(1 for j in self._running if j.user_id == job.user_id) >= self.max_per_user:
+            return False
+        limit = self.kind_limits.get(job.kind)
+        if limit is not None and sum(1 for j in self._running if j.kind == job.kind) >= limit:
+            return False
+        return True
+
+    def _round_robin(self, priority: int) -> List[int]:
+        """대기 작업이 있는 사용자를 마지막 실행 시작이 오래된 순으로 정렬 (락 안에서 호출)"""
+        return sorted(self._user_order[priority], key=lambda u: self._served.get(u, 0))
+
+    def _next_job(self) -> Optional[Job]:
+        """다음에 실행할 작업을 대기열에서 꺼냄 (락 안에서 호출)"""
+        for priority in sorted(self._user_order):
+            queues = self._pending[priority]
+            # 이번 우선순위에서 상한에 걸리지 않는 사용자 중 가장 오래 기다린 사용자 선택
+            for user_id in self._round_robin(priority):
+                queue = queues.get(user_id)
+                if queue and self._can_start(queue[0]):
+                    job = queue.popleft()
+                    if not queue:
+                        del queues[user_id]
+                        self._user_order[priority].remove(user_id)
+                    self._serve_counter += 1
+                    self._served[user_id] = self._serve_counter
+                    return job
+        return None
+
+    def _queued_order(self) -> List[Job]:
+        """대기 작업을 예상 실행 순서로 나열 (우선순위 → 사용자 라운드로빈, 락 안에서 호출)"""
+        order = []
+        for priority in sorted(self._user_order):
+            queues = [list(self._pending[priority].get(u, ())) for u in self._round_robin(priority)]
+            depth = max((len(q) for q in queues), default=0)
+            for i in range(depth):
+                order.extend(q[i] for q in queues if i < len(q))
+        return order
+
+    def _schedule(self):
+        """실행 여유만큼 대기 작업 시작, 남은 작업의 대기 순번 갱신"""
+        started = []
+        dropped = []
+        moved = []
+        with self._lock:
+            while len(self._running) < self.max_workers:
+                job = self._next_job()
+                if job is None:
+                    break
+                if job.cancelled:
+                    dropped.append(job)
+                    continue
+                self._running.append(job)
+                started.append(job)
+
+            for position, job in enumerate(self._queued_order(), 1):
+                if job.queue_position != position:
+                    job.queue_position = position
+                    moved.append(job)
+
+        for job in dropped:
+            self._finish(job, Job.CANCELLED)
+        for job in started:
+            func, args, kwargs = job._call
+            job.future = self._executor.submit(self._run, job, func, args, kwargs)
+        for job in moved:
+            if job.on_progress:
+                self._emit(job, 'progress')
+
+    def _run(self, job: Job, func: Callable, args: tuple, kwargs: dict):
+        if job.cancelled:
+            self._finish(job, Job.CANCELLED)
+            return
+
+        job.state = Job.RUNNING
+        job.started_at = time.time()
+        _JOB_QUEUE_WAIT.observe(job.started_at - job.created_at, kind=job.kind)
+        if job.queue_position is not None:
+            # 대기하던 작업은 시작 사실을 알림 (대기 순번 표시 해제)
+            job.queue_position = None
+            if job.on_progress:
+                self._emit(job, 'progress')
+        try:
+            with trace_context(job.trace_id), span(f"job.{job.kind}", job_id=job.job_id, user_id=job.user_id,
+                                                   queued_ms=round((job.started_at - job.created_at) * 1000)):
+                job.result = func(job, *args, **kwargs)
+        except JobCancelled:
+            self._finish(job, Job.CANCELLED)
+        except Exception as e:
+            job.error = e
+            print(f"[작업] {job.job_id} 실패: {type(e).__name__}: {e}")
+            self._finish(job, Job.FAILED)
+        else:
+            # 완료 직전에 취소된 작업은 결과를 버림
+            self._finish(job, Job.CANCELLED if job.cancelled else Job.DONE)
+
+    def _finish(self, job: Job, state: str):
+        job.state = state
+        job.finished_at = time.time()
+        job.queue_position = None
+        with self._lock:
+            if job in self._running:
+                self._running.remove(job)
+        elapsed = job.finished_at - (job.started_at or job.created_at)
+        print(f"[작업] {job.job_id} {state} ({elapsed:.1f}초)")
+        _JOBS_FINISHED.inc(kind=job.kind, state=state)
+        if job.on_done:
+            self._emit(job, 'done')
+        self._schedule()
+
+    def _emit(self, job: Job, event: str):
+        with self._lock:
+            key = (job.job_id, event)
+            # 아직 전달되지 않은 같은 진행 이벤트는 하나로 합침
+            self._events.pop(key, None)
+            self._events[key] = job
+
+    def drain_events(self) -> List[Tuple[Callable[[Job], Awaitable[None]], Job]]:
+        """대기 중인 (콜백, 작업) 목록을 꺼냄 (이벤트 루프에서 호출)"""
+        with self._lock:
+            events = list(self._events.items())
+            self._events.clear()
+
+        callbacks = []
+        for (_, event), job in events:
+            if event == 'progress':
+                # 이미 끝난 작업의 진행 메시지는 버림
+                if not job.finished and job.on_progress:
+                    callbacks.append((job.on_progress, job))
+            elif job.on_done:
+                callbacks.append((job.on_done, job))
+        return callbacks
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def jobs_for_user(self, user_id: int, active_only: bool = True) -> List[Job]:
+        """사용자의 작업 목록"""
+        with self._lock:
+            jobs = [j for j in self._jobs.values() if j.user_id == user_id]
+        return [j for j in jobs if not j.finished] if active_only else jobs
+
+    def cancel(self, job_id: str) -> bool:
+        """작업 취소 요청 (대기 중이면 대기열에서 제거, 실행 중이면 다음 확인 시점에 중단)"""
+        job = self.get(job_id)
+        if not job or job.finished:
+            return False
+        job._cancel_event.set()
+
+        with self._lock:
+            queue = self._pending.get(job.priority, {}).get(job.user_id)
+            was_queued = bool(queue) and job in queue
+            if was_queued:
+                queue.remove(job)
+                if not queue:
+                    del self._pending[job.priority][job.user_id]
+                    self._user_order[job.priority].remove(job.user_id)
+
+        if was_queued:
+            self._finish(job, Job.CANCELLED)
+        return True
+
+    def stats(self) -> Dict[str, int]:
+        """실행/대기 작업 수"""
+        with self._lock:
+            queued = sum(len(q) for queues in self._pending.values() for q in queues.values())
+            return {'running': len(self._running), 'queued': queued}
+
+    def cancel_user(self, user_id: int) -> int:
+        """사용자의 진행 중인 작업 모두 취소, 취소한 작업 수 반환"""
+        return sum(1 for job in self.jobs_for_user(user_id) if self.cancel(job.job_id))
+
+    def _trim(self):
+        """오래된 완료 작업 정리 (락 안에서 호출)"""
+        finished = [jid for jid, j in self._jobs.items() if j.finished]
+        for jid in finished[:max(0, len(finished) - self._history)]:
+            del self._jobs[jid]
+
+    def shutdown(self):
+        """대기 중인 작업 취소 후 종료"""
+        with self._lock:
+            jobs = list(self._jobs.values())
+            self._pending.clear()
+            self._user_order.clear()
+        for job in jobs:
+            job._cancel_event.set()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+# 프로세스 전역 관리자
+_default_manager = None
+_default_manager_lock = threading.Lock()
+
+
+def worker_limits(workers: int) -> Dict[str, Any]:
+    """
+    프로세스 여러 개가 각자 작업 관리자를 둘 때 프로세스 하나의 상한 (웹훅 워커)
+    - 전체/종류별 상한을 워커 수로 나눔 (최소 1 - 상한이 워커 수보다 작으면 합계는 워커 수)
+    """
+    def share(limit: int) -> int:
+        return max(1, limit // workers)
+
+    return {
+        'max_workers': share(Config.JOB_WORKERS),
+        'kind_limits': {kind: share(limit) for kind, limit in Config.JOB_KIND_LIMITS.items()},
+    }
+
+
+def configure_job_manager(**kwargs) -> JobManager:
+    """기본 작업 관리자를 지정한 설정(JobManager 인자)으로 생성 - 첫 get_job_manager() 호출 전에 사용"""
+    with _default_manager_lock:
+        if _default_manager is not None:
+            print("[작업] 기본 작업 관리자가 이미 생성되어 설정을 바꾸지 않음")
+            return _default_manager
+        return _create_default(**kwargs)
+
+
+def _create_default(**kwargs) -> JobManager:
+    """기본 작업 관리자 생성 + 메트릭 등록 (락 안에서 호출)"""
+    global _default_manager
+    _default_manager = JobManager(**kwargs)
+    get_registry().gauge('blog_jobs', '실행/대기 중인 작업 수', ('state',)).set_function(
+        lambda: {(state,): n for state, n in _default_manager.stats().items()}
+    )
+    return _default_manager
+
+
+def get_job_manager() -> JobManager:
+    """기본 작업 관리자 반환"""
+    with _default_manager_lock:
+        if _default_manager is None:
+            return _create_default()
+        return _default_manager
@@ -0,0 +1,187 @@
+"""
+로컬 어휘 기반 논문 사전 평가 모듈
+- 제목+초록을 키워드(영문), 선택 토픽(KR_TO_EN 확장)과 BM25 방식으로 비교
+- 확실한 채택/미채택은 로컬에서 결정하고, 애매한 중간 구간만 Claude에 전달
+- 특정 질환 용어 목록 없이 어떤 키워드에도 동작
+"""
+
+import math
+import re
+from collections import Counter
+from typing import Dict, List, Tuple
+
+from config import Config
+
+
+# 점수 계산에서 제외할 영어 불용어
+STOPWORDS = {
+    'a', 'an', 'the', 'and', 'or', 'of', 'in', 'on', 'for', 'to', 'with', 'by',
+    'at', 'from', 'as', 'is', 'are', 'was', 'were', 'be', 'its', 'their', 'vs',
+}
+
+# 키워드/토픽 용어의 IDF 가중 커버리지가 이 비율 이상이면 '완전히 다룸'으로 간주
+# (영문 키워드가 'GERD gastroesophageal reflux'처럼 동의어 나열인 경우가 많음)
+FULL_COVERAGE = 0.6
+
+
+def tokenize(text: str) -> List[str]:
+    """소문자 영숫자 토큰 추출 (불용어 제외)"""
+    return [t for t in re.findall(r'[a-z0-9]+', (text or '').lower()) if t not in STOPWORDS]
+
+
+def keyword_terms(keyword: str, keyword_en: str) -> List[str]:
+    """키워드 매칭 용어: 영문 번역 + (영문일 경우) 원문 키워드"""
+    terms = tokenize(keyword_en)
+    if not re.search(r'[가-힣]', keyword or ''):
+        terms += tokenize(keyword)
+    return list(dict.fromkeys(terms))
+
+
+def expand_topic(topic: str) -> str:
+    """한글 토픽을 영어 검색어로 확장 (SmartTopicExtractor.KR_TO_EN 사용)"""
+    from modules.smart_topic_extractor import SmartTopicExtractor
+    return SmartTopicExtractor.KR_TO_EN.get(topic, topic)
+
+
+class LexicalRanker:
+    """BM25 기반 키워드/토픽 관련성 점수 (0-100, Claude 점수 기준과 동일 척도)"""
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75, title_weight: float = 1.0):
+        """
+        Args:
+            k1: BM25 단어 빈도 포화 계수
+            b: BM25 문서 길이 정규화 계수
+            title_weight: 제목에 등장한 용어의 매칭 강도
+        """
+        self.k1 = k1
+        self.b = b
+        self.title_weight = title_weight
+
+    def score_papers(self, papers: List[Dict], keyword: str, keyword_en: str,
+                     topics: List[str]) -> List[Dict]:
+        """
+        논문별 로컬 관련성 점수 계산
+
+        Returns:
+            [{'score': 0-100, 'keyword_score': 0-80, 'topic_score': 0-20, 'reason': str}, ...]
+        """
+        docs = []
+        for paper in papers:
+            title_tokens = tokenize(paper.get('title', ''))
+            body_tokens = tokenize(paper.get('abstract', ''))
+            docs.append((set(title_tokens), Counter(title_tokens + body_tokens), len(title_tokens) + len(body_tokens)))
+
+        if not docs:
+            return []
+
+        avg_len = sum(d[2] for d in docs) / len(docs) or 1.0
+        idf = self._idf(docs)
+
+        terms = keyword_terms(keyword, keyword_en)
+
+        topic_terms = [list(dict.fromkeys(tokenize(expand_topic(t)))) for t in (topics or [])]
+        topic_terms = [terms for terms in topic_terms if terms]
+
+        results = []
+        for doc in docs:
+            kw_cov = self._coverage(doc, terms, idf, avg_len)
+            keyword_score = 80 * min(1.0, kw_cov / FULL_COVERAGE)
+
+            if topic_terms:
+                tp_cov = max(self._coverage(doc, terms, idf, avg_len) for terms in topic_terms)
+                topic_score = 20 * min(1.0, tp_cov / FULL_COVERAGE)
+                score = keyword_score + topic_score
+            else:
+                # 토픽이 없으면 키워드 점수를 100점 만점으로 환산
+                topic_score = 0.0
+                score = keyword_score * 100 / 80
+
+            results.append({
+                'score': int(round(score)),
+                'keyword_score': int(round(keyword_score)),
+                'topic_score': int(round(topic_score)),
+                'reason': f"로컬 평가: 키워드 {keyword_score:.0f}점 + 토픽 {topic_score:.0f}점",
+            })
+
+        return results
+
+    def _idf(self, docs: List[Tuple]) -> Dict[str, float]:
+        """BM25 IDF (수집된 논문 집합 기준)"""
+        n = len(docs)
+        df = Counter()
+        for _, tf, _ in docs:
+            df.update(tf.keys())
+        return {term: math.log(1 + (n - freq + 0.5) / (freq + 0.5)) for term, freq in df.items()}
+
+    def _coverage(self, doc: Tuple, terms: List[str], idf: Dict[str, float], avg_len: float) -> float:
+        """IDF 가중 용어 커버리지 (0-1) - 용어별 매칭 강도는 BM25 tf 항을 0-1로 정규화"""
+        if not terms:
+            return 0.0
+
+        title_set, tf, length = doc
+        # 집합에 없는 용어도 무시하지 않도록 최소 IDF 부여
+        default_idf = max(idf.values()) if idf else 1.0
+        total = 0.0
+        matched = 0.0
+
+        for term in terms:
+            weight = idf.get(term, default_idf)
+            total += weight
+
+            if term in title_set:
+                strength = self.title_weight
+            elif tf.get(term):
+                freq = tf[term]
+                norm = self.k1 * (1 - self.b + self.b * length / avg_len)
+                strength = freq * (self.k1 + 1) / (freq + norm) / (self.k1 + 1)
+            else:
+                strength = 0.0
+            matched += weight * strength
+
+        return matched / total if total else 0.0
+
+
+def prerank_papers(papers: List[Dict], keyword: str, keyword_en: str, topics: List[str],
+                   accept_score: int = None, reject_score: int = None,
+                   corpus: List[Dict] = None) -> Tuple[List[Dict], List[Dict], List[Dict]]:
+    """
+    로컬 점수로 논문을 채택/미채택/불확실 세 그룹으로 분리
+
+    Args:
+        papers: 사전 평가할 논문
+        accept_score: 이 점수 이상이면 로컬 채택
+        reject_score: 이 점수 미만이면 로컬 미채택
+        corpus: IDF 계산용 전체 논문 집합 (없으면 papers 사용)
+
+    Returns:
+        (채택, 미채택, 불확실 - Claude 평가 필요)
+    """
+    # 번역 실패로 영문 키워드가 한글 그대로면 매칭할 용어가 없음 → 로컬 판단 없이 전부 Claude 평가
+    if not keyword_terms(keyword, keyword_en):
+        print(f"[로컬 사전평가] 키워드 '{keyword_en}'에 매칭할 영문 용어가 없어 건너뜀")
+        return [], [], list(papers)
+
+    accept_score = Config.PRERANK_ACCEPT_SCORE if accept_score is None else accept_score
+    reject_score = Config.PRERANK_REJECT_SCORE if reject_score is None else reject_score
+
+    corpus = corpus or papers
+    target_ids = {id(p) for p in papers}
+    scores = LexicalRanker().score_papers(corpus, keyword, keyword_en, topics)
+
+    accepted, rejected, uncertain = [], [], []
+    for paper, result in zip(corpus, scores):
+        if id(paper) not in target_ids:
+            continue
+        paper['로컬점수'] = result['score']
+        if result['score'] >= accept_score:
+            paper['관련성점수'] = result['score']
+            paper['점수근거'] = result['reason']
+            accepted.append(paper)
+        elif result['score'] < reject_score:
+            paper['관련성점수'] = result['score']
+            paper['점수근거'] = result['reason']
+            rejected.append(paper)
+        else:
+            uncertain.append(paper)
+
+    return accepted, rejected, uncertain
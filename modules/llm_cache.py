@@ -0,0 +1,204 @@
+"""
+LLM 응답 캐시 모듈
+- hash(모델, 프롬프트, 파라미터)를 키로 응답을 디스크에 저장
+- TTL 만료 + 전체 용량 기준 LRU 삭제
+- 파일 mtime = 저장 시각(만료 판단), atime = 마지막 사용 시각(LRU 순서)
+- LLM_CACHE_DISABLED=1 또는 use_cache=False 로 우회
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+from config import Config
+
+
+class LLMResponseCache:
+    """내용 주소 기반 LLM 응답 디스크 캐시"""
+
+    def __init__(self, cache_dir: str = None, ttl: int = None,
+                 max_bytes: int = None, enabled: bool = None):
+        """
+        Args:
+            cache_dir: 캐시 저장 디렉토리
+            ttl: 항목 유효 시간 (초)
+            max_bytes: 캐시 전체 최대 용량 (초과 시 오래 안 쓴 항목부터 삭제)
+            enabled: False면 항상 미스 처리 (우회)
+        """
+        self.cache_dir = cache_dir or os.path.join(Config.CACHE_DIR, 'llm')
+        self.ttl = Config.LLM_CACHE_TTL if ttl is None else ttl
+        self.max_bytes = Config.LLM_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+        self.enabled = Config.LLM_CACHE_ENABLED if enabled is None else enabled
+
+        self._lock = threading.Lock()
+        self._total_bytes = None  # 첫 저장 시 계산
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(model: str, prompt, params: Dict = None) -> str:
+        """(모델, 프롬프트, 파라미터)로 캐시 키 생성 (프롬프트는 문자열 또는 메시지 리스트)"""
+        payload = json.dumps(
+            {'model': model, 'prompt': prompt, 'params': params or {}},
+            ensure_ascii=False,
+            sort_keys=True,
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+
+    def get(self, key: str) -> Optional[str]:
+        """캐시된 응답 반환 (없거나 만료되면 None)"""
+        if not self.enabled:
+            return None
+
+        path = self._path(key)
+        try:
+            created = os.stat(path).st_mtime
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            self.misses += 1
+            return None
+
+        now = time.time()
+        if self._expired(created, now):
+            self._remove(path)
+            self.misses += 1
+            return None
+
+        # LRU: 마지막 사용 시각(atime)만 갱신, 저장 시각(mtime)은 유지
+        try:
+            os.utime(path, (now, created))
+        except OSError:
+            pass
+
+        self.hits += 1
+        return entry.get('response')
+
+    def set(self, key: str, response: str, model: str = ''):
+        """응답 저장"""
+        if not self.enabled or not response:
+            return
+
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        data = json.dumps({
+            'key': key,
+            'model': model,
+            'created_at': time.time(),
+            'response': response,
+        }, ensure_ascii=False)
+
+        # 임시 파일에 쓰고 교체 (동시 접근 시 깨진 파일 방지)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(data)
+        new_size = os.path.getsize(tmp_path)
+
+        with self._lock:
+            # 같은 키를 덮어쓰면 기존 파일 크기만큼 빼야 총량이 부풀지 않음
+            try:
+                old_size = os.path.getsize(path)
+            except OSError:
+                old_size = 0
+            os.replace(tmp_path, path)
+
+            if self._total_bytes is None:
+                self._total_bytes = self._scan_total_bytes()
+            else:
+                self._total_bytes += new_size - old_size
+
+            if self.max_bytes and self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def clear(self):
+        """캐시 전체 삭제"""
+        with self._lock:
+            for path, *_ in self._iter_entries():
+                self._remove(path)
+            self._total_bytes = 0
+
+    def stats(self) -> Dict:
+        """캐시 통계"""
+        entries = list(self._iter_entries())
+        total = self.hits + self.misses
+        return {
+            'enabled': self.enabled,
+            'entries': len(entries),
+            'total_bytes': sum(size for _, size, *_ in entries),
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / total, 3) if total else 0.0,
+        }
+
+    def _expired(self, created: float, now: float) -> bool:
+        return bool(self.ttl) and now - created > self.ttl
+
+    def _iter_entries(self):
+        """(경로, 크기, 저장 시각, 마지막 사용 시각) 순회"""
+        if not os.path.isdir(self.cache_dir):
+            return
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if not name.endswith('.json'):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                yield path, st.st_size, st.st_mtime, max(st.st_atime, st.st_mtime)
+
+    def _scan_total_bytes(self) -> int:
+        return sum(size for _, size, *_ in self._iter_entries())
+
+    def _evict(self):
+        """용량 초과 시 만료 항목 → 오래 안 쓴 항목 순으로 삭제 (목표: 최대 용량의 90%)"""
+        target = int(self.max_bytes * 0.9)
+        now = time.time()
+        entries = sorted(self._iter_entries(), key=lambda e: e[3])
+        total = sum(size for _, size, *_ in entries)
+
+        remaining = []
+        for path, size, created, _ in entries:
+            if self._expired(created, now):
+                self._remove(path)
+                total -= size
+            else:
+                remaining.append((path, size))
+
+        for path, size in remaining:
+            if total <= target:
+                break
+            self._remove(path)
+            total -= size
+
+        self._total_bytes = total
+
+    @staticmethod
+    def _remove(path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+# 프로세스 전역 캐시
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> LLMResponseCache:
+    """기본 LLM 응답 캐시 반환"""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = LLMResponseCache()
+        return _default_cache
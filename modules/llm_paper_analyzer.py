@@ -4,6 +4,7 @@ LLM 기반 논문 분석 모듈
 - Claude CLI에서 사용하도록 설계
 """
 
+import hashlib
 import json
 from typing import Dict, List
 from datetime import datetime
@@ -49,6 +50,82 @@ JSON만 반환하세요. 다른 설명은 필요 없습니다.
 """
 
 
+# 템플릿 버전 - 프롬프트가 바뀌면 저장된 추출 결과를 재사용하지 않음
+PAPER_ANALYSIS_VERSION = hashlib.sha1(PAPER_ANALYSIS_PROMPT.encode('utf-8')).hexdigest()[:12]
+
+
+def content_source(paper: Dict) -> str:
+    """분석 내용 출처 ('fulltext' > 'abstract' > 'none', build_paper_content와 같은 기준)"""
+    if paper.get('conclusion') and len(paper.get('conclusion', '')) > 100:
+        return 'fulltext'
+    if paper.get('abstract'):
+        return 'abstract'
+    return 'none'
+
+
+def build_paper_content(paper: Dict) -> str:
+    """분석할 내용 결정 (전문 > 초록)"""
+    if paper.get('conclusion') and len(paper.get('conclusion', '')) > 100:
+        content = f"[결론 섹션]\n{paper['conclusion']}"
+        if paper.get('results'):
+            content += f"\n\n[결과 섹션]\n{paper['results'][:2000]}"
+    elif paper.get('abstract'):
+        content = f"[초록]\n{paper['abstract']}"
+    else:
+        content = "내용 없음"
+    return content
+
+
+def create_paper_analysis_prompt(paper: Dict, content: str = None) -> str:
+    """논문 한 편의 구조화 분석 프롬프트 (PAPER_ANALYSIS_PROMPT)"""
+    return PAPER_ANALYSIS_PROMPT.format(
+        title=paper.get('title', ''),
+        journal=paper.get('journal', ''),
+        year=paper.get('year', ''),
+        pmid=paper.get('pmid', ''),
+        content=content if content is not None else build_paper_content(paper)
+    )
+
+
+def parse_paper_analysis(json_text: str) -> Dict:
+    """
+    PAPER_ANALYSIS_PROMPT 응답(JSON 객체) 파싱
+    """
+    try:
+        start = json_text.find('{')
+        end = json_text.rfind('}') + 1
+        if start != -1 and end > start:
+            return json.loads(json_text[start:end])
+    except json.JSONDecodeError:
+        pass
+
+    return {}
+
+
+def format_paper_analysis(analysis: Dict) -> str:
+    """구조화 추출 결과를 프롬프트용 짧은 텍스트로 변환"""
+    def _get(value, key=None):
+        if key and isinstance(value, dict):
+            value = value.get(key)
+        return str(value).strip() if value not in (None, '', '명시안됨') else ''
+
+    target = analysis.get('연구대상', {})
+    result = analysis.get('주요결과', {})
+    lines = [
+        ('연구유형', _get(analysis.get('연구유형'))),
+        ('연구대상', ' / '.join(v for v in (_get(target, '인원'), _get(target, '특성')) if v)
+                     if isinstance(target, dict) else _get(target)),
+        ('주요결과', ' / '.join(v for v in (_get(result, '결과요약'), _get(result, '효과크기'),
+                                          _get(result, '통계적유의성')) if v)
+                     if isinstance(result, dict) else _get(result)),
+        ('핵심결론', _get(analysis.get('핵심결론'))),
+        ('실용적시사점', _get(analysis.get('실용적시사점'))),
+        ('한계점', _get(analysis.get('한계점'))),
+        ('신뢰도', _get(analysis.get('신뢰도'))),
+    ]
+    return "\n".join(f"{label}: {value}" for label, value in lines if value)
+
+
 def create_analysis_request(papers: List[Dict]) -> Dict:
     """
     논문 목록을 Claude CLI 분석용 요청 형식으로 변환
@@ -56,15 +133,7 @@ def create_analysis_request(papers: List[Dict]) -> Dict:
     analysis_requests = []
 
     for paper in papers:
-        # 분석할 내용 결정 (전문 > 초록)
-        if paper.get('conclusion') and len(paper.get('conclusion', '')) > 100:
-            content = f"[결론 섹션]\n{paper['conclusion']}"
-            if paper.get('results'):
-                content += f"\n\n[결과 섹션]\n{paper['results'][:2000]}"
-        elif paper.get('abstract'):
-            content = f"[초록]\n{paper['abstract']}"
-        else:
-            content = "내용 없음"
+        content = build_paper_content(paper)
 
         request = {
             "pmid": paper.get('pmid', ''),
@@ -74,13 +143,7 @@ def create_analysis_request(papers: List[Dict]) -> Dict:
             "authors": paper.get('authors', [])[:3],
             "has_fulltext": paper.get('has_fulltext', False),
             "content_for_analysis": content,
-            "prompt": PAPER_ANALYSIS_PROMPT.format(
-                title=paper.get('title', ''),
-                journal=paper.get('journal', ''),
-                year=paper.get('year', ''),
-                pmid=paper.get('pmid', ''),
-                content=content
-            )
+            "prompt": create_paper_analysis_prompt(paper, content)
         }
         analysis_requests.append(request)
 
@@ -0,0 +1,356 @@
+"""
+LLM 호출 모듈
+- Claude CLI(subprocess) / Anthropic SDK 호출을 한 곳에서 처리
+- 모든 호출은 LLM 응답 캐시를 먼저 확인
+- 실제 호출(CLI 프로세스, API 요청)은 프로세스 전체 동시 실행 수(LLM_MAX_CONCURRENCY)로 제한
+"""
+
+import json
+import os
+import subprocess
+import tempfile
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Tuple
+
+from config import Config
+from modules.llm_cache import get_llm_cache
+from modules.prompt_packer import estimate_tokens, get_latency_model
+from modules.metrics import get_registry, record_cache
+from modules.tracing import annotate, traced
+
+
+# CLI는 모델을 직접 지정하지 않으므로 캐시 키 구분용 이름 사용
+CLI_MODEL = 'claude-cli'
+
+_LLM_CALLS = get_registry().counter(
+    'blog_llm_calls_total', 'LLM 호출 수 (결과: cache_hit, ok, error, timeout)', ('backend', 'kind', 'result')
+)
+
+
+# 프로세스 전체 동시 LLM 호출 슬롯
+# (세션별 분석 파이프라인, 작업 내부 스레드 풀이 각자 호출해도 실제 호출 수는 이 이상 늘지 않음)
+_LLM_SLOTS = threading.BoundedSemaphore(Config.LLM_MAX_CONCURRENCY)
+
+
+def set_llm_concurrency(limit: int):
+    """동시 LLM 호출 상한 변경 (웹훅 워커가 시작할 때 프로세스별 몫으로 설정 - 호출이 시작되기 전에만)"""
+    global _LLM_SLOTS
+    _LLM_SLOTS = threading.BoundedSemaphore(max(1, limit))
+
+
+@contextmanager
+def llm_slot():
+    """LLM 호출 슬롯 점유 (빈 슬롯이 없으면 대기, 대기 시간은 현재 스팬에 기록)"""
+    start = time.time()
+    with _LLM_SLOTS:
+        waited = time.time() - start
+        if waited >= 0.01:
+            annotate(slot_wait_ms=round(waited * 1000))
+        yield
+
+
+def _count_call(backend: str, kind: str, result: str):
+    _LLM_CALLS.inc(backend=backend, kind=kind or 'other', result=result)
+    record_cache('llm', hits=int(result == 'cache_hit'), misses=int(result != 'cache_hit'))
+
+
+def _cli_env() -> Dict[str, str]:
+    """Claude CLI 실행용 환경 변수"""
+    # 환경 변수 설정 (Claude CLI 인증용)
+    env = os.environ.copy()
+    home_dir = os.path.expanduser('~')
+    env['HOME'] = home_dir
+    env['USERPROFILE'] = home_dir
+
+    # ANTHROPIC_API_KEY 제거 (있으면 CLI가 OAuth 대신 API키 사용 시도)
+    if 'ANTHROPIC_API_KEY' in env:
+        del env['ANTHROPIC_API_KEY']
+
+    return env
+
+
+@traced('llm.cli')
+def run_claude_cli(prompt: str, timeout: int = 180, output_format: str = 'text',
+                   use_cache: bool = True, kind: str = None) -> subprocess.CompletedProcess:
+    """
+    Claude CLI로 프롬프트 실행
+
+    Args:
+        prompt: 프롬프트 텍스트
+        timeout: 제한 시간 (초)
+        output_format: CLI --output-format 값
+        use_cache: False면 캐시를 건너뛰고 항상 CLI 호출
+        kind: 호출 종류 ('scoring', 'analysis' 등) - 지정하면 응답 시간을 학습하여 토큰 예산 조정
+
+    Returns:
+        subprocess.CompletedProcess (캐시 적중 시 returncode=0, stdout=캐시 응답)
+
+    Raises:
+        subprocess.TimeoutExpired, FileNotFoundError (기존 subprocess.run과 동일)
+    """
+    cache = get_llm_cache()
+    cache_key = cache.make_key(CLI_MODEL, prompt, {'output_format': output_format})
+    annotate(kind=kind, prompt_chars=len(prompt), cache_hit=False)
+
+    if use_cache:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            print(f"[LLM 캐시] 적중 ({len(prompt)}자 프롬프트)")
+            annotate(cache_hit=True)
+            _count_call('cli', kind, 'cache_hit')
+            return subprocess.CompletedProcess(args=['claude', '-p'], returncode=0, stdout=cached, stderr='')
+
+    # 현재 디렉토리에 임시 파일 생성 (경로 문제 회피)
+    prompt_file = f'_claude_temp_{uuid.uuid4().hex[:8]}.txt'
+    with open(prompt_file, 'w', encoding='utf-8') as f:
+        f.write(prompt)
+
+    with llm_slot():
+        start = time.time()
+        try:
+            # cmd /c로 실행 (Windows 콘솔 환경 상속)
+            result = subprocess.run(
+                ['cmd', '/c', f'type {prompt_file} | claude -p --output-format {output_format}'],
+                capture_output=True,
+                text=True,
+                timeout=timeout,
+                encoding='utf-8',
+                env=_cli_env()
+            )
+        except subprocess.TimeoutExpired:
+            _count_call('cli', kind, 'timeout')
+            if kind:
+                get_latency_model().record(kind, estimate_tokens(prompt), time.time() - start, timed_out=True)
+            raise
+        finally:
+            try:
+                os.remove(prompt_file)
+            except:
+                pass
+
+    annotate(returncode=result.returncode)
+    _count_call('cli', kind, 'ok' if result.returncode == 0 else 'error')
+    # 성공한 응답만 캐시 (use_cache=False여도 최신 응답으로 갱신)
+    if result.returncode == 0 and result.stdout and result.stdout.strip():
+        cache.set(cache_key, result.stdout, model=CLI_MODEL)
+        if kind:
+            get_latency_model().record(kind, estimate_tokens(prompt), time.time() - start)
+
+    return result
+
+
+@traced('llm.stream')
+def stream_claude_cli(prompt: str, on_text: Callable[[str], None], timeout: int = 300,
+                      use_cache: bool = True, kind: str = None) -> subprocess.CompletedProcess:
+    """
+    Claude CLI를 stream-json 모드로 실행하며 텍스트 조각을 즉시 전달
+
+    Args:
+        prompt: 프롬프트 텍스트
+        on_text: 텍스트 조각을 받을 콜백 (CLI 실행 스레드에서 호출됨)
+        timeout: 제한 시간 (초)
+        use_cache: False면 캐시를 건너뛰고 항상 CLI 호출
+        kind: 호출 종류 (응답 시간 학습용)
+
+    Returns:
+        subprocess.CompletedProcess (stdout=전체 응답 텍스트, run_claude_cli와 동일 형식)
+
+    Raises:
+        subprocess.TimeoutExpired, FileNotFoundError
+    """
+    # 텍스트 모드와 같은 키 사용 (스트리밍 여부와 무관하게 응답 재사용)
+    cache = get_llm_cache()
+    cache_key = cache.make_key(CLI_MODEL, prompt, {'output_format': 'text'})
+    annotate(kind=kind, prompt_chars=len(prompt), cache_hit=False)
+
+    if use_cache:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            print(f"[LLM 캐시] 적중 ({len(prompt)}자 프롬프트)")
+            annotate(cache_hit=True)
+            _count_call('cli', kind, 'cache_hit')
+            on_text(cached)
+            return subprocess.CompletedProcess(args=['claude', '-p'], returncode=0, stdout=cached, stderr='')
+
+    # 현재 디렉토리에 임시 파일 생성 (경로 문제 회피)
+    prompt_file = f'_claude_temp_{uuid.uuid4().hex[:8]}.txt'
+    with open(prompt_file, 'w', encoding='utf-8') as f:
+        f.write(prompt)
+
+    command = (
+        f'type {prompt_file} | claude -p --output-format stream-json '
+        f'--verbose --include-partial-messages'
+    )
+    with llm_slot():
+        start = time.time()
+        timed_out = threading.Event()
+        chunks = []
+        final_text = None
+
+        # stderr는 임시 파일로 (stdout을 다 읽을 때까지 PIPE를 비우지 않으면
+        # CLI가 stderr에 많이 쓸 때 파이프 버퍼가 차서 양쪽 모두 멈춤)
+        stderr_file = tempfile.TemporaryFile(mode='w+', encoding='utf-8')
+        try:
+            # cmd /c로 실행 (Windows 콘솔 환경 상속)
+            proc = subprocess.Popen(
+                ['cmd', '/c', command],
+                stdout=subprocess.PIPE,
+                stderr=stderr_file,
+                text=True,
+                encoding='utf-8',
+                env=_cli_env()
+            )
+
+            def _kill():
+                timed_out.set()
+                proc.kill()
+
+            timer = threading.Timer(timeout, _kill)
+            timer.start()
+            try:
+                for line in proc.stdout:
+                    event = _parse_stream_line(line)
+                    if not event:
+                        continue
+
+                    event_type = event.get('type')
+                    if event_type == 'stream_event':
+                        # 부분 메시지: 텍스트 델타
+                        inner = event.get('event', {})
+                        delta = inner.get('delta', {})
+                        if inner.get('type') == 'content_block_delta' and delta.get('type') == 'text_delta':
+                            chunks.append(delta.get('text', ''))
+                            on_text(delta.get('text', ''))
+                    elif event_type == 'assistant' and not chunks:
+                        # 부분 메시지를 지원하지 않는 CLI: 완성된 메시지 단위로 전달
+                        for block in event.get('message', {}).get('content', []):
+                            if block.get('type') == 'text' and block.get('text'):
+                                chunks.append(block['text'])
+                                on_text(block['text'])
+                    elif event_type == 'result':
+                        final_text = event.get('result')
+
+                proc.wait()
+                stderr_file.seek(0)
+                stderr = stderr_file.read()
+            finally:
+                timer.cancel()
+        finally:
+            stderr_file.close()
+            try:
+                os.remove(prompt_file)
+            except:
+                pass
+
+    if timed_out.is_set():
+        _count_call('cli', kind, 'timeout')
+        if kind:
+            get_latency_model().record(kind, estimate_tokens(prompt), time.time() - start, timed_out=True)
+        raise subprocess.TimeoutExpired(command, timeout)
+
+    text = final_text if final_text is not None else ''.join(chunks)
+    result = subprocess.CompletedProcess(args=['cmd', '/c', command], returncode=proc.returncode, stdout=text, stderr=stderr)
+    annotate(returncode=result.returncode)
+    _count_call('cli', kind, 'ok' if result.returncode == 0 else 'error')
+
+    if result.returncode == 0 and text.strip():
+        cache.set(cache_key, text, model=CLI_MODEL)
+        if kind:
+            get_latency_model().record(kind, estimate_tokens(prompt), time.time() - start)
+
+    return result
+
+
+def _parse_stream_line(line: str) -> Dict:
+    """stream-json 출력 한 줄 파싱 (JSON이 아니면 None)"""
+    line = line.strip()
+    if not line.startswith('{'):
+        return None
+    try:
+        return json.loads(line)
+    except json.JSONDecodeError:
+        return None
+
+
+def build_cached_messages(static: str, context: str, instructions: str) -> Tuple[List[Dict], List[Dict]]:
+    """
+    Anthropic 프롬프트 캐싱용 메시지 구성
+    - 정적 프리픽스(system) → 공유 컨텍스트 → 호출별 지시 순서로 배치
+    - 앞의 두 블록에 cache_control 브레이크포인트 (1024토큰 미만 프리픽스는 API가 캐시하지 않음)
+
+    Args:
+        static: 호출 종류별로 고정된 지시문/스타일 가이드
+        context: 여러 호출이 공유하는 컨텍스트 (논문, 시리즈 구성 등, 없으면 빈 문자열)
+        instructions: 이번 호출에만 쓰이는 지시
+
+    Returns:
+        (system 블록 리스트, messages) - create_message(system=..., messages=...)에 전달
+    """
+    def _block(text: str, cache: bool) -> Dict:
+        block = {"type": "text", "text": text}
+        if cache and Config.PROMPT_CACHING_ENABLED:
+            block["cache_control"] = {"type": "ephemeral"}
+        return block
+
+    system = [_block(static, cache=True)]
+    content = [_block(context, cache=True)] if context else []
+    content.append(_block(instructions, cache=False))
+
+    return system, [{"role": "user", "content": content}]
+
+
+@traced('llm.api')
+def create_message(client, model: str, messages: List[Dict], max_tokens: int,
+                   use_cache: bool = True, **params) -> str:
+    """
+    Anthropic SDK messages.create 호출 후 응답 텍스트 반환
+
+    Args:
+        client: Anthropic 클라이언트
+        model: 모델명
+        messages: 메시지 리스트
+        max_tokens: 최대 출력 토큰
+        use_cache: False면 캐시를 건너뛰고 항상 API 호출
+        **params: messages.create에 그대로 전달 (system, temperature 등)
+
+    Returns:
+        응답 텍스트
+    """
+    cache = get_llm_cache()
+    cache_key = cache.make_key(model, messages, {'max_tokens': max_tokens, **params})
+    annotate(model=model, cache_hit=False)
+
+    if use_cache:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            print(f"[LLM 캐시] 적중 ({model})")
+            annotate(cache_hit=True)
+            _count_call('api', model, 'cache_hit')
+            return cached
+
+    try:
+        with llm_slot():
+            response = client.messages.create(
+                model=model,
+                max_tokens=max_tokens,
+                messages=messages,
+                **params
+            )
+    except Exception:
+        _count_call('api', model, 'error')
+        raise
+    _count_call('api', model, 'ok')
+    text = response.content[0].text
+
+    # 프롬프트 캐싱 사용량 (cache_control 블록이 있을 때만 값이 있음)
+    usage = getattr(response, 'usage', None)
+    cache_read = getattr(usage, 'cache_read_input_tokens', None) or 0
+    cache_write = getattr(usage, 'cache_creation_input_tokens', None) or 0
+    if cache_read or cache_write:
+        print(f"[프롬프트 캐시] 읽기 {cache_read}토큰, 쓰기 {cache_write}토큰 ({model})")
+
+    cache.set(cache_key, text, model=model)
+    return text
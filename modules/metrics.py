@@ -0,0 +1,306 @@
+"""
+프로세스 내 메트릭 수집
+- 카운터/게이지/히스토그램(라벨 지원) 레지스트리와 Prometheus 텍스트 형식 출력
+- 봇은 로컬 HTTP 포트(METRICS_PORT)의 /metrics, Flask 앱은 자체 /metrics 경로로 노출
+- 외부 HTTP 호출(NCBI, 네이버)은 http_get()으로 상태 코드/지연 기록
+- 파이프라인 단계 지연은 단계 추적(tracing) 스팬이 끝날 때 자동 기록
+"""
+
+import math
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Tuple
+
+import requests
+
+from config import Config
+from modules.tracing import get_tracer
+
+
+# 지연 히스토그램 기본 버킷 (초)
+DEFAULT_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{k}="{_escape(str(v))}"' for k, v in labels.items()) + '}'
+
+
+class _Metric:
+    """메트릭 공통 (이름, 설명, 라벨 이름)"""
+
+    kind = ''
+
+    def __init__(self, name: str, help: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict) -> Tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} 라벨 불일치: {sorted(labels)} (필요: {list(self.labelnames)})")
+        return tuple(str(labels[n]) for n in self.labelnames)
+
+    def _matches(self, key: Tuple[str, ...], labels: Dict) -> bool:
+        return all(key[self.labelnames.index(n)] == str(v) for n, v in labels.items())
+
+    def samples(self) -> List[Tuple[str, Dict[str, str], float]]:
+        """(이름, 라벨, 값) 목록"""
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """증가만 하는 값"""
+
+    kind = 'counter'
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        """라벨 일부만 주면 일치하는 값의 합"""
+        with self._lock:
+            return sum(v for k, v in self._values.items() if self._matches(k, labels))
+
+    def samples(self):
+        with self._lock:
+            items = list(self._values.items())
+        return [(self.name, dict(zip(self.labelnames, k)), v) for k, v in items]
+
+
+class Gauge(_Metric):
+    """현재 값 (직접 설정하거나 수집 시점에 함수로 계산)"""
+
+    kind = 'gauge'
+
+    def __init__(self, name: str, help: str, labelnames: Tuple[str, ...] = ()):
+        super().__init__(name, help, labelnames)
+        self._function: Optional[Callable] = None
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def set_function(self, function: Callable):
+        """
+        수집 시점에 값을 계산할 함수 등록
+        - 라벨이 없으면 숫자, 라벨이 있으면 {라벨 값 튜플: 숫자} 반환
+        """
+        self._function = function
+
+    def _current(self) -> Dict[Tuple[str, ...], float]:
+        if self._function is None:
+            with self._lock:
+                return dict(self._values)
+        try:
+            result = self._function()
+        except Exception as e:
+            print(f"[메트릭] {self.name} 계산 실패: {type(e).__name__}: {e}")
+            return {}
+        if isinstance(result, dict):
+            return {tuple(str(x) for x in (k if isinstance(k, tuple) else (k,))): v for k, v in result.items()}
+        return {(): result}
+
+    def value(self, **labels) -> float:
+        return sum(v for k, v in self._current().items() if self._matches(k, labels))
+
+    def samples(self):
+        return [(self.name, dict(zip(self.labelnames, k)), v) for k, v in self._current().items()]
+
+
+class Histogram(_Metric):
+    """값 분포 (누적 버킷 + 합계 + 개수)"""
+
+    kind = 'histogram'
+
+    def __init__(self, name: str, help: str, labelnames: Tuple[str, ...] = (), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = {'counts': [0] * len(self.buckets), 'sum': 0.0, 'count': 0}
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state['counts'][i] += 1
+                    break
+            state['sum'] += value
+            state['count'] += 1
+
+    def count(self, **labels) -> int:
+        with self._lock:
+            return sum(s['count'] for k, s in self._values.items() if self._matches(k, labels))
+
+    def samples(self):
+        with self._lock:
+            items = [(k, {'counts': list(s['counts']), 'sum': s['sum'], 'count': s['count']})
+                     for k, s in self._values.items()]
+        samples = []
+        for key, state in items:
+            labels = dict(zip(self.labelnames, key))
+            cumulative = 0
+            for bound, n in zip(self.buckets, state['counts']):
+                cumulative += n
+                samples.append((f"{self.name}_bucket", {**labels, 'le': _format_value(bound)}, cumulative))
+            samples.append((f"{self.name}_bucket", {**labels, 'le': '+Inf'}, state['count']))
+            samples.append((f"{self.name}_sum", labels, state['sum']))
+            samples.append((f"{self.name}_count", labels, state['count']))
+        return samples
+
+
+class MetricsRegistry:
+    """메트릭 이름 → 메트릭 (같은 이름으로 다시 등록하면 기존 메트릭 반환)"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+        self.started_at = time.time()
+
+    def _register(self, cls, name: str, help: str, labelnames, **kwargs) -> _Metric:
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, help, tuple(labelnames), **kwargs)
+            elif not isinstance(metric, cls) or metric.labelnames != tuple(labelnames):
+                raise ValueError(f"메트릭 {name}이(가) 다른 형식으로 이미 등록됨")
+            return metric
+
+    def counter(self, name: str, help: str, labelnames=()) -> Counter:
+        return self._register(Counter, name, help, labelnames)
+
+    def gauge(self, name: str, help: str, labelnames=()) -> Gauge:
+        return self._register(Gauge, name, help, labelnames)
+
+    def histogram(self, name: str, help: str, labelnames=(), buckets=DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram, name, help, labelnames, buckets=buckets)
+
+    def get(self, name: str) -> Optional[_Metric]:
+        with self._lock:
+            return self._metrics.get(name)
+
+    def render(self) -> str:
+        """Prometheus 텍스트 형식"""
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda m: m.name)
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {_escape(metric.help)}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labels, value in metric.samples():
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+def _install_default_metrics(registry: MetricsRegistry):
+    """프로세스 공통 메트릭 + 단계 추적 연동"""
+    registry.gauge('blog_process_start_time_seconds', '프로세스 시작 시각 (유닉스 시간)').set(registry.started_at)
+
+    stage_seconds = registry.histogram('blog_stage_duration_seconds', '파이프라인 단계 소요 시간', ('stage',))
+    stage_errors = registry.counter('blog_stage_errors_total', '예외로 끝난 파이프라인 단계 수', ('stage', 'error'))
+
+    def observe_span(span):
+        stage_seconds.observe(span.duration, stage=span.name)
+        if span.error:
+            stage_errors.inc(stage=span.name, error=span.error)
+
+    get_tracer().add_listener(observe_span)
+
+
+# 프로세스 전역 레지스트리
+_default_registry = None
+_default_registry_lock = threading.Lock()
+
+
+def get_registry() -> MetricsRegistry:
+    """기본 레지스트리 반환"""
+    global _default_registry
+    with _default_registry_lock:
+        if _default_registry is None:
+            _default_registry = MetricsRegistry()
+            _install_default_metrics(_default_registry)
+        return _default_registry
+
+
+def record_cache(cache: str, hits: int = 0, misses: int = 0):
+    """캐시/저장소 조회 결과 기록"""
+    counter = get_registry().counter('blog_cache_requests_total', '캐시/저장소 조회 수', ('cache', 'result'))
+    if hits:
+        counter.inc(hits, cache=cache, result='hit')
+    if misses:
+        counter.inc(misses, cache=cache, result='miss')
+
+
+def http_get(service: str, endpoint: str, url: str, **kwargs) -> requests.Response:
+    """requests.get + 상태 코드/지연 기록 (연결 오류는 status='error'로 기록 후 다시 발생)"""
+    registry = get_registry()
+    counter = registry.counter('blog_http_client_requests_total', '외부 HTTP 요청 수', ('service', 'endpoint', 'status'))
+    latency = registry.histogram('blog_http_client_duration_seconds', '외부 HTTP 요청 소요 시간', ('service', 'endpoint'))
+    start = time.time()
+    try:
+        response = requests.get(url, **kwargs)
+    except requests.RequestException:
+        counter.inc(service=service, endpoint=endpoint, status='error')
+        raise
+    finally:
+        latency.observe(time.time() - start, service=service, endpoint=endpoint)
+    counter.inc(service=service, endpoint=endpoint, status=response.status_code)
+    return response
+
+
+def _make_handler(registry: MetricsRegistry):
+    class MetricsHandler(BaseHTTPRequestHandler):
+        """GET /metrics → Prometheus 텍스트"""
+
+        def do_GET(self):
+            if self.path.split('?')[0] != '/metrics':
+                self.send_error(404)
+                return
+            body = registry.render().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', CONTENT_TYPE)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return MetricsHandler
+
+
+def start_metrics_server(port: int = None, host: str = None) -> Optional[ThreadingHTTPServer]:
+    """백그라운드 스레드에서 /metrics 서버 시작 (포트 0이면 시작하지 않음, 실패 시 None)"""
+    port = Config.METRICS_PORT if port is None else port
+    host = host or Config.METRICS_HOST
+    if not port:
+        return None
+    try:
+        server = ThreadingHTTPServer((host, port), _make_handler(get_registry()))
+    except OSError as e:
+        print(f"[메트릭] {host}:{port} 서버 시작 실패: {e}")
+        return None
+    threading.Thread(target=server.serve_forever, name='metrics-server', daemon=True).start()
+    print(f"[메트릭] http://{host}:{port}/metrics")
+    return server
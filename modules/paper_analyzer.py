@@ -1,8 +1,16 @@
 """Claude API를 사용한 논문 분석 모듈"""
 from anthropic import Anthropic
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict
 import json
 
+from config import Config
+from .extraction_store import get_extraction_store
+from .llm_paper_analyzer import create_paper_analysis_prompt, parse_paper_analysis
+from .llm_runner import build_cached_messages, create_message
+from .metrics import record_cache
+from .tracing import annotate, bind, traced
+
 
 class PaperAnalyzer:
     """Claude API를 사용한 논문 종합 분석"""
@@ -16,13 +24,16 @@ class PaperAnalyzer:
         self.client = Anthropic(api_key=api_key)
         self.model = model
 
-    def analyze_papers(self, papers: List[Dict], topic: str) -> Dict:
+    @traced('analysis')
+    def analyze_papers(self, papers: List[Dict], topic: str, map_reduce: bool = None) -> Dict:
         """
         수집한 논문들을 종합 분석
 
         Args:
             papers: 논문 정보 리스트
             topic: 분석 주제
+            map_reduce: True면 논문별 구조화 추출(동시 실행) 후 추출 결과만으로 종합
+                        (None이면 논문 수가 MAP_REDUCE_MIN_PAPERS 이상일 때 사용)
 
         Returns:
             분석 결과 딕셔너리
@@ -30,35 +41,120 @@ class PaperAnalyzer:
         if not papers:
             return {"error": "분석할 논문이 없습니다."}
 
-        print(f"\n🤖 Claude가 {len(papers)}개 논문을 분석 중...")
-
-        # 논문 정보를 텍스트로 정리
-        papers_text = self._format_papers_for_analysis(papers)
+        if map_reduce is None:
+            # 모든 논문의 추출 결과가 저장되어 있으면 맵 단계 비용이 없으므로 항상 사용
+            map_reduce = (len(papers) >= Config.MAP_REDUCE_MIN_PAPERS or
+                          len(get_extraction_store().get_for_papers(papers)) == len(papers))
+
+        annotate(topic=topic, papers=len(papers), map_reduce=map_reduce)
+        extractions = {}
+        if map_reduce:
+            # 맵: 논문별 구조화 추출 → 리듀스: 추출 결과만으로 종합 (초록 전문 대신 짧은 JSON)
+            print(f"\n🤖 Claude가 {len(papers)}개 논문을 논문별로 분석 중...")
+            extractions = self.extract_papers(papers)
+            papers_text = self._format_extractions_for_analysis(papers, extractions)
+            print(f"🤖 추출 결과 {len(extractions)}/{len(papers)}편으로 종합 분석 중...")
+        else:
+            print(f"\n🤖 Claude가 {len(papers)}개 논문을 분석 중...")
+            # 논문 정보를 텍스트로 정리
+            papers_text = self._format_papers_for_analysis(papers)
 
         # Claude에게 분석 요청
-        analysis_prompt = self._create_analysis_prompt(topic, papers_text, len(papers))
+        system, messages = self._create_analysis_messages(topic, papers_text, len(papers))
 
         try:
-            response = self.client.messages.create(
+            analysis_text = create_message(
+                self.client,
                 model=self.model,
                 max_tokens=8000,
-                messages=[{
-                    "role": "user",
-                    "content": analysis_prompt
-                }]
+                system=system,
+                messages=messages
             )
-
-            analysis_text = response.content[0].text
             print("✓ 논문 분석 완료")
 
             # 분석 결과 구조화
             analysis = self._structure_analysis(analysis_text, papers)
+            if map_reduce:
+                analysis['paper_extractions'] = extractions
             return analysis
 
         except Exception as e:
             print(f"✗ 논문 분석 실패: {str(e)}")
             return {"error": str(e)}
 
+    @traced('analysis.extract')
+    def extract_papers(self, papers: List[Dict]) -> Dict[str, Dict]:
+        """
+        논문별 구조화 추출 (PAPER_ANALYSIS_PROMPT, 동시 실행)
+        - 추출 결과 저장소에 있는 논문은 LLM을 호출하지 않음
+
+        Returns:
+            {pmid: 추출 결과} - 실패한 논문은 포함되지 않음
+        """
+        store = get_extraction_store()
+        results = store.get_for_papers(papers)
+        pending = [p for p in papers if p.get('pmid') and p['pmid'] not in results]
+        annotate(papers=len(papers), cache_hits=len(results))
+        record_cache('extraction', hits=len(results), misses=len(pending))
+
+        if results:
+            print(f"  📦 저장된 추출 결과 {len(results)}편 재사용")
+
+        if pending:
+            workers = max(1, min(Config.MAP_REDUCE_WORKERS, len(pending)))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                for paper, extraction in zip(pending, executor.map(bind(self._extract_paper), pending)):
+                    if extraction:
+                        results[paper['pmid']] = extraction
+                        store.save(paper, extraction, model=self.model)
+
+        return results
+
+    def _extract_paper(self, paper: Dict) -> Dict:
+        """논문 한 편 구조화 추출 (실패 시 빈 딕셔너리)"""
+        try:
+            text = create_message(
+                self.client,
+                model=self.model,
+                max_tokens=1500,
+                messages=[{
+                    "role": "user",
+                    "content": create_paper_analysis_prompt(paper)
+                }]
+            )
+        except Exception as e:
+            print(f"  ⚠️ PMID {paper.get('pmid')} 추출 실패: {str(e)}")
+            return {}
+
+        extraction = parse_paper_analysis(text)
+        if not extraction:
+            print(f"  ⚠️ PMID {paper.get('pmid')} 추출 결과 파싱 실패")
+        return extraction
+
+    def _format_extractions_for_analysis(self, papers: List[Dict], extractions: Dict[str, Dict]) -> str:
+        """추출 결과를 종합 분석용 텍스트로 포맷 (추출 실패 논문은 초록 앞부분 사용)"""
+        formatted = []
+
+        for i, paper in enumerate(papers, 1):
+            extraction = extractions.get(paper.get('pmid'))
+            if extraction:
+                body = json.dumps(extraction, ensure_ascii=False, indent=1)
+            else:
+                body = f"초록(일부):\n{(paper.get('abstract') or '')[:800]}"
+
+            formatted.append(f"""
+[논문 {i}]
+제목: {paper['title']}
+저널: {paper['journal']} ({paper['year']})
+PMID: {paper['pmid']}
+
+{body}
+
+---
+""")
+
+        return "\n".join(formatted)
+
     def _format_papers_for_analysis(self, papers: List[Dict]) -> str:
         """논문 정보를 분석용 텍스트로 포맷"""
         formatted = []
@@ -85,14 +181,12 @@ PMID: {paper['pmid']}
 
         return "\n".join(formatted)
 
-    def _create_analysis_prompt(self, topic: str, papers_text: str, paper_count: int) -> str:
-        """논문 분석용 프롬프트 생성"""
-        return f"""당신은 의학/건강 분야의 전문 리서처입니다. 아래 {paper_count}개의 논문들을 분석하여 "{topic}"에 대한 종합적인 인사이트를 제공해주세요.
-
-# 분석 주제: {topic}
-
-# 수집된 논문들:
-{papers_text}
+    def _create_analysis_messages(self, topic: str, papers_text: str, paper_count: int) -> tuple:
+        """
+        논문 분석용 메시지 (system, messages)
+        - 분석 요구사항/출력 형식(고정) → 논문 목록(공유) → 분석 주제 순서로 배치하여 프롬프트 캐싱
+        """
+        static = """당신은 의학/건강 분야의 전문 리서처입니다. 주어진 논문들을 분석하여 분석 주제에 대한 종합적인 인사이트를 제공합니다.
 
 # 분석 요구사항:
 
@@ -125,24 +219,34 @@ PMID: {paper['pmid']}
 **출력 형식:**
 구조화된 JSON 형식으로 반환해주세요:
 
-{{
+{
   "summary": "전체 요약 (3-5문장)",
   "key_findings": [
-    {{"finding": "발견 내용", "evidence": "근거 논문 번호들", "confidence": "높음/중간/낮음"}}
+    {"finding": "발견 내용", "evidence": "근거 논문 번호들", "confidence": "높음/중간/낮음"}
   ],
   "mechanisms": "작용 메커니즘 설명",
   "solutions": [
-    {{"solution": "해결법", "evidence": "근거", "effectiveness": "효과 정도"}}
+    {"solution": "해결법", "evidence": "근거", "effectiveness": "효과 정도"}
   ],
   "practical_advice": [
-    {{"advice": "실천 조언", "rationale": "이유"}}
+    {"advice": "실천 조언", "rationale": "이유"}
   ],
   "controversies": ["논쟁적 부분들"],
   "warnings": ["주의사항들"],
   "research_quality": "전반적인 연구 품질 평가"
-}}
+}
 """
 
+        context = f"""# 수집된 논문들 ({paper_count}개):
+{papers_text}
+"""
+
+        instructions = f"""# 분석 주제: {topic}
+
+위 {paper_count}개의 논문들을 분석하여 "{topic}"에 대한 종합적인 인사이트를 JSON 형식으로 제공해주세요."""
+
+        return build_cached_messages(static, context, instructions)
+
     def _structure_analysis(self, analysis_text: str, papers: List[Dict]) -> Dict:
         """분석 결과를 구조화"""
         try:
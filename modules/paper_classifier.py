@@ -3,6 +3,8 @@ import re
 from typing import List, Dict, Tuple, Optional
 from collections import defaultdict
 
+from .llm_runner import create_message
+
 
 class PaperClassifier:
     """규칙 기반 + AI 보조 논문 분류"""
@@ -233,14 +235,13 @@ class PaperClassifier:
 [2] diet
 [3] cause"""
 
-            response = self.anthropic_client.messages.create(
+            result_text = create_message(
+                self.anthropic_client,
                 model="claude-sonnet-4-5-20250929",
                 max_tokens=500,
                 messages=[{"role": "user", "content": prompt}]
             )
 
-            result_text = response.content[0].text
-
             # 결과 파싱
             results = []
             for line in result_text.strip().split('\n'):
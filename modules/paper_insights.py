@@ -0,0 +1,253 @@
+"""
+논문 인사이트(결론 요약 한글 번역) 생성 단계
+- 결론/초록 마지막 2-3문장을 뽑아 번역한 결과를 논문 레코드(paper['insight'])와 SQLite 저장소에 기록
+- 검색/전문 수집 중 논문이 도착하는 대로 백그라운드에서 배치 처리 → 목록 표시는 문자열 조립만 수행
+- 저장 키는 (PMID, 원문 문장 해시) - 전문이 새로 확보되어 원문이 바뀌면 자동으로 다시 생성
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from config import Config
+from modules.translation_service import get_translation_service
+from modules.metrics import record_cache
+from modules.tracing import annotate, bind, traced
+
+
+def insight_source(paper: Dict) -> Optional[Tuple[str, str]]:
+    """논문에서 번역할 결론 문장 추출 (전문 결론 > 초록 순서) → (영문 결론, 원문) 또는 None"""
+
+    # 1순위: PMC 전문의 결론
+    conclusion = paper.get("conclusion", "")
+    # 2순위: 초록
+    abstract = paper.get("abstract", "")
+
+    # 사용할 텍스트 결정
+    if conclusion and len(conclusion) > 50:
+        source_text = conclusion
+    elif abstract:
+        source_text = abstract
+    else:
+        return None
+
+    # 마지막 2-3문장 추출 (결론 부분)
+    sentences = [s.strip() for s in source_text.replace('\n', ' ').split('. ') if s.strip()]
+
+    if len(sentences) >= 3:
+        insight_en = '. '.join(sentences[-3:])
+    elif len(sentences) >= 2:
+        insight_en = '. '.join(sentences[-2:])
+    else:
+        insight_en = sentences[-1] if sentences else source_text[:300]
+
+    if not insight_en.endswith('.'):
+        insight_en += '.'
+
+    # 너무 길면 자르기 (번역 API 제한)
+    if len(insight_en) > 1000:
+        insight_en = insight_en[:1000]
+
+    return insight_en, source_text
+
+
+def insight_key(paper: Dict) -> str:
+    """현재 논문 내용 기준 인사이트 키 (원문 문장 해시, 내용이 없으면 'none')"""
+    src = insight_source(paper)
+    if not src:
+        return 'none'
+    return hashlib.sha1(src[0].encode('utf-8')).hexdigest()[:16]
+
+
+def _format_insight(paper: Dict, insight_kr: str) -> str:
+    """출처 표시를 붙인 인사이트 문자열"""
+    prefix = "[전문]" if paper.get("has_fulltext") else "[초록]"
+    return f"{prefix} {insight_kr}"
+
+
+def _fallback_insight(source_text: str) -> str:
+    """번역 실패 시 원문 마지막 문장 사용"""
+    sentences = [s.strip() for s in source_text.replace('\n', ' ').split('. ') if s.strip()]
+    if len(sentences) >= 2:
+        return "[번역실패] " + '. '.join(sentences[-2:]) + '.'
+    return "[번역실패] " + (sentences[-1] + '.' if sentences else "추출 실패")
+
+
+class PaperInsightStore:
+    """PMID + 원문 해시 기반 한글 인사이트 테이블"""
+
+    def __init__(self, db_path: str = None):
+        self.db_path = db_path or os.path.join(Config.CACHE_DIR, 'paper_insights.db')
+        os.makedirs(os.path.dirname(self.db_path) or '.', exist_ok=True)
+        self._lock = threading.Lock()
+        # 웹훅 모드에서는 여러 워커 프로세스가 같은 파일을 사용 (WAL + 잠금 대기)
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS paper_insights (
+                pmid TEXT NOT NULL,
+                source_hash TEXT NOT NULL,
+                insight TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (pmid, source_hash)
+            )
+        """)
+        self._conn.commit()
+
+    def get_many(self, keys: List[Tuple[str, str]]) -> Dict[Tuple[str, str], str]:
+        """[(pmid, source_hash)] → {(pmid, source_hash): 한글 인사이트}"""
+        results = {}
+        with self._lock:
+            for pmid, source_hash in keys:
+                row = self._conn.execute(
+                    "SELECT insight FROM paper_insights WHERE pmid = ? AND source_hash = ?",
+                    (pmid, source_hash)
+                ).fetchone()
+                if row:
+                    results[(pmid, source_hash)] = row[0]
+        return results
+
+    def save_many(self, items: Dict[Tuple[str, str], str]):
+        """인사이트 저장"""
+        if not items:
+            return
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO paper_insights (pmid, source_hash, insight, created_at) "
+                "VALUES (?, ?, ?, ?)",
+                [(pmid, h, text, now) for (pmid, h), text in items.items()]
+            )
+            self._conn.commit()
+
+
+# 프로세스 전역 저장소
+_default_store = None
+_default_store_lock = threading.Lock()
+
+
+def get_insight_store() -> PaperInsightStore:
+    """기본 인사이트 저장소 반환"""
+    global _default_store
+    with _default_store_lock:
+        if _default_store is None:
+            _default_store = PaperInsightStore()
+        return _default_store
+
+
+@traced('insights')
+def compute_insights(papers: List[Dict]) -> int:
+    """
+    논문 레코드에 인사이트 기록 (저장소 → 배치 번역 순서, 이미 최신이면 건너뜀)
+    - paper['insight']: 표시용 문자열, paper['insight_key']: 생성 기준 원문 해시
+
+    Returns:
+        새로 번역한 논문 수
+    """
+    store = get_insight_store()
+    todo = []
+    for paper in papers:
+        key = insight_key(paper)
+        if paper.get('insight') and paper.get('insight_key') == key:
+            continue
+        if key == 'none':
+            paper['insight'] = "내용 없음"
+            paper['insight_key'] = key
+            continue
+        todo.append((paper, key))
+
+    if not todo:
+        return 0
+
+    stored = store.get_many([(p['pmid'], k) for p, k in todo if p.get('pmid')])
+    annotate(papers=len(todo), cache_hits=len(stored))
+    missing = []
+    for paper, key in todo:
+        cached = stored.get((paper.get('pmid'), key))
+        if cached:
+            paper['insight'] = _format_insight(paper, cached)
+            paper['insight_key'] = key
+        else:
+            missing.append((paper, key))
+
+    record_cache('insights', hits=len(todo) - len(missing), misses=len(missing))
+    if not missing:
+        return 0
+
+    sources = [insight_source(paper) for paper, _ in missing]
+    translated = get_translation_service().translate_many([src[0] for src in sources], source='en', target='ko')
+
+    new_items = {}
+    for (paper, key), src, insight_kr in zip(missing, sources, translated):
+        if insight_kr:
+            paper['insight'] = _format_insight(paper, insight_kr)
+            paper['insight_key'] = key
+            if paper.get('pmid'):
+                new_items[(paper['pmid'], key)] = insight_kr
+        else:
+            # 번역 실패는 저장하지 않음 (다음 생성 시 재시도)
+            paper['insight'] = _fallback_insight(src[1])
+            paper.pop('insight_key', None)
+
+    store.save_many(new_items)
+    return len(missing)
+
+
+class InsightStage:
+    """
+    논문이 도착하는 대로 인사이트를 만드는 백그라운드 단계 (검색 작업당 1개)
+    - submit()으로 들어온 논문을 모아 두었다가 한 번에 처리 (처리 중 들어온 논문은 다음 배치)
+    """
+
+    def __init__(self):
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='insight')
+        self._pending: List[Dict] = []
+        self._futures: List[Future] = []
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def submit(self, papers: List[Dict]):
+        """인사이트 생성 예약"""
+        with self._lock:
+            if self._closed or not papers:
+                return
+            schedule = not self._pending
+            self._pending.extend(papers)
+            if schedule:
+                self._futures.append(self._executor.submit(bind(self._flush)))
+
+    def _flush(self):
+        with self._lock:
+            papers, self._pending = self._pending, []
+        try:
+            compute_insights(papers)
+        except Exception as e:
+            print(f"[인사이트] 생성 실패 ({len(papers)}편): {type(e).__name__}: {e}")
+
+    def wait(self, papers: List[Dict], timeout: float = None):
+        """
+        예약된 배치를 기다린 뒤 아직 인사이트가 없거나 오래된 논문을 마저 처리
+
+        Args:
+            papers: 표시할 논문
+            timeout: 배치 대기 시간 (초)
+        """
+        deadline = time.time() + (Config.INSIGHT_WAIT_TIMEOUT if timeout is None else timeout)
+        with self._lock:
+            futures = list(self._futures)
+        for future in futures:
+            try:
+                future.result(timeout=max(0.0, deadline - time.time()))
+            except Exception:
+                break
+        compute_insights(papers)
+
+    def close(self):
+        """대기 중인 배치 취소"""
+        with self._lock:
+            self._closed = True
+        self._executor.shutdown(wait=False, cancel_futures=True)
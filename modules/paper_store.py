@@ -0,0 +1,126 @@
+"""
+공유 논문 저장소
+- 논문 본문(서지 정보, 초록, PMC 결론/결과)을 내용 해시로 한 번만 저장
+- 세션에는 참조(해시) + 세션별 주석(관련성 점수, 점수 근거, 전문 여부, 인사이트)만 저장
+- 본문이 바뀌면(예: 전문 확보) 새 해시로 저장되므로 기존 세션 참조는 그대로 유효
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Tuple
+
+from config import Config
+
+
+# 논문 본문 필드 (검색/전문 수집 결과) - 나머지 필드는 세션별 주석으로 취급
+PAPER_BODY_FIELDS = (
+    'pmid', 'title', 'authors', 'journal', 'year', 'abstract', 'study_type', 'url',
+    'pmcid', 'conclusion', 'results',
+)
+
+
+def split_paper(paper: Dict) -> Tuple[Dict, Dict]:
+    """논문 → (본문, 세션별 주석)"""
+    body = {k: paper[k] for k in PAPER_BODY_FIELDS if k in paper}
+    annotations = {k: v for k, v in paper.items() if k not in PAPER_BODY_FIELDS}
+    return body, annotations
+
+
+def paper_ref(body: Dict) -> str:
+    """본문 내용 해시"""
+    payload = json.dumps(body, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:32]
+
+
+class PaperStore:
+    """내용 해시 기반 논문 본문 테이블"""
+
+    def __init__(self, db_path: str = None):
+        self.db_path = db_path or os.path.join(Config.SESSION_DIR, 'papers.db')
+        os.makedirs(os.path.dirname(self.db_path) or '.', exist_ok=True)
+        self._lock = threading.Lock()
+        # 웹훅 모드에서는 여러 워커 프로세스가 같은 파일을 사용 (WAL + 잠금 대기)
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS papers (
+                ref TEXT PRIMARY KEY,
+                pmid TEXT,
+                body TEXT NOT NULL,
+                stored_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_papers_pmid ON papers (pmid, stored_at);
+        """)
+        self._conn.commit()
+
+    def put_many(self, papers: List[Dict]) -> List[Dict]:
+        """
+        논문 본문 저장 (이미 있는 본문은 건너뜀)
+
+        Returns:
+            세션 저장용 참조 리스트 [{'ref', 'pmid', 'ann'}]
+        """
+        refs = []
+        rows = []
+        now = time.time()
+        for paper in papers:
+            body, annotations = split_paper(paper)
+            ref = paper_ref(body)
+            refs.append({'ref': ref, 'pmid': body.get('pmid'), 'ann': annotations})
+            rows.append((ref, body.get('pmid'), json.dumps(body, ensure_ascii=False), now))
+
+        if rows:
+            with self._lock, self._conn:
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO papers (ref, pmid, body, stored_at) VALUES (?, ?, ?, ?)", rows
+                )
+        return refs
+
+    def get_many(self, refs: List[str]) -> Dict[str, Dict]:
+        """참조 → {참조: 본문}"""
+        results = {}
+        refs = list(set(refs))
+        with self._lock:
+            # SQLite 변수 개수 제한 고려하여 나눠서 조회
+            for i in range(0, len(refs), 500):
+                chunk = refs[i:i + 500]
+                placeholders = ','.join('?' * len(chunk))
+                for ref, body in self._conn.execute(
+                    f"SELECT ref, body FROM papers WHERE ref IN ({placeholders})", chunk
+                ):
+                    results[ref] = json.loads(body)
+        return results
+
+    def resolve(self, entries: List[Dict]) -> List[Dict]:
+        """세션 참조 리스트 → 논문 리스트 (본문 + 세션별 주석)"""
+        bodies = self.get_many([e['ref'] for e in entries if 'ref' in e])
+        papers = []
+        for entry in entries:
+            if 'ref' not in entry:
+                # 참조 저장 이전 형식 (논문 전체가 그대로 들어 있음)
+                papers.append(entry)
+                continue
+            body = bodies.get(entry['ref'])
+            if body is None:
+                print(f"[논문 저장소] PMID {entry.get('pmid')} 본문 없음 - 주석만 복원")
+                body = {'pmid': entry.get('pmid')}
+            papers.append({**body, **entry.get('ann', {})})
+        return papers
+
+
+# 프로세스 전역 저장소
+_default_store = None
+_default_store_lock = threading.Lock()
+
+
+def get_paper_store() -> PaperStore:
+    """기본 논문 저장소 반환"""
+    global _default_store
+    with _default_store_lock:
+        if _default_store is None:
+            _default_store = PaperStore()
+        return _default_store
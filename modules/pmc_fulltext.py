@@ -1,9 +1,16 @@
 """PubMed Central 전문(Full Text) 가져오기 모듈"""
-import requests
 import xml.etree.ElementTree as ET
 from typing import Optional, Dict
 import time
 
+from modules.metrics import http_get
+from modules.tracing import annotate, traced
+
+
+class PMCError(Exception):
+    """PMC 요청 실패 (시간 초과, 429 등 - '전문 없음'과 구분)"""
+    pass
+
 
 class PMCFullTextFetcher:
     """PMC에서 오픈액세스 논문 전문을 가져오는 클래스"""
@@ -15,8 +22,8 @@ class PMCFullTextFetcher:
         self.email = email
         self.api_key = api_key
 
-    def get_pmcid_from_pmid(self, pmid: str) -> Optional[str]:
-        """PMID로 PMCID 찾기"""
+    def get_pmcid_from_pmid(self, pmid: str, raise_errors: bool = False) -> Optional[str]:
+        """PMID로 PMCID 찾기 (PMC 연결 없음은 None, raise_errors=True면 요청 실패 시 PMCError)"""
         try:
             url = f"{self.BASE_URL}/elink.fcgi"
             params = {
@@ -29,7 +36,8 @@ class PMCFullTextFetcher:
             if self.api_key:
                 params["api_key"] = self.api_key
 
-            response = requests.get(url, params=params, timeout=10)
+            response = http_get('ncbi', 'elink', url, params=params, timeout=10)
+            response.raise_for_status()
             data = response.json()
 
             # PMCID 추출
@@ -44,10 +52,12 @@ class PMCFullTextFetcher:
             return None
 
         except Exception as e:
+            if raise_errors:
+                raise PMCError(f"elink 실패 (PMID {pmid}): {e}") from e
             return None
 
-    def fetch_fulltext(self, pmcid: str) -> Optional[Dict]:
-        """PMCID로 전문 가져오기"""
+    def fetch_fulltext(self, pmcid: str, raise_errors: bool = False) -> Optional[Dict]:
+        """PMCID로 전문 가져오기 (raise_errors=True면 요청 실패 시 None 대신 PMCError)"""
         try:
             # PMC ID에서 숫자만 추출
             pmc_num = pmcid.replace("PMC", "")
@@ -62,10 +72,9 @@ class PMCFullTextFetcher:
             if self.api_key:
                 params["api_key"] = self.api_key
 
-            response = requests.get(url, params=params, timeout=30)
+            response = http_get('ncbi', 'efetch_pmc', url, params=params, timeout=30)
 
-            if response.status_code != 200:
-                return None
+            response.raise_for_status()
 
             # XML 파싱
             root = ET.fromstring(response.content)
@@ -110,6 +119,8 @@ class PMCFullTextFetcher:
             return result
 
         except Exception as e:
+            if raise_errors:
+                raise PMCError(f"efetch 실패 ({pmcid}): {e}") from e
             return None
 
     def _get_all_text(self, element) -> str:
@@ -151,13 +162,23 @@ class PMCFullTextFetcher:
 
         return ""
 
-    def get_paper_with_fulltext(self, pmid: str, debug: bool = True) -> Optional[Dict]:
-        """PMID로 전문 포함 논문 정보 가져오기"""
+    @traced('pmc')
+    def get_paper_with_fulltext(self, pmid: str, debug: bool = True, raise_errors: bool = False) -> Optional[Dict]:
+        """
+        PMID로 전문 포함 논문 정보 가져오기
+
+        Returns:
+            전문 정보 (PMC에 전문이 없으면 None)
+
+        Raises:
+            PMCError: raise_errors=True이고 NCBI 요청이 실패한 경우 ('전문 없음'과 구분)
+        """
         import time as t
         start = t.time()
 
         # 1. PMCID 찾기
-        pmcid = self.get_pmcid_from_pmid(pmid)
+        pmcid = self.get_pmcid_from_pmid(pmid, raise_errors=raise_errors)
+        annotate(pmid=pmid, pmcid=pmcid, fulltext=False)
         if not pmcid:
             if debug:
                 print(f"[PMC] PMID {pmid}: PMCID 없음 ({t.time()-start:.1f}초)")
@@ -170,12 +191,13 @@ class PMCFullTextFetcher:
         time.sleep(0.1)
 
         # 2. 전문 가져오기
-        fulltext = self.fetch_fulltext(pmcid)
+        fulltext = self.fetch_fulltext(pmcid, raise_errors=raise_errors)
         if not fulltext:
             if debug:
                 print(f"[PMC] {pmcid}: 전문 없음 ({t.time()-start:.1f}초)")
             return None
 
+        annotate(fulltext=True)
         if debug:
             print(f"[PMC] {pmcid}: 전문 확보 ({t.time()-start:.1f}초)")
         return fulltext
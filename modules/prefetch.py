@@ -0,0 +1,106 @@
+"""
+인기 키워드 사전 수집 (웜 캐시 갱신)
+- 한가한 시간대에 설정된 키워드의 토픽 추출 → PubMed 검색 → PMC 전문 → 점수 평가 → 인사이트 번역을 미리 실행
+- 결과는 각 단계의 캐시/저장소에 남아 실제 사용자 요청이 바로 재사용
+- 키워드 사이에 쉬는 시간을 두어 NCBI/Claude 호출 한도를 지킴
+- 실행 결과 보고서를 CACHE_DIR/prefetch_report.json에 저장
+"""
+
+import json
+import os
+import time
+from datetime import datetime
+from typing import Callable, Dict, List
+
+from config import Config
+
+
+def _report_path() -> str:
+    return os.path.join(Config.CACHE_DIR, 'prefetch_report.json')
+
+
+def run_prefetch(keywords: List[str], prefetch_keyword: Callable[[str], Dict],
+                 pause: float = None, should_stop: Callable[[], bool] = None) -> Dict:
+    """
+    키워드 목록 사전 수집
+
+    Args:
+        keywords: 수집할 키워드
+        prefetch_keyword: 키워드 하나를 수집하고 통계 dict를 반환하는 함수
+        pause: 키워드 사이 대기 시간 (초)
+        should_stop: True를 반환하면 남은 키워드를 건너뜀 (작업 취소용)
+
+    Returns:
+        보고서 {'started_at', 'finished_at', 'elapsed', 'keywords': [...]}
+    """
+    pause = Config.PREFETCH_PAUSE if pause is None else pause
+    started = time.time()
+    report = {'started_at': datetime.now().isoformat(timespec='seconds'), 'keywords': []}
+
+    for i, keyword in enumerate(keywords):
+        if should_stop and should_stop():
+            report['keywords'].append({'keyword': keyword, 'ok': False, 'error': '취소됨'})
+            continue
+        if i > 0 and pause:
+            time.sleep(pause)
+
+        print(f"[사전수집] ({i + 1}/{len(keywords)}) {keyword}")
+        keyword_start = time.time()
+        entry = {'keyword': keyword}
+        try:
+            entry.update(prefetch_keyword(keyword))
+            entry['ok'] = True
+        except Exception as e:
+            entry['ok'] = False
+            entry['error'] = f"{type(e).__name__}: {e}"
+            print(f"[사전수집] {keyword} 실패: {entry['error']}")
+        entry['elapsed'] = round(time.time() - keyword_start, 1)
+        report['keywords'].append(entry)
+
+    report['finished_at'] = datetime.now().isoformat(timespec='seconds')
+    report['elapsed'] = round(time.time() - started, 1)
+    save_report(report)
+    return report
+
+
+def save_report(report: Dict):
+    """보고서 저장"""
+    try:
+        os.makedirs(Config.CACHE_DIR, exist_ok=True)
+        with open(_report_path(), 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    except OSError as e:
+        print(f"[사전수집] 보고서 저장 실패: {e}")
+
+
+def load_report() -> Dict:
+    """마지막 보고서 (없으면 빈 dict)"""
+    try:
+        with open(_report_path(), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def format_report(report: Dict) -> str:
+    """보고서 요약 텍스트"""
+    if not report:
+        return "사전 수집 기록이 없습니다."
+
+    entries = report.get('keywords', [])
+    ok = sum(1 for e in entries if e.get('ok'))
+    lines = [
+        f"🔥 사전 수집 {report.get('started_at', '')} ({report.get('elapsed', 0)}초)",
+        f"성공 {ok}/{len(entries)}개 키워드",
+        "",
+    ]
+    for e in entries:
+        if e.get('ok'):
+            lines.append(
+                f"✅ {e['keyword']}: 토픽 {e.get('topics', 0)}개, 검색 {e.get('runs', 0)}회, "
+                f"논문 {e.get('papers', 0)}편 (전문 {e.get('fulltext', 0)}, 채택 {e.get('accepted', 0)}) "
+                f"- {e.get('elapsed', 0)}초"
+            )
+        else:
+            lines.append(f"❌ {e['keyword']}: {e.get('error', '')}")
+    return "\n".join(lines)
@@ -0,0 +1,233 @@
+"""
+토큰 예산 기반 프롬프트 패킹 모듈
+- 한글/영문 혼합 텍스트의 토큰 수를 로컬에서 빠르게 추정
+- 호출 종류별 토큰 예산 안에서 항목을 최대한 채우고, 최소 호출 수로 분할
+- 관측된 응답 시간/타임아웃으로 예산을 자동 조정
+"""
+
+import atexit
+import json
+import math
+import os
+import re
+import threading
+import time
+from typing import Callable, Dict, List, Sequence
+
+from config import Config
+
+
+_HANGUL_RE = re.compile(r'[가-힣ㄱ-ㆎ]')
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    토큰 수 근사치
+    - 한글: 약 1.2자당 1토큰, ASCII: 약 4자당 1토큰, 기타 문자: 약 2자당 1토큰
+    """
+    if not text:
+        return 0
+    hangul = len(_HANGUL_RE.findall(text))
+    ascii_count = sum(1 for c in text if ord(c) < 128)
+    other = len(text) - hangul - ascii_count
+    return int(math.ceil(hangul / 1.2 + ascii_count / 4 + other / 2))
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """추정 토큰 수가 max_tokens 이하가 되도록 뒷부분 자르기"""
+    if not text or max_tokens <= 0:
+        return ''
+    if estimate_tokens(text) <= max_tokens:
+        return text
+
+    # 이분 탐색으로 잘라낼 위치 결정
+    lo, hi = 0, len(text)
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if estimate_tokens(text[:mid]) <= max_tokens:
+            lo = mid
+        else:
+            hi = mid - 1
+    return text[:lo]
+
+
+def fit_texts(texts: Sequence[str], budget_tokens: int, min_tokens: int = 50) -> List[str]:
+    """
+    여러 텍스트를 하나의 예산에 나눠 담기 (짧은 텍스트는 그대로, 남는 예산은 긴 텍스트에 배분)
+
+    Args:
+        texts: 원문 텍스트 리스트 (앞쪽이 우선순위 높음)
+        budget_tokens: 전체 토큰 예산
+        min_tokens: 항목당 최소 토큰 - 예산이 부족하면 뒤쪽 항목부터 제외
+
+    Returns:
+        잘라낸 텍스트 리스트 (제외된 항목은 포함되지 않음)
+    """
+    if not texts or budget_tokens <= 0:
+        return []
+
+    max_count = max(1, budget_tokens // max(min_tokens, 1))
+    texts = list(texts)[:max_count]
+    sizes = [estimate_tokens(t) for t in texts]
+
+    # 워터필링: 작은 항목부터 전부 배정하고 남은 예산을 나머지에 균등 분배
+    allocation = [0] * len(texts)
+    remaining_budget = budget_tokens
+    pending = sorted(range(len(texts)), key=lambda i: sizes[i])
+    while pending:
+        share = remaining_budget // len(pending)
+        idx = pending[0]
+        if sizes[idx] <= share:
+            allocation[idx] = sizes[idx]
+            remaining_budget -= sizes[idx]
+            pending.pop(0)
+        else:
+            for i in pending:
+                allocation[i] = share
+            break
+
+    return [truncate_to_tokens(t, a) if sizes[i] > a else t
+            for i, (t, a) in enumerate(zip(texts, allocation))]
+
+
+def pack_batches(items: Sequence, render: Callable[[object], str], budget_tokens: int,
+                 max_items: int = None) -> List[List]:
+    """
+    항목들을 토큰 예산 안에서 최소 개수의 배치로 나누기 (순서 유지)
+
+    Args:
+        items: 배치로 묶을 항목
+        render: 항목 → 프롬프트에 들어갈 텍스트
+        budget_tokens: 배치당 토큰 예산 (공통 지시문 제외)
+        max_items: 배치당 최대 항목 수 (응답 길이 제한용)
+
+    Returns:
+        배치 리스트
+    """
+    batches = []
+    current = []
+    current_tokens = 0
+
+    for item in items:
+        tokens = estimate_tokens(render(item))
+        full = max_items and len(current) >= max_items
+        if current and (current_tokens + tokens > budget_tokens or full):
+            batches.append(current)
+            current = []
+            current_tokens = 0
+        current.append(item)
+        current_tokens += tokens
+
+    if current:
+        batches.append(current)
+
+    return batches
+
+
+class LatencyModel:
+    """
+    호출 종류별 응답 시간 학습
+    - 1천 토큰당 응답 시간(초)을 지수이동평균으로 추적
+    - 타임아웃이 나면 예산을 줄이고, 목표 시간 안에 끝나면 점차 복구
+    - 상태 파일은 SAVE_INTERVAL마다 한 번만 저장 (타임아웃은 즉시, 종료 시 flush)
+    """
+
+    EMA_ALPHA = 0.3
+    TIMEOUT_PENALTY = 0.7
+    RECOVERY = 1.1
+    MIN_BUDGET = 1000
+    SAVE_INTERVAL = 30  # 상태 파일 최소 저장 간격 (초)
+
+    def __init__(self, state_path: str = None):
+        self.state_path = state_path or os.path.join(Config.CACHE_DIR, 'llm_latency.json')
+        self._lock = threading.Lock()
+        self._state = self._load()
+        self._dirty = False
+        self._last_save = 0.0
+
+    def _load(self) -> Dict:
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    def _save(self):
+        """상태 파일 저장 (락 안에서 호출, 임시 파일에 쓰고 교체해 읽는 쪽이 깨진 파일을 보지 않게 함)"""
+        tmp_path = f"{self.state_path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.state_path) or '.', exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._state, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.state_path)
+            self._dirty = False
+        except OSError:
+            pass
+        self._last_save = time.time()
+
+    def flush(self):
+        """저장하지 않은 변경이 있으면 저장 (종료 시 호출)"""
+        with self._lock:
+            if self._dirty:
+                self._save()
+
+    def record(self, kind: str, prompt_tokens: int, elapsed: float, timed_out: bool = False):
+        """호출 결과 기록"""
+        with self._lock:
+            entry = self._state.setdefault(kind, {'sec_per_ktok': None, 'penalty': 1.0, 'calls': 0, 'timeouts': 0})
+            entry['calls'] += 1
+
+            if timed_out:
+                entry['timeouts'] += 1
+                entry['penalty'] = max(0.2, entry['penalty'] * self.TIMEOUT_PENALTY)
+            else:
+                observed = elapsed / max(prompt_tokens / 1000, 0.1)
+                prev = entry['sec_per_ktok']
+                entry['sec_per_ktok'] = observed if prev is None else (
+                    self.EMA_ALPHA * observed + (1 - self.EMA_ALPHA) * prev
+                )
+                target = Config.LLM_LATENCY_TARGETS.get(kind)
+                if target and elapsed <= target:
+                    entry['penalty'] = min(1.0, entry['penalty'] * self.RECOVERY)
+
+            self._dirty = True
+            # 타임아웃은 예산을 바로 줄이므로 즉시 저장, 나머지는 간격을 두고 모아서 저장
+            if timed_out or time.time() - self._last_save >= self.SAVE_INTERVAL:
+                self._save()
+
+    def budget(self, kind: str) -> int:
+        """호출 종류별 현재 토큰 예산"""
+        configured = Config.PROMPT_TOKEN_BUDGETS.get(kind, 4000)
+        target = Config.LLM_LATENCY_TARGETS.get(kind)
+
+        with self._lock:
+            entry = self._state.get(kind, {})
+            sec_per_ktok = entry.get('sec_per_ktok')
+            penalty = entry.get('penalty', 1.0)
+
+        budget = configured
+        if target and sec_per_ktok:
+            budget = min(budget, int(target / sec_per_ktok * 1000))
+        budget = int(budget * penalty)
+
+        return max(min(self.MIN_BUDGET, configured), budget)
+
+
+# 프로세스 전역 모델
+_latency_model = None
+_latency_model_lock = threading.Lock()
+
+
+def get_latency_model() -> LatencyModel:
+    """기본 응답 시간 모델 반환"""
+    global _latency_model
+    with _latency_model_lock:
+        if _latency_model is None:
+            _latency_model = LatencyModel()
+            atexit.register(_latency_model.flush)
+        return _latency_model
+
+
+def token_budget(kind: str) -> int:
+    """호출 종류('scoring', 'analysis', 'topics', 'html')별 프롬프트 토큰 예산"""
+    return get_latency_model().budget(kind)
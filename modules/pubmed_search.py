@@ -1,9 +1,16 @@
 """PubMed 논문 검색 모듈"""
-import requests
 import xml.etree.ElementTree as ET
 from typing import List, Dict, Optional
 import time
 
+from modules.metrics import http_get
+from modules.tracing import span
+
+
+class PubMedError(Exception):
+    """PubMed 요청 실패 (시간 초과, 429 등 - '검색 결과 없음'과 구분)"""
+    pass
+
 
 class PubMedSearcher:
     """PubMed API를 사용한 논문 검색"""
@@ -19,7 +26,7 @@ class PubMedSearcher:
         self.base_url = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/"
 
     def search(self, query: str, max_results: int = 12,
-               sort_by: str = "relevance", strict: bool = False) -> List[str]:
+               sort_by: str = "relevance", strict: bool = False, raise_errors: bool = False) -> List[str]:
         """
         PubMed에서 논문 검색
 
@@ -28,6 +35,7 @@ class PubMedSearcher:
             max_results: 최대 결과 개수
             sort_by: 정렬 기준 ("relevance", "pub_date", "cited")
             strict: True면 고품질 연구만, False면 더 많은 결과
+            raise_errors: True면 요청 실패 시 빈 리스트 대신 PubMedError 발생
 
         Returns:
             PubMed ID 리스트
@@ -49,26 +57,31 @@ class PubMedSearcher:
             if self.api_key:
                 params['api_key'] = self.api_key
 
-            response = requests.get(f"{self.base_url}esearch.fcgi", params=params)
-            response.raise_for_status()
+            with span('pubmed.esearch', query=query, max_results=max_results) as s:
+                response = http_get('ncbi', 'esearch', f"{self.base_url}esearch.fcgi", params=params)
+                response.raise_for_status()
 
-            # XML 파싱
-            root = ET.fromstring(response.content)
-            pmids = [id_elem.text for id_elem in root.findall('.//Id')]
+                # XML 파싱
+                root = ET.fromstring(response.content)
+                pmids = [id_elem.text for id_elem in root.findall('.//Id')]
+                s.set(hits=len(pmids))
 
             print(f"✓ {len(pmids)}개의 논문을 찾았습니다.")
             return pmids
 
         except Exception as e:
             print(f"✗ PubMed 검색 실패: {str(e)}")
+            if raise_errors:
+                raise PubMedError(f"esearch 실패: {e}") from e
             return []
 
-    def fetch_details(self, pmids: List[str]) -> List[Dict]:
+    def fetch_details(self, pmids: List[str], raise_errors: bool = False) -> List[Dict]:
         """
         논문 상세 정보 가져오기
 
         Args:
             pmids: PubMed ID 리스트
+            raise_errors: True면 요청 실패 시 일부 결과 대신 PubMedError 발생
 
         Returns:
             논문 정보 딕셔너리 리스트
@@ -98,17 +111,21 @@ class PubMedSearcher:
                 if self.api_key:
                     params['api_key'] = self.api_key
 
-                response = requests.get(f"{self.base_url}efetch.fcgi", params=params)
-                response.raise_for_status()
+                with span('pubmed.efetch', pmids=len(batch_pmids)) as s:
+                    response = http_get('ncbi', 'efetch', f"{self.base_url}efetch.fcgi", params=params)
+                    response.raise_for_status()
 
-                # XML 파싱
-                root = ET.fromstring(response.content)
+                    # XML 파싱
+                    root = ET.fromstring(response.content)
 
-                # 각 논문 정보 파싱
-                for article in root.findall('.//PubmedArticle'):
-                    paper = self._parse_paper_xml(article)
-                    if paper:
-                        papers.append(paper)
+                    # 각 논문 정보 파싱
+                    parsed = 0
+                    for article in root.findall('.//PubmedArticle'):
+                        paper = self._parse_paper_xml(article)
+                        if paper:
+                            papers.append(paper)
+                            parsed += 1
+                    s.set(papers=parsed)
 
                 print(f"✓ {len(papers)}/{len(pmids)} 논문 정보 수집 완료")
 
@@ -116,6 +133,8 @@ class PubMedSearcher:
 
         except Exception as e:
             print(f"✗ 논문 정보 수집 실패: {str(e)}")
+            if raise_errors:
+                raise PubMedError(f"efetch 실패 ({len(papers)}/{len(pmids)}편 수집 후): {e}") from e
             return papers
 
     def _optimize_query(self, query: str, strict: bool = False) -> str:
@@ -197,17 +216,18 @@ class PubMedSearcher:
             print(f"✗ 논문 파싱 실패: {str(e)}")
             return None
 
-    def search_and_fetch(self, query: str, max_results: int = 12, strict: bool = False) -> List[Dict]:
-        """검색과 상세 정보 가져오기를 한 번에 수행"""
+    def search_and_fetch(self, query: str, max_results: int = 12, strict: bool = False,
+                         raise_errors: bool = False) -> List[Dict]:
+        """검색과 상세 정보 가져오기를 한 번에 수행 (raise_errors=True면 요청 실패 시 PubMedError)"""
         print(f"\n🔍 '{query}' 검색 중...")
-        pmids = self.search(query, max_results, strict=strict)
+        pmids = self.search(query, max_results, strict=strict, raise_errors=raise_errors)
 
         if not pmids:
             print("✗ 검색 결과가 없습니다.")
             return []
 
         print(f"\n📄 논문 정보 수집 중...")
-        papers = self.fetch_details(pmids)
+        papers = self.fetch_details(pmids, raise_errors=raise_errors)
 
         print(f"\n✓ 총 {len(papers)}개 논문 수집 완료\n")
         return papers
@@ -0,0 +1,115 @@
+"""
+논문 관련성 점수 저장소
+- (PMID, 키워드/토픽 시그니처)별 Claude 점수를 SQLite에 영구 저장
+- 같은 키워드·토픽 조합이면 세션이 달라도 점수 재사용
+"""
+
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List
+
+from config import Config
+
+
+def make_signature(keyword: str, topics: Iterable[str] = None) -> str:
+    """
+    키워드/토픽 조합을 정규화하여 시그니처 생성
+    - 대소문자, 공백, 토픽 순서/중복 차이는 같은 시그니처로 취급
+    """
+    def _norm(text: str) -> str:
+        return re.sub(r'\s+', '', (text or '')).lower()
+
+    norm_topics = sorted({_norm(t) for t in (topics or []) if _norm(t)})
+    raw = _norm(keyword) + '|' + ','.join(norm_topics)
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+
+class RelevanceScoreStore:
+    """PMID + 시그니처 기반 관련성 점수 테이블"""
+
+    def __init__(self, db_path: str = None):
+        self.db_path = db_path or os.path.join(Config.CACHE_DIR, 'relevance_scores.db')
+        os.makedirs(os.path.dirname(self.db_path) or '.', exist_ok=True)
+        self._lock = threading.Lock()
+        # 웹훅 모드에서는 여러 워커 프로세스가 같은 파일을 사용 (WAL + 잠금 대기)
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS relevance_scores (
+                signature TEXT NOT NULL,
+                pmid TEXT NOT NULL,
+                score INTEGER NOT NULL,
+                accepted INTEGER NOT NULL,
+                reason TEXT,
+                scored_at REAL NOT NULL,
+                PRIMARY KEY (signature, pmid)
+            )
+        """)
+        self._conn.commit()
+
+    def get_scores(self, signature: str, pmids: List[str]) -> Dict[str, Dict]:
+        """
+        저장된 점수 조회
+
+        Returns:
+            {pmid: {'score': int, 'accepted': bool, 'reason': str}}
+        """
+        pmids = [p for p in pmids if p]
+        if not pmids:
+            return {}
+
+        results = {}
+        with self._lock:
+            # SQLite 변수 개수 제한 고려하여 나눠서 조회
+            for i in range(0, len(pmids), 500):
+                chunk = pmids[i:i + 500]
+                placeholders = ','.join('?' * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT pmid, score, accepted, reason FROM relevance_scores "
+                    f"WHERE signature = ? AND pmid IN ({placeholders})",
+                    [signature] + chunk
+                ).fetchall()
+                for pmid, score, accepted, reason in rows:
+                    results[pmid] = {'score': score, 'accepted': bool(accepted), 'reason': reason or ''}
+        return results
+
+    def save_scores(self, signature: str, scores: Dict[str, Dict]):
+        """점수 저장 ({pmid: {'score', 'accepted', 'reason'}})"""
+        if not scores:
+            return
+
+        now = time.time()
+        rows = [
+            (signature, pmid, int(s.get('score', 0)), int(bool(s.get('accepted'))), s.get('reason', ''), now)
+            for pmid, s in scores.items() if pmid
+        ]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO relevance_scores "
+                "(signature, pmid, score, accepted, reason, scored_at) VALUES (?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            self._conn.commit()
+
+    def count(self) -> int:
+        """저장된 점수 개수"""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM relevance_scores").fetchone()[0]
+
+
+# 프로세스 전역 저장소
+_default_store = None
+_default_store_lock = threading.Lock()
+
+
+def get_relevance_store() -> RelevanceScoreStore:
+    """기본 관련성 점수 저장소 반환"""
+    global _default_store
+    with _default_store_lock:
+        if _default_store is None:
+            _default_store = RelevanceScoreStore()
+        return _default_store
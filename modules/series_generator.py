@@ -1,9 +1,38 @@
 """시리즈 블로그 글 생성 모듈"""
+import hashlib
 import json
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from typing import List, Dict, Optional
+
+from config import Config
 from .blog_style import BLOG_STYLE_PROMPT
+from .extraction_store import get_extraction_store
+from .llm_paper_analyzer import format_paper_analysis
+from .llm_runner import build_cached_messages, create_message
+
+
+# 시리즈 글 작성 규칙/출력 형식 (스타일 가이드와 함께 캐시 프리픽스로 사용)
+SERIES_WRITING_RULES = '''# 작성 규칙
+
+1. 이 글은 시리즈의 일부이므로, 다른 편에서 다룰 내용은 "~편에서 자세히 다룰게요!"라고 언급만 하세요.
+2. 이번 편의 주제에 집중하세요.
+3. 논문에서 나온 구체적인 수치와 방법을 사용하세요.
+4. 말투 규칙을 철저히 지키세요 ("~에요", "~하죠", "~거예요").
+
+# 출력 형식
+
+HTML로 작성하되, 다음 구조를 따르세요:
+- <h2>, <h3>로 소제목
+- <p>로 문단
+- <ul>, <ol>로 목록
+- <blockquote>로 인용
+- <div class="highlight purple/green/blue">로 강조
+- <div class="caution">로 주의사항
+- <div class="recommend-box">로 추천
+- <div class="summary-box">로 정리'''
 
 
 class SeriesBlogGenerator:
@@ -19,6 +48,9 @@ class SeriesBlogGenerator:
         ('complications', '합병증편', '주의해야 할 점들')
     ]
 
+    # 글 생성 모델
+    MODEL = "claude-sonnet-4-5-20250929"
+
     # 시리즈 HTML 템플릿 (네비게이션 포함)
     SERIES_HTML_TEMPLATE = '''<!DOCTYPE html>
 <html lang="ko">
@@ -386,14 +418,19 @@ class SeriesBlogGenerator:
 </body>
 </html>'''
 
-    def __init__(self, anthropic_client=None, output_dir: str = 'output'):
+    def __init__(self, anthropic_client=None, output_dir: str = 'output',
+                 max_workers: int = None, max_retries: int = None):
         """
         Args:
             anthropic_client: Anthropic API 클라이언트
             output_dir: 출력 디렉토리
+            max_workers: 동시에 생성할 에피소드 수 (기본: Config.SERIES_WORKERS)
+            max_retries: 에피소드 생성 실패 시 재시도 횟수 (기본: Config.SERIES_MAX_RETRIES)
         """
         self.anthropic_client = anthropic_client
         self.output_dir = output_dir
+        self.max_workers = max_workers or Config.SERIES_WORKERS
+        self.max_retries = Config.SERIES_MAX_RETRIES if max_retries is None else max_retries
         os.makedirs(output_dir, exist_ok=True)
 
     def plan_series(self, topic: str, categorized_papers: Dict[str, List[Dict]]) -> Dict:
@@ -461,6 +498,9 @@ class SeriesBlogGenerator:
 
         Returns:
             생성된 HTML 콘텐츠
+
+        Raises:
+            재시도 후에도 생성에 실패하면 마지막 예외를 그대로 전달
         """
         if not self.anthropic_client:
             return self._generate_placeholder(topic, episode_info, papers)
@@ -468,50 +508,57 @@ class SeriesBlogGenerator:
         # 논문 정보를 텍스트로 변환
         papers_text = self._format_papers_for_prompt(papers)
 
-        # 시리즈 컨텍스트 생성
-        series_context = self._create_series_context(episode_info, series_plan)
+        # 시리즈 컨텍스트 생성 (모든 에피소드 공통)
+        series_context = self._create_series_context(series_plan)
 
-        # 프롬프트 생성
-        prompt = self._create_generation_prompt(
+        # 메시지 생성 (스타일 가이드 + 시리즈 구성은 에피소드 간 캐시 프리픽스로 재사용)
+        system, messages = self._create_generation_messages(
             topic, category, episode_info, papers_text, series_context
         )
 
-        try:
-            response = self.anthropic_client.messages.create(
-                model="claude-sonnet-4-5-20250929",
-                max_tokens=4000,
-                messages=[{"role": "user", "content": prompt}]
-            )
-            content = response.content[0].text
-
-            # HTML 태그만 추출
-            if '<div' in content or '<h1' in content or '<h2' in content:
-                # HTML 컨텐츠가 있으면 그대로 사용
-                pass
-            else:
-                # 마크다운을 HTML로 변환 (간단한 변환)
-                content = self._markdown_to_html(content)
-
-            return content
+        for attempt in range(self.max_retries + 1):
+            try:
+                content = create_message(
+                    self.anthropic_client,
+                    model=self.MODEL,
+                    max_tokens=4000,
+                    system=system,
+                    messages=messages
+                )
+                break
+            except Exception as e:
+                if attempt >= self.max_retries:
+                    raise
+                print(f"  ⚠️ {episode_info['korean_name']} 생성 실패 ({attempt + 1}회): {str(e)} - 재시도")
+                time.sleep(2 ** attempt)
+
+        # HTML 태그만 추출
+        if '<div' in content or '<h1' in content or '<h2' in content:
+            # HTML 컨텐츠가 있으면 그대로 사용
+            pass
+        else:
+            # 마크다운을 HTML로 변환 (간단한 변환)
+            content = self._markdown_to_html(content)
 
-        except Exception as e:
-            print(f"  ⚠️ 글 생성 실패: {str(e)}")
-            return self._generate_placeholder(topic, episode_info, papers)
+        return content
 
     def generate_all_posts(
         self,
         topic: str,
-        categorized_papers: Dict[str, List[Dict]]
+        categorized_papers: Dict[str, List[Dict]],
+        force: bool = False
     ) -> List[Dict]:
         """
         전체 시리즈 글 생성
+        - 이전 인덱스의 에피소드 지문(fingerprint)이 같으면 기존 HTML 재사용
 
         Args:
             topic: 주제
             categorized_papers: 카테고리별 논문
+            force: True면 지문과 무관하게 모든 에피소드 재생성
 
         Returns:
-            생성된 글 정보 리스트
+            생성된 글 정보 리스트 (에피소드 번호 순, 재시도 후에도 실패한 편은 제외)
         """
         print(f"\n📝 '{topic}' 시리즈 블로그 생성 시작...")
 
@@ -524,94 +571,197 @@ class SeriesBlogGenerator:
 
         print(f"  📚 총 {series_plan['total_episodes']}편 생성 예정")
 
-        results = []
         timestamp = datetime.now().strftime("%Y%m%d")
         safe_topic = topic.replace(' ', '_').replace('/', '_')
+        index_filename = f"{safe_topic}_series_index.json"
+        index_filepath = os.path.join(self.output_dir, index_filename)
 
-        for episode in series_plan['episodes']:
-            print(f"\n  [{episode['number']}/{series_plan['total_episodes']}] {episode['korean_name']} 생성 중...")
+        # 지문이 바뀌지 않은 에피소드는 이전 결과 재사용
+        completed = {}
+        pending = []
+        previous = {} if force else self._load_previous_posts(index_filepath)
 
+        for episode in series_plan['episodes']:
             papers = categorized_papers.get(episode['category'], [])
+            fingerprint = self._episode_fingerprint(episode, papers, series_plan)
+            prev = previous.get(episode['category'])
 
-            # 글 생성
-            content = self.generate_series_post(
-                topic, episode['category'], papers, episode, series_plan
-            )
-
-            # 전체 HTML 조립
-            html = self._assemble_html(topic, episode, series_plan, content, papers)
-
-            # 파일 저장
-            filename = f"{safe_topic}_series_{episode['korean_name']}_{timestamp}.html"
-            filepath = os.path.join(self.output_dir, filename)
-
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(html)
-
-            results.append({
-                'episode': episode['number'],
-                'category': episode['category'],
-                'korean_name': episode['korean_name'],
-                'filename': filename,
-                'filepath': filepath,
-                'paper_count': len(papers)
-            })
-
-            print(f"    ✓ {filename} 저장 완료")
+            if fingerprint and prev and prev.get('fingerprint') == fingerprint and os.path.exists(prev.get('filepath', '')):
+                completed[episode['number']] = prev
+                print(f"  ♻️ [{episode['number']}/{series_plan['total_episodes']}] {episode['korean_name']} 변경 없음 - {prev['filename']} 재사용")
+            else:
+                pending.append((episode, papers, fingerprint))
+
+        if completed:
+            print(f"  📚 {len(pending)}편 생성, {len(completed)}편 재사용")
+
+        # 에피소드 동시 생성 - 완료되는 대로 파일 저장, 인덱스는 에피소드 번호 순
+        failed = []
+        workers = max(1, min(self.max_workers, len(pending) or 1))
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='series') as executor:
+            futures = {
+                executor.submit(
+                    self._generate_episode, topic, episode, papers, series_plan, safe_topic, timestamp, fingerprint
+                ): episode
+                for episode, papers, fingerprint in pending
+            }
+
+            for future in as_completed(futures):
+                episode = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    print(f"    ✗ [{episode['number']}/{series_plan['total_episodes']}] "
+                          f"{episode['korean_name']} 생성 실패: {str(e)}")
+                    failed.append({
+                        'episode': episode['number'],
+                        'category': episode['category'],
+                        'korean_name': episode['korean_name'],
+                        'error': str(e)
+                    })
+                    continue
+
+                completed[episode['number']] = result
+                print(f"    ✓ [{episode['number']}/{series_plan['total_episodes']}] {result['filename']} 저장 완료")
+
+        results = [completed[number] for number in sorted(completed)]
+        failed.sort(key=lambda f: f['episode'])
 
         # 시리즈 인덱스 저장
-        index_filename = f"{safe_topic}_series_index.json"
-        index_filepath = os.path.join(self.output_dir, index_filename)
-
         with open(index_filepath, 'w', encoding='utf-8') as f:
             json.dump({
                 'series_plan': series_plan,
                 'posts': results,
+                'failed': failed,
                 'generated_at': datetime.now().isoformat()
             }, f, ensure_ascii=False, indent=2)
 
         print(f"\n✓ 시리즈 인덱스 저장: {index_filename}")
+        if failed:
+            print(f"  ⚠️ 생성 실패 {len(failed)}편: {', '.join(f['korean_name'] for f in failed)}")
 
         return results
 
+    def _generate_episode(
+        self,
+        topic: str,
+        episode: Dict,
+        papers: List[Dict],
+        series_plan: Dict,
+        safe_topic: str,
+        timestamp: str,
+        fingerprint: Optional[str] = None
+    ) -> Dict:
+        """에피소드 한 편 생성 후 파일 저장 (작업 스레드에서 실행)"""
+        print(f"\n  [{episode['number']}/{series_plan['total_episodes']}] {episode['korean_name']} 생성 중...")
+
+        # 글 생성
+        content = self.generate_series_post(
+            topic, episode['category'], papers, episode, series_plan
+        )
+
+        # 전체 HTML 조립
+        html = self._assemble_html(topic, episode, series_plan, content, papers)
+
+        # 파일 저장
+        filename = f"{safe_topic}_series_{episode['korean_name']}_{timestamp}.html"
+        filepath = os.path.join(self.output_dir, filename)
+
+        with open(filepath, 'w', encoding='utf-8') as f:
+            f.write(html)
+
+        return {
+            'episode': episode['number'],
+            'category': episode['category'],
+            'korean_name': episode['korean_name'],
+            'filename': filename,
+            'filepath': filepath,
+            'paper_count': len(papers),
+            'fingerprint': fingerprint
+        }
+
+    def _episode_fingerprint(self, episode: Dict, papers: List[Dict], series_plan: Dict) -> Optional[str]:
+        """
+        에피소드 지문 - 생성 결과에 영향을 주는 입력의 해시
+        (카테고리, 정렬된 PMID, 프롬프트/HTML 템플릿 버전, 스타일/모델, 시리즈 구성)
+
+        Returns:
+            지문 문자열 (API 없이 플레이스홀더로 생성하는 경우 None - 재사용하지 않음)
+        """
+        if not self.anthropic_client:
+            return None
+
+        template = BLOG_STYLE_PROMPT + SERIES_WRITING_RULES + self.SERIES_HTML_TEMPLATE
+        payload = {
+            'category': episode['category'],
+            'pmids': sorted(p.get('pmid') or p.get('title', '') for p in papers),
+            'template': hashlib.sha1(template.encode('utf-8')).hexdigest()[:12],
+            'style': [Config.BLOG_STYLE, self.MODEL],
+            # 목차/이전·다음 링크와 프롬프트의 시리즈 구성에 들어가는 정보
+            'series': [episode['number'], [ep['korean_name'] for ep in series_plan['episodes']]],
+        }
+        raw = json.dumps(payload, ensure_ascii=False, sort_keys=True)
+        return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+    def _load_previous_posts(self, index_filepath: str) -> Dict[str, Dict]:
+        """이전 시리즈 인덱스의 글 정보 ({카테고리: 글 정보}, 없으면 빈 딕셔너리)"""
+        try:
+            with open(index_filepath, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+        return {post['category']: post for post in index.get('posts', []) if post.get('fingerprint')}
+
     def _format_papers_for_prompt(self, papers: List[Dict]) -> str:
-        """논문 정보를 프롬프트용 텍스트로 변환"""
+        """논문 정보를 프롬프트용 텍스트로 변환 (저장된 구조화 추출 결과가 있으면 초록 대신 사용)"""
+        papers = papers[:15]  # 최대 15개
+        extractions = get_extraction_store().get_for_papers(papers)
+
         text = ""
-        for i, paper in enumerate(papers[:15], 1):  # 최대 15개
+        for i, paper in enumerate(papers, 1):
             text += f"\n[{i}] {paper.get('title', 'No title')}\n"
             text += f"저자: {', '.join(paper.get('authors', [])[:3])}\n"
             text += f"저널: {paper.get('journal', 'Unknown')} ({paper.get('year', 'N/A')})\n"
-            text += f"초록: {paper.get('abstract', 'No abstract')[:800]}\n"
+            if paper.get('pmid') in extractions:
+                text += f"{format_paper_analysis(extractions[paper['pmid']])}\n"
+            else:
+                text += f"초록: {paper.get('abstract', 'No abstract')[:800]}\n"
             text += "-" * 50 + "\n"
         return text
 
-    def _create_series_context(self, episode_info: Dict, series_plan: Dict) -> str:
-        """시리즈 컨텍스트 생성"""
-        context = f"이 글은 '{series_plan['topic']}' 시리즈의 {episode_info['number']}편입니다.\n"
-        context += f"전체 {series_plan['total_episodes']}편 중 {episode_info['korean_name']}에 해당합니다.\n\n"
+    def _create_series_context(self, series_plan: Dict) -> str:
+        """시리즈 컨텍스트 생성 (에피소드와 무관하게 동일 - 캐시 프리픽스에 포함)"""
+        context = f"이 글은 '{series_plan['topic']}' 시리즈(전체 {series_plan['total_episodes']}편)의 일부입니다.\n\n"
 
         context += "시리즈 구성:\n"
         for ep in series_plan['episodes']:
-            marker = "👉 " if ep['number'] == episode_info['number'] else "   "
-            context += f"{marker}{ep['number']}. {ep['korean_name']} - {ep['subtitle']}\n"
+            context += f"   {ep['number']}. {ep['korean_name']} - {ep['subtitle']}\n"
 
         return context
 
-    def _create_generation_prompt(
+    def _create_generation_messages(
         self,
         topic: str,
         category: str,
         episode_info: Dict,
         papers_text: str,
         series_context: str
-    ) -> str:
-        """글 생성 프롬프트 생성"""
-        return f'''{BLOG_STYLE_PROMPT}
+    ) -> tuple:
+        """
+        글 생성 메시지 (system, messages)
+        - 스타일 가이드/작성 규칙(고정) → 시리즈 구성(시리즈 공통) → 이번 편 정보와 논문(에피소드별)
+        """
+        static = f'''{BLOG_STYLE_PROMPT}
 
-# 시리즈 정보
-{series_context}
+{SERIES_WRITING_RULES}'''
 
-# 이번 편의 주제
+        context = f'''# 시리즈 정보
+{series_context}'''
+
+        instructions = f'''# 이번 편의 주제
+- 순서: 시리즈 {episode_info['number']}편
 - 제목: {episode_info['korean_name']}
 - 부제: {episode_info['subtitle']}
 - 카테고리: {category}
@@ -619,27 +769,10 @@ class SeriesBlogGenerator:
 # 참고 논문들 ({episode_info['paper_count']}개)
 {papers_text}
 
-# 작성 규칙
-
-1. 이 글은 시리즈의 일부이므로, 다른 편에서 다룰 내용은 "~편에서 자세히 다룰게요!"라고 언급만 하세요.
-2. 이번 편의 주제({episode_info['korean_name']})에 집중하세요.
-3. 논문에서 나온 구체적인 수치와 방법을 사용하세요.
-4. 말투 규칙을 철저히 지키세요 ("~에요", "~하죠", "~거예요").
-
-# 출력 형식
-
-HTML로 작성하되, 다음 구조를 따르세요:
-- <h2>, <h3>로 소제목
-- <p>로 문단
-- <ul>, <ol>로 목록
-- <blockquote>로 인용
-- <div class="highlight purple/green/blue">로 강조
-- <div class="caution">로 주의사항
-- <div class="recommend-box">로 추천
-- <div class="summary-box">로 정리
-
 지금 {topic}의 {episode_info['korean_name']}을 작성해주세요!'''
 
+        return build_cached_messages(static, context, instructions)
+
     def _generate_placeholder(self, topic: str, episode_info: Dict, papers: List[Dict]) -> str:
         """API 없이 플레이스홀더 생성"""
         papers_list = "\n".join([
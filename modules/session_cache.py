@@ -0,0 +1,195 @@
+"""
+사용자 세션 메모리 캐시
+- 최근 사용 순(LRU) + 유휴 시간(TTL) + 보유 논문 수 상한으로 메모리 사용량 제한
+- 내보낸 세션은 세션 저장소에 기록해 두었다가 다음 요청 때 자동으로 다시 불러옴
+- 백그라운드 작업이 진행 중인 사용자 세션은 내보내지 않음 (작업이 같은 객체를 수정하므로)
+- 내보낼 세션은 락 안에서 고르고 저장(SQLite 쓰기)은 락 밖에서 처리
+  (get/put은 이벤트 루프에서 불리므로 상한 초과 시 정리는 별도 스레드에서 실행)
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Generic, List, Optional, Tuple, TypeVar
+
+
+T = TypeVar('T')
+
+
+class SessionCache(Generic[T]):
+    """LRU/TTL 세션 캐시 (내보내기/불러오기 콜백으로 영구 저장소와 연결)"""
+
+    def __init__(self, spill: Callable[[int, T], Optional[str]], reload: Callable[[int, str], Optional[T]],
+                 max_entries: int, ttl: float, max_papers: int = 0,
+                 pinned: Callable[[int], bool] = None, size: Callable[[T], int] = None):
+        """
+        Args:
+            spill: (user_id, 세션) → 저장된 세션 ID (저장할 내용이 없으면 None)
+            reload: (user_id, 세션 ID) → 세션 (없으면 None)
+            max_entries: 메모리에 둘 최대 세션 수
+            ttl: 이 시간(초) 이상 사용하지 않은 세션은 내보냄
+            max_papers: 메모리 전체 논문 수 상한 (0이면 제한 없음)
+            pinned: True를 반환하는 사용자 세션은 내보내지 않음
+            size: 세션의 논문 수 (max_papers 계산용)
+        """
+        self._spill = spill
+        self._reload = reload
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_papers = max_papers
+        self._pinned = pinned or (lambda user_id: False)
+        self._size = size or (lambda session: 0)
+
+        self._entries: 'OrderedDict[int, T]' = OrderedDict()
+        self._last_used: Dict[int, float] = {}
+        self._spilled: Dict[int, str] = {}  # 내보낸 세션: user_id → 세션 ID
+        self._spilling: Dict[int, T] = {}  # 저장 중인 세션 (그 사이 get이 오면 그대로 되돌림)
+        self._lock = threading.RLock()
+        self._sweep_lock = threading.Lock()  # 정리는 한 번에 하나만
+        self._sweep_pending = False
+        self._stats = {'hits': 0, 'misses': 0, 'reloads': 0,
+                       'evicted_lru': 0, 'evicted_ttl': 0, 'evicted_papers': 0}
+
+    def get(self, user_id: int) -> Optional[T]:
+        """세션 조회 (내보낸 세션이면 저장소에서 다시 불러옴, 없으면 None)"""
+        with self._lock:
+            session = self._entries.get(user_id)
+            if session is not None:
+                self._stats['hits'] += 1
+                self._touch(user_id)
+                return session
+
+            # 저장 중인 세션은 저장소를 거치지 않고 되돌림
+            session = self._spilling.pop(user_id, None)
+            if session is not None:
+                self._stats['hits'] += 1
+                self._entries[user_id] = session
+                self._touch(user_id)
+                return session
+
+            self._stats['misses'] += 1
+            session_id = self._spilled.pop(user_id, None)
+            if session_id is None:
+                return None
+
+        # 저장소 조회는 락 밖에서
+        session = self._reload(user_id, session_id)
+        if session is None:
+            return None
+        with self._lock:
+            self._stats['reloads'] += 1
+            # 그 사이 새 세션이 생겼으면 새 세션 우선
+            if user_id in self._entries:
+                return self._entries[user_id]
+            self._entries[user_id] = session
+            self._touch(user_id)
+        print(f"[세션 캐시] 사용자 {user_id} 세션 다시 불러옴 ({session_id})")
+        self._sweep_if_over()
+        return session
+
+    def put(self, user_id: int, session: T):
+        """세션 등록/교체"""
+        with self._lock:
+            self._spilled.pop(user_id, None)
+            self._spilling.pop(user_id, None)
+            self._entries[user_id] = session
+            self._touch(user_id)
+        self._sweep_if_over()
+
+    def __contains__(self, user_id: int) -> bool:
+        with self._lock:
+            return user_id in self._entries or user_id in self._spilled or user_id in self._spilling
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def _touch(self, user_id: int):
+        self._entries.move_to_end(user_id)
+        self._last_used[user_id] = time.time()
+
+    def _over_limit(self) -> bool:
+        """개수/논문 수 상한 초과 여부 (락 안에서 호출)"""
+        if len(self._entries) > self.max_entries:
+            return True
+        return bool(self.max_papers) and sum(self._size(s) for s in self._entries.values()) > self.max_papers
+
+    def _sweep_if_over(self):
+        """상한을 넘었으면 별도 스레드에서 정리 (호출한 쪽은 저장을 기다리지 않음)"""
+        with self._lock:
+            if self._sweep_pending or not self._over_limit():
+                return
+            self._sweep_pending = True
+        threading.Thread(target=self.sweep, name='session-cache-sweep', daemon=True).start()
+
+    def _select_victims(self, now: float) -> List[Tuple[int, str]]:
+        """내보낼 세션을 골라 메모리에서 떼어냄 (락 안에서 호출) → [(user_id, 사유)]"""
+        victims = []
+        candidates = [uid for uid in self._entries if not self._pinned(uid)]
+
+        for user_id in candidates:
+            if now - self._last_used.get(user_id, now) > self.ttl:
+                victims.append((user_id, 'ttl'))
+        chosen = {uid for uid, _ in victims}
+        candidates = [uid for uid in candidates if uid not in chosen]
+
+        remaining = len(self._entries) - len(victims)
+        while remaining > self.max_entries and candidates:
+            victims.append((candidates.pop(0), 'lru'))
+            remaining -= 1
+
+        if self.max_papers:
+            chosen = {uid for uid, _ in victims}
+            total = sum(self._size(s) for uid, s in self._entries.items() if uid not in chosen)
+            while total > self.max_papers and candidates:
+                user_id = candidates.pop(0)
+                total -= self._size(self._entries[user_id])
+                victims.append((user_id, 'papers'))
+
+        for user_id, _ in victims:
+            self._spilling[user_id] = self._entries.pop(user_id)
+            self._last_used.pop(user_id, None)
+        return victims
+
+    def _evict(self, user_id: int, reason: str):
+        """떼어낸 세션을 저장소로 내보내기 (락 밖에서 호출)"""
+        with self._lock:
+            session = self._spilling.get(user_id)
+        if session is None:
+            return  # 그 사이 get/put으로 되돌아감
+        try:
+            session_id = self._spill(user_id, session)
+        except Exception as e:
+            print(f"[세션 캐시] 사용자 {user_id} 세션 저장 실패: {type(e).__name__}: {e}")
+            session_id = None
+        with self._lock:
+            # 저장하는 동안 되돌아간 세션은 메모리에 그대로 둠
+            if self._spilling.get(user_id) is not session:
+                return
+            del self._spilling[user_id]
+            if session_id:
+                self._spilled[user_id] = session_id
+            self._stats[f'evicted_{reason}'] += 1
+
+    def sweep(self):
+        """
+        TTL/개수/논문 수 상한을 넘는 세션 내보내기 (오래 안 쓴 순)
+
+        저장소 쓰기를 하므로 이벤트 루프에서는 asyncio.to_thread 등으로 호출할 것
+        """
+        with self._sweep_lock:
+            with self._lock:
+                self._sweep_pending = False
+                victims = self._select_victims(time.time())
+            for user_id, reason in victims:
+                self._evict(user_id, reason)
+
+    def stats(self) -> Dict[str, int]:
+        """캐시 통계"""
+        with self._lock:
+            return {
+                **self._stats,
+                'entries': len(self._entries),
+                'spilled': len(self._spilled),
+                'papers': sum(self._size(s) for s in self._entries.values()),
+            }
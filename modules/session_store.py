@@ -0,0 +1,266 @@
+"""
+봇 세션 저장소
+- 세션(user_id, session_id)별 한 행: 키워드/단계/생성 시각 인덱스 + 나머지 상태는 JSON
+- 논문 본문은 공유 논문 저장소(paper_store)에, 세션에는 논문별 참조 + 세션별 주석(점수, 전문 여부 등)만 저장
+- 참조 목록도 내용 해시로 한 번만 저장 (단계마다 같은 목록을 다시 쓰지 않음)
+- 논문 목록이 직전 저장과 같으면 논문 저장소를 건너뛰고 세션 행만 갱신
+- 단계 갱신은 트랜잭션 하나로 처리, /retry 목록은 인덱스로 최근 세션만 조회
+- 기존 session_data/*.json 파일은 처음 열 때 한 번 가져옴 (소유자를 알 수 있는 세션만)
+"""
+
+import glob
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from config import Config
+from modules.paper_store import get_paper_store
+
+
+class SessionStore:
+    """SQLite 세션 저장소"""
+
+    def __init__(self, db_path: str = None, legacy_dir: str = None):
+        """
+        Args:
+            db_path: SQLite 파일 경로
+            legacy_dir: 가져올 기존 세션 JSON 디렉토리
+        """
+        self.db_path = db_path or os.path.join(Config.SESSION_DIR, 'sessions.db')
+        os.makedirs(os.path.dirname(self.db_path) or '.', exist_ok=True)
+        self._lock = threading.Lock()
+        # (user_id, session_id) → (논문 목록 지문, 참조 목록 ref): 이 프로세스가 마지막으로 저장한 논문 목록
+        self._persisted: Dict[Tuple[int, str], Tuple[str, str]] = {}
+        # 웹훅 모드에서는 여러 워커 프로세스가 같은 파일을 사용 (WAL + 잠금 대기)
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS sessions (
+                user_id INTEGER NOT NULL,
+                session_id TEXT NOT NULL,
+                keyword TEXT NOT NULL,
+                step TEXT NOT NULL,
+                created_at TEXT NOT NULL,
+                updated_at REAL NOT NULL,
+                papers_count INTEGER NOT NULL,
+                papers_ref TEXT,
+                state TEXT NOT NULL,
+                PRIMARY KEY (user_id, session_id)
+            );
+            CREATE INDEX IF NOT EXISTS idx_sessions_updated ON sessions (updated_at);
+            CREATE INDEX IF NOT EXISTS idx_sessions_user ON sessions (user_id, updated_at);
+            CREATE INDEX IF NOT EXISTS idx_sessions_keyword ON sessions (keyword, created_at);
+            CREATE INDEX IF NOT EXISTS idx_sessions_papers ON sessions (papers_ref);
+            CREATE TABLE IF NOT EXISTS session_papers (
+                ref TEXT PRIMARY KEY,
+                papers TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            );
+        """)
+        self._conn.commit()
+        self._import_legacy(legacy_dir or Config.SESSION_DIR)
+
+    # 지문을 기억할 최대 세션 수 (넘으면 오래된 것부터 잊음 → 다음 저장은 전체 경로)
+    PERSISTED_MAX = 1000
+
+    @staticmethod
+    def _papers_ref(papers_json: str) -> str:
+        return hashlib.sha256(papers_json.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def _papers_fingerprint(papers: List[Dict]) -> str:
+        """논문 목록 지문 (제자리 수정된 주석까지 반영, 직렬화 한 번 + 해시 한 번)"""
+        return hashlib.sha1(json.dumps(papers, ensure_ascii=False, default=str).encode('utf-8')).hexdigest()
+
+    def _upsert_session(self, user_id: int, session_id: str, keyword: str, step: str,
+                        created_at: str, papers_count: int, ref: str, state_json: str):
+        """세션 행 저장 (호출하는 쪽에서 잠금 + 트랜잭션)"""
+        self._conn.execute(
+            """
+            INSERT INTO sessions
+                (user_id, session_id, keyword, step, created_at, updated_at, papers_count, papers_ref, state)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (user_id, session_id) DO UPDATE SET
+                keyword = excluded.keyword,
+                step = excluded.step,
+                updated_at = excluded.updated_at,
+                papers_count = excluded.papers_count,
+                papers_ref = excluded.papers_ref,
+                state = excluded.state
+            """,
+            (user_id, session_id, keyword, step, created_at, time.time(), papers_count, ref, state_json)
+        )
+
+    def save(self, user_id: int, session_id: str, keyword: str, step: str,
+             created_at: str, state: Dict, papers: List[Dict]):
+        """
+        세션 단계 저장 (논문 목록 + 세션 행을 한 트랜잭션으로)
+
+        Args:
+            user_id: 텔레그램 사용자 ID
+            session_id: 세션 ID
+            keyword: 키워드
+            step: 진행 단계 ('1_keyword_analyzed' 등)
+            created_at: 세션 생성 시각 (ISO 형식)
+            state: 논문 외 세션 상태
+            papers: 논문 목록 (본문은 논문 저장소에 저장)
+        """
+        key = (user_id, session_id)
+        fingerprint = self._papers_fingerprint(papers)
+        state_json = json.dumps(state, ensure_ascii=False)
+
+        # 논문 목록이 직전 저장과 같으면 세션 행만 갱신
+        # (다른 워커가 그 사이 목록을 바꿨으면 저장된 ref가 달라지므로 전체 경로로)
+        persisted = self._persisted.get(key)
+        if persisted and persisted[0] == fingerprint:
+            with self._lock, self._conn:
+                row = self._conn.execute(
+                    "SELECT papers_ref FROM sessions WHERE user_id = ? AND session_id = ?", key
+                ).fetchone()
+                if row and row[0] == persisted[1]:
+                    self._upsert_session(user_id, session_id, keyword, step, created_at,
+                                         len(papers), persisted[1], state_json)
+                    return
+
+        # 본문은 공유 저장소로, 세션에는 참조 + 주석만
+        entries = get_paper_store().put_many(papers)
+        papers_json = json.dumps(entries, ensure_ascii=False)
+        ref = self._papers_ref(papers_json)
+
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT papers_ref FROM sessions WHERE user_id = ? AND session_id = ?", key
+            ).fetchone()
+            old_ref = row[0] if row else None
+
+            self._conn.execute(
+                "INSERT OR IGNORE INTO session_papers (ref, papers) VALUES (?, ?)",
+                (ref, papers_json)
+            )
+            self._upsert_session(user_id, session_id, keyword, step, created_at, len(papers), ref, state_json)
+            # 이전 단계의 논문 목록을 더 이상 참조하는 세션이 없으면 정리
+            if old_ref and old_ref != ref:
+                self._conn.execute(
+                    "DELETE FROM session_papers WHERE ref = ? "
+                    "AND NOT EXISTS (SELECT 1 FROM sessions WHERE papers_ref = ?)",
+                    (old_ref, old_ref)
+                )
+            self._persisted.pop(key, None)
+            self._persisted[key] = (fingerprint, ref)
+            if len(self._persisted) > self.PERSISTED_MAX:
+                self._persisted.pop(next(iter(self._persisted)))
+
+    def load(self, user_id: int, session_id: str) -> Optional[Dict]:
+        """
+        세션 불러오기
+
+        Returns:
+            {'user_id', 'session_id', 'keyword', 'step', 'created_at', 'state', 'papers'} 또는 None
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT s.keyword, s.step, s.created_at, s.state, p.papers FROM sessions s "
+                "LEFT JOIN session_papers p ON p.ref = s.papers_ref "
+                "WHERE s.user_id = ? AND s.session_id = ?",
+                (user_id, session_id)
+            ).fetchone()
+        if not row:
+            return None
+
+        keyword, step, created_at, state, papers = row
+        return {
+            'user_id': user_id,
+            'session_id': session_id,
+            'keyword': keyword,
+            'step': step,
+            'created_at': created_at,
+            'state': json.loads(state),
+            'papers': get_paper_store().resolve(json.loads(papers)) if papers else [],
+        }
+
+    def list_recent(self, limit: int = 10, user_id: int = None) -> List[Dict]:
+        """최근 갱신된 세션 요약 목록 (user_id를 주면 해당 사용자만)"""
+        query = "SELECT user_id, session_id, keyword, step, papers_count, created_at FROM sessions"
+        params = []
+        if user_id is not None:
+            query += " WHERE user_id = ?"
+            params.append(user_id)
+        query += " ORDER BY updated_at DESC LIMIT ?"
+        params.append(limit)
+
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [
+            {'user_id': r[0], 'session_id': r[1], 'keyword': r[2], 'step': r[3],
+             'papers_count': r[4], 'created_at': r[5]}
+            for r in rows
+        ]
+
+    def _import_legacy(self, legacy_dir: str):
+        """
+        기존 단계별 JSON 파일 가져오기 (최초 1회)
+
+        /retry는 본인 세션만 보여주므로 소유자 없이 가져오면 아무도 쓸 수 없음
+        → 파일의 user_id, 없으면 LEGACY_SESSION_OWNER로 가져오고 둘 다 없으면 건너뜀
+        (건너뛴 파일이 있으면 완료 표시를 하지 않아 나중에 소유자를 설정하면 다시 시도)
+        """
+        with self._lock:
+            done = self._conn.execute("SELECT value FROM meta WHERE key = 'legacy_imported'").fetchone()
+        if done:
+            return
+
+        files = glob.glob(os.path.join(legacy_dir, '*.json'))
+        imported = 0
+        skipped = 0
+        # 같은 세션은 높은 단계 파일이 마지막에 저장되도록 단계 순으로 정렬
+        records = []
+        for path in files:
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    records.append(json.load(f))
+            except (OSError, json.JSONDecodeError):
+                continue
+        records.sort(key=lambda d: (d.get('created_at', ''), d.get('step', '')))
+
+        for data in records:
+            owner = data.get('user_id') or Config.LEGACY_SESSION_OWNER
+            if not owner:
+                skipped += 1
+                continue
+            created_at = data.get('created_at', '')
+            session_id = created_at[:19].replace('-', '').replace('T', '_').replace(':', '')[:15]
+            state = {k: v for k, v in data.items() if k not in ('papers', 'step', 'keyword', 'created_at', 'user_id')}
+            self.save(int(owner), session_id, data.get('keyword', ''), data.get('step', ''),
+                      created_at, state, data.get('papers', []))
+            imported += 1
+
+        if skipped:
+            print(f"[세션 저장소] 소유자를 알 수 없는 기존 세션 파일 {skipped}개 건너뜀 "
+                  f"(LEGACY_SESSION_OWNER를 설정하면 다음 실행 때 가져옴)")
+        else:
+            with self._lock, self._conn:
+                self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('legacy_imported', ?)",
+                                   (str(time.time()),))
+        if imported:
+            print(f"[세션 저장소] 기존 세션 파일 {imported}개 가져옴")
+
+
+# 프로세스 전역 저장소
+_default_store = None
+_default_store_lock = threading.Lock()
+
+
+def get_session_store() -> SessionStore:
+    """기본 세션 저장소 반환"""
+    global _default_store
+    with _default_store_lock:
+        if _default_store is None:
+            _default_store = SessionStore()
+        return _default_store
@@ -4,7 +4,6 @@
 - 빈도 기반 + 패턴 매칭으로 새로운 트렌드 키워드 자동 발견
 """
 
-import requests
 from bs4 import BeautifulSoup
 import json
 import os
@@ -17,6 +16,9 @@ from collections import Counter
 
 # Claude CLI 기반 토픽 추출 모듈
 from modules.claude_topic_extractor import extract_topics_with_claude
+from modules.translation_service import get_translation_service
+from modules.metrics import http_get
+from modules.tracing import annotate, span, traced
 
 
 class SmartTopicExtractor:
@@ -116,6 +118,7 @@ class SmartTopicExtractor:
             'Accept-Language': 'ko-KR,ko;q=0.9',
         }
 
+    @traced('topics')
     def extract_topics(self, main_keyword: str, max_blogs: int = 20) -> Dict:
         """
         메인 키워드로 블로그 검색 후 서브토픽 추출
@@ -129,6 +132,7 @@ class SmartTopicExtractor:
                 'top_topics': List[str],
                 'search_queries': List[str],  # PubMed 검색용
                 'llm_analysis_file': str,  # Claude CLI 분석용 파일 경로
+                'fallback': bool,  # Claude 추출 실패로 기본 추출을 사용했는지
             }
         """
         print(f"\n{'='*60}")
@@ -136,18 +140,25 @@ class SmartTopicExtractor:
         print(f"{'='*60}")
 
         # 1. 블로그 URL 수집
+        annotate(keyword=main_keyword)
         print(f"\n[1단계] 인기 블로그 수집 중...")
-        blog_urls = self._collect_blog_urls(main_keyword, max_blogs)
+        with span('scrape.search', keyword=main_keyword) as s:
+            blog_urls = self._collect_blog_urls(main_keyword, max_blogs)
+            s.set(urls=len(blog_urls))
         print(f"  → {len(blog_urls)}개 블로그 URL 수집")
 
         # 2. 블로그 내용 스크래핑
         print(f"\n[2단계] 블로그 내용 스크래핑 중...")
-        blogs = self._scrape_blogs(blog_urls)
+        with span('scrape.blogs', urls=len(blog_urls)) as s:
+            blogs = self._scrape_blogs(blog_urls)
+            s.set(blogs=len(blogs))
         print(f"  → {len(blogs)}개 블로그 스크래핑 완료")
 
         # 3. Claude CLI로 토픽 추출
         print(f"\n[3단계] Claude CLI로 토픽 추출 중...")
-        auto_result = extract_topics_with_claude(blogs, main_keyword)
+        with span('topics.llm', blogs=len(blogs)) as s:
+            auto_result = extract_topics_with_claude(blogs, main_keyword)
+            s.set(topics=len(auto_result.get('topics', [])))
 
         # 자동 추출된 토픽
         auto_topics = auto_result.get('topics', [])
@@ -196,6 +207,7 @@ class SmartTopicExtractor:
             'trending_topics': [t['topic'] for t in trending],
             'search_queries': search_queries,
             'llm_analysis_file': llm_analysis_file,
+            'fallback': bool(auto_result.get('fallback')),
         }
 
         save_path = os.path.join(
@@ -243,7 +255,7 @@ class SmartTopicExtractor:
 
             try:
                 search_url = f"https://search.naver.com/search.naver?where=view&query={quote_plus(term)}"
-                response = requests.get(search_url, headers=self.headers, timeout=10)
+                response = http_get('naver', 'search', search_url, headers=self.headers, timeout=10)
                 soup = BeautifulSoup(response.text, 'html.parser')
 
                 for a in soup.find_all('a', href=True):
@@ -267,7 +279,7 @@ class SmartTopicExtractor:
 
         for url in urls:
             try:
-                response = requests.get(url, headers=self.headers, timeout=15)
+                response = http_get('naver', 'blog', url, headers=self.headers, timeout=15)
                 response.encoding = 'utf-8'
                 soup = BeautifulSoup(response.text, 'html.parser')
 
@@ -299,7 +311,7 @@ class SmartTopicExtractor:
                         if iframe_src and not iframe_src.startswith('http'):
                             iframe_src = f"https://blog.naver.com{iframe_src}"
                         if iframe_src:
-                            response2 = requests.get(iframe_src, headers=self.headers, timeout=15)
+                            response2 = http_get('naver', 'blog', iframe_src, headers=self.headers, timeout=15)
                             soup2 = BeautifulSoup(response2.text, 'html.parser')
                             for selector in ['.se-main-container', '#post-view-container', '.post_ct']:
                                 elem = soup2.select_one(selector)
@@ -399,16 +411,13 @@ class SmartTopicExtractor:
         if result:
             return result
 
-        # 매핑에 없으면 Google 번역 시도
-        try:
-            from deep_translator import GoogleTranslator
-            translator = GoogleTranslator(source='ko', target='en')
-            translated = translator.translate(keyword)
+        # 매핑에 없으면 번역 서비스 사용 (캐시 → Google 번역)
+        translated = get_translation_service().translate(keyword, source='ko', target='en')
+        if translated:
             print(f"  [자동번역] '{keyword}' → '{translated}'")
             return translated
-        except Exception as e:
-            print(f"  [번역실패] '{keyword}' 그대로 사용")
-            return keyword
+        print(f"  [번역실패] '{keyword}' 그대로 사용")
+        return keyword
 
     def _get_topic_english(self, topic: str) -> str:
         """토픽을 영어로 변환 (매핑 → Google 번역 순서)"""
@@ -420,14 +429,8 @@ class SmartTopicExtractor:
         if topic in self.KR_TO_EN:
             return self.KR_TO_EN[topic]
 
-        # 3. Google 번역 시도
-        try:
-            from deep_translator import GoogleTranslator
-            translator = GoogleTranslator(source='ko', target='en')
-            translated = translator.translate(topic)
-            return translated
-        except Exception:
-            return topic
+        # 3. 번역 서비스 사용 (캐시 → Google 번역)
+        return get_translation_service().translate(topic, source='ko', target='en') or topic
 
 
 # CLI 테스트
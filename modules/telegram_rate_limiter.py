@@ -0,0 +1,187 @@
+"""
+텔레그램 발신 속도 제한 모듈
+- 봇 전체 발신 요청을 전역/채팅별 한도 안으로 분산 (Bot API 권장: 전역 초당 30건, 채팅당 초당 1건, 그룹 분당 20건)
+- 같은 메시지에 대한 수정 요청이 밀려 있으면 마지막 요청만 전송 (이전 요청은 건너뜀)
+- 429 RetryAfter를 받으면 지정 시간만큼 전체 발신을 멈췄다가 다시 시도
+- Application.builder().rate_limiter(OutboundRateLimiter())로 연결
+"""
+
+import asyncio
+import itertools
+from typing import Any, Callable, Coroutine, Dict, Optional, Tuple
+
+from telegram.error import RetryAfter, TelegramError
+from telegram.ext import BaseRateLimiter
+
+from config import Config
+from modules.metrics import get_registry
+
+
+_REQUESTS = get_registry().counter(
+    'blog_telegram_requests_total', '텔레그램 발신 요청 수 (결과: ok, coalesced, retry_after, 오류 종류)',
+    ('endpoint', 'result')
+)
+
+
+# 수정 요청 엔드포인트 (같은 메시지에 대해 마지막 요청만 의미 있음)
+_EDIT_ENDPOINTS = {'editMessageText', 'editMessageCaption', 'editMessageReplyMarkup'}
+
+
+class _TokenBucket:
+    """토큰 버킷 (rate: 초당 토큰, capacity: 순간 최대 요청 수)"""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = None
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        """토큰 하나를 얻을 때까지 대기"""
+        loop = asyncio.get_running_loop()
+        async with self.lock:
+            while True:
+                now = loop.time()
+                if self.updated is not None:
+                    self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class OutboundRateLimiter(BaseRateLimiter):
+    """전역 + 채팅별 토큰 버킷, 수정 요청 병합, RetryAfter 재시도"""
+
+    _MAX_CHATS = 1000  # 이 수를 넘으면 오래 쓰지 않은 채팅 버킷 정리
+
+    def __init__(self, global_rate: float = None, private_rate: float = None,
+                 group_rate: float = None, max_retries: int = None):
+        """
+        Args:
+            global_rate: 봇 전체 초당 요청 수
+            private_rate: 개인 채팅 초당 요청 수
+            group_rate: 그룹 채팅 초당 요청 수
+            max_retries: RetryAfter 재시도 횟수
+        """
+        self.global_rate = global_rate or Config.TG_GLOBAL_RATE
+        self.private_rate = private_rate or Config.TG_PRIVATE_CHAT_RATE
+        self.group_rate = group_rate or Config.TG_GROUP_CHAT_RATE
+        self.max_retries = Config.TG_MAX_RETRIES if max_retries is None else max_retries
+
+        self._global: Optional[_TokenBucket] = None
+        self._chats: Dict[Any, _TokenBucket] = {}
+        self._paused_until = 0.0
+        # 수정 요청 병합: (채팅, 메시지) → 가장 최근 요청 번호
+        self._latest_edit: Dict[Tuple, int] = {}
+        self._edit_seq = itertools.count(1)
+        self.coalesced = 0
+        self.retries = 0
+
+    async def initialize(self) -> None:
+        self._global = _TokenBucket(self.global_rate, max(1, int(self.global_rate)))
+
+    async def shutdown(self) -> None:
+        self._chats.clear()
+        self._latest_edit.clear()
+
+    def _chat_bucket(self, chat_id) -> _TokenBucket:
+        bucket = self._chats.get(chat_id)
+        if bucket is None:
+            if len(self._chats) >= self._MAX_CHATS:
+                self._prune()
+            # 그룹/채널(음수 ID, @username)은 분당 20건, 개인 채팅은 초당 1건 (짧은 버스트 허용)
+            is_group = isinstance(chat_id, str) or (isinstance(chat_id, int) and chat_id < 0)
+            rate = self.group_rate if is_group else self.private_rate
+            bucket = _TokenBucket(rate, Config.TG_CHAT_BURST)
+            self._chats[chat_id] = bucket
+        return bucket
+
+    def _prune(self):
+        """1분 이상 쓰지 않은 채팅 버킷 정리 (버킷이 가득 찬 상태로 간주되므로 삭제해도 동일)"""
+        now = asyncio.get_running_loop().time()
+        for chat_id, bucket in list(self._chats.items()):
+            if not bucket.lock.locked() and bucket.updated is not None and now - bucket.updated > 60:
+                del self._chats[chat_id]
+
+    @staticmethod
+    def _edit_key(endpoint: str, data: Dict[str, Any]) -> Optional[Tuple]:
+        if endpoint not in _EDIT_ENDPOINTS:
+            return None
+        if data.get('inline_message_id'):
+            return (endpoint, data['inline_message_id'])
+        if data.get('chat_id') is not None and data.get('message_id') is not None:
+            return (endpoint, data['chat_id'], data['message_id'])
+        return None
+
+    async def _wait_pause(self):
+        """RetryAfter로 멈춘 동안 대기"""
+        loop = asyncio.get_running_loop()
+        while True:
+            delay = self._paused_until - loop.time()
+            if delay <= 0:
+                return
+            await asyncio.sleep(delay)
+
+    async def process_request(
+        self,
+        callback: Callable[..., Coroutine[Any, Any, Any]],
+        args: Any,
+        kwargs: Dict[str, Any],
+        endpoint: str,
+        data: Dict[str, Any],
+        rate_limit_args: Optional[int],
+    ):
+        chat_id = data.get('chat_id')
+        edit_key = self._edit_key(endpoint, data)
+        seq = None
+        if edit_key:
+            seq = next(self._edit_seq)
+            self._latest_edit[edit_key] = seq
+
+        try:
+            attempt = 0
+            while True:
+                await self._wait_pause()
+                if edit_key and self._latest_edit.get(edit_key) != seq:
+                    self.coalesced += 1
+                    _REQUESTS.inc(endpoint=endpoint, result='coalesced')
+                    return True
+
+                # 채팅에 묶인 요청만 제한 (getUpdates, answerCallbackQuery 등은 바로 전송)
+                if chat_id is not None:
+                    await self._chat_bucket(chat_id).acquire()
+                    if self._global is None:
+                        await self.initialize()
+                    await self._global.acquire()
+
+                # 기다리는 동안 같은 메시지에 더 새로운 수정 요청이 들어왔으면 건너뜀
+                if edit_key and self._latest_edit.get(edit_key) != seq:
+                    self.coalesced += 1
+                    _REQUESTS.inc(endpoint=endpoint, result='coalesced')
+                    return True
+
+                try:
+                    result = await callback(*args, **kwargs)
+                    _REQUESTS.inc(endpoint=endpoint, result='ok')
+                    return result
+                except RetryAfter as e:
+                    _REQUESTS.inc(endpoint=endpoint, result='retry_after')
+                    attempt += 1
+                    retry_after = e.retry_after.total_seconds() if hasattr(e.retry_after, 'total_seconds') \
+                        else float(e.retry_after)
+                    if attempt > self.max_retries:
+                        print(f"[텔레그램] {endpoint} 재시도 한도 초과 (RetryAfter {retry_after:.0f}초)")
+                        raise
+                    self.retries += 1
+                    loop = asyncio.get_running_loop()
+                    self._paused_until = max(self._paused_until, loop.time() + retry_after)
+                    print(f"[텔레그램] 발신 한도 초과 - {retry_after:.0f}초 후 재시도 ({endpoint}, {attempt}/{self.max_retries})")
+                except TelegramError as e:
+                    _REQUESTS.inc(endpoint=endpoint, result=type(e).__name__)
+                    raise
+        finally:
+            if edit_key and self._latest_edit.get(edit_key) == seq:
+                del self._latest_edit[edit_key]
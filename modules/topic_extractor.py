@@ -20,6 +20,7 @@ from anthropic import Anthropic
 import sys
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from config import Config
+from modules.llm_runner import create_message
 
 
 class BlogTopicExtractor:
@@ -244,14 +245,15 @@ class BlogTopicExtractor:
 출력 예시: 커피, 수면 자세, 체중 감량"""
 
         try:
-            response = self.client.messages.create(
+            text = create_message(
+                self.client,
                 model="claude-sonnet-4-20250514",
                 max_tokens=200,
                 messages=[{"role": "user", "content": prompt}]
             )
 
             # 응답 파싱
-            text = response.content[0].text.strip()
+            text = text.strip()
             topics = [t.strip() for t in text.split(',') if t.strip()]
 
             # 너무 일반적인 키워드 필터링
@@ -0,0 +1,320 @@
+"""
+파이프라인 단계별 소요 시간 추적
+- span(이름, **속성) 컨텍스트 매니저 / traced(이름) 데코레이터로 단계를 감싸 기록
+- 중첩된 스팬은 부모-자식으로 연결, trace_context(세션 ID)로 한 세션의 스팬을 묶음
+- 스레드 풀로 넘기는 함수는 bind()로 감싸야 현재 세션/부모 스팬이 이어짐
+- Chrome trace JSON(chrome://tracing, Perfetto)과 단계별 지연 히스토그램으로 내보내기
+"""
+
+import contextvars
+import functools
+import itertools
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional
+
+from config import Config
+
+
+# 히스토그램 버킷 상한 (밀리초, 마지막 버킷은 그 이상 전부)
+LATENCY_BUCKETS_MS = (10, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000, 120000, 300000)
+
+_current_span = contextvars.ContextVar('tracing_span', default=None)
+_current_trace = contextvars.ContextVar('tracing_trace', default=None)
+
+
+class Span:
+    """기록 단위 (단계 1회 실행)"""
+
+    __slots__ = ('name', 'span_id', 'parent_id', 'trace_id', 'start', 'end', 'thread_id', 'thread_name',
+                 'attrs', 'error')
+
+    def __init__(self, name: str, span_id: int, parent_id: Optional[int], trace_id: Optional[str], attrs: Dict):
+        self.name = name
+        self.span_id = span_id
+        self.parent_id = parent_id
+        self.trace_id = trace_id
+        self.start = time.perf_counter()
+        self.end = None
+        thread = threading.current_thread()
+        self.thread_id = thread.ident
+        self.thread_name = thread.name
+        self.attrs = attrs
+        self.error = None
+
+    def set(self, **attrs):
+        """속성 추가 (논문 수, 캐시 적중 수 등)"""
+        self.attrs.update(attrs)
+
+    @property
+    def duration(self) -> float:
+        """소요 시간 (초, 진행 중이면 현재까지)"""
+        return (self.end or time.perf_counter()) - self.start
+
+
+class _NullSpan:
+    """추적 비활성화 시 사용하는 빈 스팬"""
+
+    def set(self, **attrs):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class LatencyHistogram:
+    """단계 하나의 지연 분포 (고정 버킷)"""
+
+    def __init__(self, buckets=LATENCY_BUCKETS_MS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.errors = 0
+
+    def observe(self, ms: float, error: bool = False):
+        for i, bound in enumerate(self.buckets):
+            if ms <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+        if error:
+            self.errors += 1
+
+    def percentile(self, q: float) -> float:
+        """분위수 추정 (해당 버킷 상한, 마지막 버킷은 최댓값)"""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= target and n:
+                return min(self.buckets[i], self.max_ms) if i < len(self.buckets) else self.max_ms
+        return self.max_ms
+
+    def to_dict(self) -> Dict:
+        return {
+            'count': self.count,
+            'errors': self.errors,
+            'mean_ms': round(self.total_ms / self.count, 1) if self.count else 0.0,
+            'p50_ms': self.percentile(0.5),
+            'p95_ms': self.percentile(0.95),
+            'max_ms': round(self.max_ms, 1),
+            'buckets': {(f"le_{b}" if i < len(self.buckets) else 'inf'): n
+                        for i, (b, n) in enumerate(zip(list(self.buckets) + [None], self.counts))},
+        }
+
+
+class Tracer:
+    """스팬 기록기 (최근 스팬 보관 + 단계별 히스토그램 누적)"""
+
+    def __init__(self, max_spans: int = None, enabled: bool = None):
+        """
+        Args:
+            max_spans: 보관할 최근 스팬 수 (오래된 것부터 버림, 히스토그램은 계속 누적)
+            enabled: False면 아무것도 기록하지 않음
+        """
+        self.enabled = Config.TRACING_ENABLED if enabled is None else enabled
+        self._spans = deque(maxlen=max_spans or Config.TRACE_MAX_SPANS)
+        self._histograms: Dict[str, LatencyHistogram] = {}
+        self._listeners: List[Callable[[Span], None]] = []
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._epoch = time.perf_counter()
+        self._epoch_wall = time.time()
+
+    @contextmanager
+    def span(self, name: str, **attrs):
+        """단계 실행 구간 기록"""
+        if not self.enabled:
+            yield _NULL_SPAN
+            return
+
+        parent = _current_span.get()
+        span = Span(name, next(self._ids), parent.span_id if parent else None, _current_trace.get(), attrs)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.error = type(e).__name__
+            raise
+        finally:
+            span.end = time.perf_counter()
+            _current_span.reset(token)
+            self._record(span)
+
+    def _record(self, span: Span):
+        with self._lock:
+            self._spans.append(span)
+            histogram = self._histograms.get(span.name)
+            if histogram is None:
+                histogram = self._histograms[span.name] = LatencyHistogram()
+            histogram.observe(span.duration * 1000, error=span.error is not None)
+            listeners = list(self._listeners)
+        for listener in listeners:
+            try:
+                listener(span)
+            except Exception as e:
+                print(f"[추적] 리스너 오류: {type(e).__name__}: {e}")
+
+    def add_listener(self, listener: Callable[[Span], None]):
+        """스팬 종료 시 호출할 함수 등록 (메트릭 집계 등)"""
+        with self._lock:
+            self._listeners.append(listener)
+
+    def spans(self, trace_id: str = None) -> List[Span]:
+        """보관 중인 스팬 (trace_id를 주면 해당 세션만)"""
+        with self._lock:
+            spans = list(self._spans)
+        return [s for s in spans if trace_id is None or s.trace_id == trace_id]
+
+    def chrome_trace(self, trace_id: str = None) -> Dict:
+        """Chrome trace 이벤트 형식 (완료 이벤트 'X' + 스레드 이름 메타데이터)"""
+        pid = os.getpid()
+        events = []
+        threads = {}
+        for s in self.spans(trace_id):
+            threads.setdefault(s.thread_id, s.thread_name)
+            args = dict(s.attrs)
+            if s.trace_id:
+                args['trace_id'] = s.trace_id
+            if s.error:
+                args['error'] = s.error
+            events.append({
+                'name': s.name,
+                'cat': s.name.split('.')[0],
+                'ph': 'X',
+                'ts': round((s.start - self._epoch) * 1e6),
+                'dur': round(s.duration * 1e6),
+                'pid': pid,
+                'tid': s.thread_id,
+                'id': s.span_id,
+                'args': args,
+            })
+        for tid, name in threads.items():
+            events.append({'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid, 'args': {'name': name}})
+        return {
+            'traceEvents': events,
+            'displayTimeUnit': 'ms',
+            'otherData': {'trace_id': trace_id, 'epoch': self._epoch_wall},
+        }
+
+    def export_chrome_trace(self, path: str, trace_id: str = None) -> str:
+        """Chrome trace JSON 파일 저장, 경로 반환"""
+        _write_json(path, self.chrome_trace(trace_id))
+        return path
+
+    def histograms(self) -> Dict[str, Dict]:
+        """단계별 지연 히스토그램"""
+        with self._lock:
+            return {name: h.to_dict() for name, h in sorted(self._histograms.items())}
+
+    def export_histograms(self, path: str) -> str:
+        """단계별 히스토그램 JSON 파일 저장, 경로 반환"""
+        _write_json(path, {'generated_at': time.time(), 'stages': self.histograms()})
+        return path
+
+    def format_histograms(self) -> str:
+        """단계별 지연 요약 텍스트"""
+        stages = self.histograms()
+        if not stages:
+            return "기록된 단계가 없습니다."
+        width = max(len(name) for name in stages)
+        lines = [f"{'단계':<{width}}  {'횟수':>6} {'평균':>9} {'p50':>9} {'p95':>9} {'최대':>9}"]
+        for name, h in stages.items():
+            lines.append(
+                f"{name:<{width}}  {h['count']:>6} {h['mean_ms']:>7.0f}ms {h['p50_ms']:>7.0f}ms "
+                f"{h['p95_ms']:>7.0f}ms {h['max_ms']:>7.0f}ms"
+            )
+        return "\n".join(lines)
+
+    def reset(self):
+        """기록 초기화"""
+        with self._lock:
+            self._spans.clear()
+            self._histograms.clear()
+
+
+def _write_json(path: str, data: Dict):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False)
+
+
+# 프로세스 전역 추적기
+_default_tracer = None
+_default_tracer_lock = threading.Lock()
+
+
+def get_tracer() -> Tracer:
+    """기본 추적기 반환"""
+    global _default_tracer
+    with _default_tracer_lock:
+        if _default_tracer is None:
+            _default_tracer = Tracer()
+        return _default_tracer
+
+
+def span(name: str, **attrs):
+    """기본 추적기로 단계 구간 기록 (with span('pubmed.esearch', query=q) as s: ... s.set(hits=n))"""
+    return get_tracer().span(name, **attrs)
+
+
+def annotate(**attrs):
+    """현재 스팬에 속성 추가 (스팬 밖이면 무시)"""
+    current = _current_span.get()
+    if current is not None:
+        current.set(**attrs)
+
+
+def traced(name: str = None):
+    """함수 전체를 스팬으로 기록하는 데코레이터 (이름 생략 시 함수 이름)"""
+    def decorator(func):
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(span_name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+@contextmanager
+def trace_context(trace_id: str):
+    """이 구간에서 생기는 스팬을 trace_id(세션 ID 등)로 묶음"""
+    token = _current_trace.set(trace_id)
+    try:
+        yield
+    finally:
+        _current_trace.reset(token)
+
+
+def current_trace_id() -> Optional[str]:
+    return _current_trace.get()
+
+
+def bind(func: Callable) -> Callable:
+    """현재 세션/부모 스팬을 다른 스레드에서도 이어가도록 함수 감싸기 (스레드 풀 제출 직전에 호출)"""
+    parent, trace_id = _current_span.get(), _current_trace.get()
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        span_token = _current_span.set(parent)
+        trace_token = _current_trace.set(trace_id)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _current_trace.reset(trace_token)
+            _current_span.reset(span_token)
+    return wrapper
@@ -0,0 +1,214 @@
+"""
+번역 서비스 모듈
+- (원문 해시, 번역 방향)을 키로 번역 결과를 SQLite에 영구 캐시
+- 캐시 미스만 몇 개의 요청으로 묶어(배치) 서비스 공용 스레드 풀에서 동시에 번역
+- 백엔드 교체 가능: Google(deep_translator) / 로컬 대체 백엔드 (오프라인, 테스트용)
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Sequence
+
+from config import Config
+from modules.metrics import record_cache
+from modules.tracing import annotate, bind, span, traced
+
+
+# 배치 번역 시 문장 구분자 (번역기가 줄바꿈은 보존하고 번호 표식은 건드리지 않음)
+_BATCH_SEPARATOR = '\n\n'
+
+
+class GoogleBackend:
+    """deep_translator GoogleTranslator 백엔드"""
+
+    # 요청당 최대 글자 수 (Google 번역 제한 5000자)
+    MAX_CHARS = 4500
+
+    def translate_batch(self, texts: List[str], source: str, target: str) -> List[Optional[str]]:
+        """
+        여러 문장을 한 번의 요청으로 번역 (구분자로 합쳐 보내고 다시 분리)
+        분리 결과 개수가 맞지 않으면 문장별로 다시 번역
+        """
+        from deep_translator import GoogleTranslator
+
+        translator = GoogleTranslator(source=source, target=target)
+        joined = _BATCH_SEPARATOR.join(t.replace('\n', ' ') for t in texts)
+        translated = translator.translate(joined) or ''
+        parts = [p.strip() for p in translated.split(_BATCH_SEPARATOR) if p.strip()]
+        if len(parts) == len(texts):
+            return parts
+
+        print(f"[번역] 배치 분리 실패 ({len(parts)}/{len(texts)}) - 문장별 번역")
+        results = []
+        for text in texts:
+            try:
+                results.append(translator.translate(text) or None)
+            except Exception:
+                results.append(None)
+        return results
+
+
+class LocalBackend:
+    """로컬 대체 백엔드 - 네트워크 없이 원문에 방향 표시만 붙여 반환 (테스트/오프라인용)"""
+
+    MAX_CHARS = 4500
+
+    def __init__(self):
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def translate_batch(self, texts: List[str], source: str, target: str) -> List[Optional[str]]:
+        with self._lock:
+            self.calls += 1
+        return [f"[{source}→{target}] {text}" for text in texts]
+
+
+_BACKENDS = {'google': GoogleBackend, 'local': LocalBackend}
+
+
+class TranslationService:
+    """캐시 + 배치 + 동시 실행 번역 서비스"""
+
+    def __init__(self, backend=None, db_path: str = None, max_workers: int = None):
+        """
+        Args:
+            backend: 번역 백엔드 (translate_batch, MAX_CHARS 제공, 기본값: Config.TRANSLATION_BACKEND)
+            db_path: 캐시 SQLite 파일 경로
+            max_workers: 동시 번역 요청 수 (이 서비스를 쓰는 모든 호출 합계)
+        """
+        self.backend = backend or _BACKENDS.get(Config.TRANSLATION_BACKEND, GoogleBackend)()
+        self.db_path = db_path or os.path.join(Config.CACHE_DIR, 'translations.db')
+        self.max_workers = max_workers or Config.TRANSLATION_WORKERS
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='translate')
+        os.makedirs(os.path.dirname(self.db_path) or '.', exist_ok=True)
+        self._lock = threading.Lock()
+        # 웹훅 모드에서는 여러 워커 프로세스가 같은 파일을 사용 (WAL + 잠금 대기)
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS translations (
+                text_hash TEXT NOT NULL,
+                direction TEXT NOT NULL,
+                translated TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (text_hash, direction)
+            )
+        """)
+        self._conn.commit()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _hash(text: str) -> str:
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+    def _get_cached(self, hashes: List[str], direction: str) -> Dict[str, str]:
+        """캐시 조회 → {원문 해시: 번역}"""
+        results = {}
+        with self._lock:
+            # SQLite 변수 개수 제한 고려하여 나눠서 조회
+            for i in range(0, len(hashes), 500):
+                chunk = hashes[i:i + 500]
+                placeholders = ','.join('?' * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT text_hash, translated FROM translations "
+                    f"WHERE direction = ? AND text_hash IN ({placeholders})",
+                    [direction] + chunk
+                ).fetchall()
+                results.update(rows)
+        return results
+
+    def _save(self, pairs: Dict[str, str], direction: str):
+        """번역 결과 저장 (실패한 번역은 저장하지 않음)"""
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO translations (text_hash, direction, translated, created_at) "
+                "VALUES (?, ?, ?, ?)",
+                [(h, direction, t, now) for h, t in pairs.items() if t]
+            )
+            self._conn.commit()
+
+    def _make_batches(self, texts: List[str]) -> List[List[str]]:
+        """요청당 글자 수 제한 안에서 최소 개수의 배치로 나누기"""
+        limit = getattr(self.backend, 'MAX_CHARS', 4500)
+        batches, current, size = [], [], 0
+        for text in texts:
+            extra = len(text) + len(_BATCH_SEPARATOR)
+            if current and size + extra > limit:
+                batches.append(current)
+                current, size = [], 0
+            current.append(text[:limit])
+            size += extra
+        if current:
+            batches.append(current)
+        return batches
+
+    def _translate_batch(self, batch: List[str], source: str, target: str) -> List[Optional[str]]:
+        try:
+            with span('translation.batch', texts=len(batch)):
+                return self.backend.translate_batch(batch, source, target)
+        except Exception as e:
+            print(f"[번역] 배치 번역 실패 ({len(batch)}건): {type(e).__name__}")
+            return [None] * len(batch)
+
+    @traced('translation')
+    def translate_many(self, texts: Sequence[str], source: str = 'en', target: str = 'ko') -> List[Optional[str]]:
+        """
+        여러 문장 번역 (입력 순서 유지)
+
+        Returns:
+            번역 리스트 (번역 실패 항목은 None)
+        """
+        direction = f"{source}>{target}"
+        hashes = [self._hash(t) if t else None for t in texts]
+        found = self._get_cached([h for h in set(hashes) if h], direction)
+
+        # 캐시 미스만 중복 제거 후 번역
+        missing = {}
+        for text, h in zip(texts, hashes):
+            if h and h not in found and h not in missing:
+                missing[h] = text
+        hits = sum(1 for h in hashes if h and h in found)
+        self.hits += hits
+        self.misses += len(missing)
+        annotate(texts=len(texts), cache_hits=hits, misses=len(missing))
+        record_cache('translation', hits=hits, misses=len(missing))
+
+        if missing:
+            start = time.time()
+            miss_hashes = list(missing)
+            batches = self._make_batches([missing[h] for h in miss_hashes])
+            outputs = list(self._executor.map(bind(lambda b: self._translate_batch(b, source, target)), batches))
+
+            translated = {}
+            flat = [t for output in outputs for t in output]
+            for h, t in zip(miss_hashes, flat):
+                translated[h] = t
+            self._save(translated, direction)
+            found.update({h: t for h, t in translated.items() if t})
+            print(f"[번역] {len(missing)}건 → {len(batches)}개 요청 ({time.time() - start:.1f}초)")
+
+        return [found.get(h) if h else None for h in hashes]
+
+    def translate(self, text: str, source: str = 'en', target: str = 'ko') -> Optional[str]:
+        """한 문장 번역 (실패 시 None)"""
+        return self.translate_many([text], source, target)[0]
+
+
+# 프로세스 전역 서비스
+_default_service = None
+_default_service_lock = threading.Lock()
+
+
+def get_translation_service() -> TranslationService:
+    """기본 번역 서비스 반환"""
+    global _default_service
+    with _default_service_lock:
+        if _default_service is None:
+            _default_service = TranslationService()
+        return _default_service
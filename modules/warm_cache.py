@@ -0,0 +1,118 @@
+"""
+조회 결과 웜 캐시
+- 키워드별 토픽 추출 결과, PubMed 검색 결과, PMID별 PMC 전문 조회 결과를 TTL 동안 보관
+- 실제 사용자 요청과 인기 키워드 사전 수집(prefetch)이 같은 캐시를 채우고 사용
+- 검색 결과 논문 본문은 공유 논문 저장소에 두고 참조만 저장
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional
+
+from config import Config
+from modules.metrics import record_cache
+from modules.paper_store import get_paper_store
+
+
+class WarmCache:
+    """토픽/검색/PMC 조회 결과 캐시 (SQLite)"""
+
+    def __init__(self, db_path: str = None, ttl: int = None):
+        """
+        Args:
+            db_path: SQLite 파일 경로
+            ttl: 항목 유효 시간 (초)
+        """
+        self.db_path = db_path or os.path.join(Config.CACHE_DIR, 'warm_cache.db')
+        self.ttl = Config.WARM_CACHE_TTL if ttl is None else ttl
+        os.makedirs(os.path.dirname(self.db_path) or '.', exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS topic_results (
+                keyword TEXT PRIMARY KEY,
+                result TEXT NOT NULL,
+                fetched_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS search_results (
+                query TEXT NOT NULL,
+                max_results INTEGER NOT NULL,
+                refs TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                PRIMARY KEY (query, max_results)
+            );
+            CREATE TABLE IF NOT EXISTS pmc_results (
+                pmid TEXT PRIMARY KEY,
+                payload TEXT NOT NULL,
+                fetched_at REAL NOT NULL
+            );
+        """)
+        self._conn.commit()
+
+    def _get(self, cache: str, sql: str, params) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(sql, params).fetchone()
+        if not row or time.time() - row[1] > self.ttl:
+            record_cache(cache, misses=1)
+            return None
+        record_cache(cache, hits=1)
+        return row[0]
+
+    def _put(self, sql: str, params):
+        with self._lock, self._conn:
+            self._conn.execute(sql, params)
+
+    def get_topics(self, keyword: str) -> Optional[Dict]:
+        """키워드 토픽 추출 결과"""
+        value = self._get('warm_topics', "SELECT result, fetched_at FROM topic_results WHERE keyword = ?", (keyword,))
+        return json.loads(value) if value else None
+
+    def put_topics(self, keyword: str, result: Dict):
+        self._put(
+            "INSERT OR REPLACE INTO topic_results (keyword, result, fetched_at) VALUES (?, ?, ?)",
+            (keyword, json.dumps(result, ensure_ascii=False), time.time())
+        )
+
+    def get_search(self, query: str, max_results: int) -> Optional[List[Dict]]:
+        """PubMed 검색 결과 (논문 저장소에서 본문 복원)"""
+        value = self._get(
+            'warm_search', "SELECT refs, fetched_at FROM search_results WHERE query = ? AND max_results = ?",
+            (query, max_results)
+        )
+        return get_paper_store().resolve(json.loads(value)) if value else None
+
+    def put_search(self, query: str, max_results: int, papers: List[Dict]):
+        refs = get_paper_store().put_many(papers)
+        self._put(
+            "INSERT OR REPLACE INTO search_results (query, max_results, refs, fetched_at) VALUES (?, ?, ?, ?)",
+            (query, max_results, json.dumps(refs, ensure_ascii=False), time.time())
+        )
+
+    def get_pmc(self, pmid: str) -> Optional[Dict]:
+        """PMC 전문 조회 결과 (전문 없음은 빈 dict)"""
+        value = self._get('warm_pmc', "SELECT payload, fetched_at FROM pmc_results WHERE pmid = ?", (pmid,))
+        return json.loads(value) if value is not None else None
+
+    def put_pmc(self, pmid: str, payload: Dict):
+        self._put(
+            "INSERT OR REPLACE INTO pmc_results (pmid, payload, fetched_at) VALUES (?, ?, ?)",
+            (pmid, json.dumps(payload, ensure_ascii=False), time.time())
+        )
+
+
+# 프로세스 전역 캐시
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_warm_cache() -> WarmCache:
+    """기본 웜 캐시 반환"""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = WarmCache()
+        return _default_cache
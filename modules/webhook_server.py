@@ -0,0 +1,215 @@
+"""
+텔레그램 웹훅 배포 모드
+- 프런트 HTTP(S) 서버가 웹훅 업데이트를 받아 user_id 기준으로 워커 프로세스에 분배
+- 같은 사용자의 업데이트는 항상 같은 워커로 가므로 대화 상태/세션 캐시가 일관됨
+- 워커마다 독립된 Application(업데이터 없음)이 이벤트 루프와 GIL을 따로 사용
+- 세션/논문/체크포인트 저장소(SQLite)는 워커 간 공유
+- 작업 관리자, LLM 호출 슬롯, 텔레그램 발신 제한은 워커마다 따로 있어 build_application이
+  JOB_WORKERS/JOB_KIND_LIMITS/LLM_MAX_CONCURRENCY/TG_GLOBAL_RATE를 BOT_WORKERS로 나눠 적용
+  (워커당 최소 1이므로 상한이 BOT_WORKERS보다 작으면 실제 합계는 BOT_WORKERS)
+- WEBHOOK_CERT/WEBHOOK_KEY를 지정하면 프런트 서버가 직접 HTTPS 종단 (로컬 테스트용, 운영은 리버스 프록시 권장)
+"""
+
+import asyncio
+import hmac
+import json
+import multiprocessing
+import ssl
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional
+
+from config import Config
+
+
+def extract_user_id(update: Dict) -> Optional[int]:
+    """업데이트 JSON에서 사용자 ID 추출 (사용자가 없으면 채팅 ID, 둘 다 없으면 None)"""
+    for key, value in update.items():
+        if not isinstance(value, dict):
+            continue
+        sender = value.get('from') or value.get('user')
+        if isinstance(sender, dict) and 'id' in sender:
+            return sender['id']
+        chat = value.get('chat') or (value.get('message') or {}).get('chat')
+        if isinstance(chat, dict) and 'id' in chat:
+            return chat['id']
+    return None
+
+
+def shard_for(update: Dict, workers: int) -> int:
+    """업데이트를 처리할 워커 번호"""
+    user_id = extract_user_id(update)
+    key = user_id if user_id is not None else update.get('update_id', 0)
+    return abs(key) % workers
+
+
+def _worker_main(index: int, queue, build_application: Callable):
+    """워커 프로세스 진입점"""
+    try:
+        asyncio.run(_worker_loop(index, queue, build_application))
+    except KeyboardInterrupt:
+        pass
+
+
+async def _worker_loop(index: int, queue, build_application: Callable):
+    """큐로 받은 업데이트를 워커 Application에 전달"""
+    from telegram import Update
+
+    application = build_application(webhook=True, worker_index=index)
+    loop = asyncio.get_running_loop()
+
+    async with application:
+        await application.start()
+        print(f"[웹훅 워커 {index}] 시작")
+        while True:
+            data = await loop.run_in_executor(None, queue.get)
+            if data is None:
+                break
+            try:
+                update = Update.de_json(data, application.bot)
+            except Exception as e:
+                print(f"[웹훅 워커 {index}] 업데이트 파싱 실패: {type(e).__name__}: {e}")
+                continue
+            await application.update_queue.put(update)
+        await application.stop()
+        if application.post_shutdown:
+            await application.post_shutdown(application)
+    print(f"[웹훅 워커 {index}] 종료")
+
+
+class WebhookDispatcher:
+    """웹훅 업데이트를 워커 프로세스 큐로 분배"""
+
+    def __init__(self, build_application: Callable, workers: int = None):
+        """
+        Args:
+            build_application: (webhook=True, worker_index=번호)로 호출하면 업데이터 없는 Application을 만드는 함수 (모듈 최상위 함수)
+            workers: 워커 프로세스 수
+        """
+        self.workers = workers or Config.BOT_WORKERS
+        self._build_application = build_application
+        self._ctx = multiprocessing.get_context('spawn')
+        self._queues = [self._ctx.Queue() for _ in range(self.workers)]
+        self._processes: List = []
+        self.dispatched = [0] * self.workers
+        self._lock = threading.Lock()
+
+    def start(self):
+        """워커 프로세스 시작"""
+        for index, queue in enumerate(self._queues):
+            process = self._ctx.Process(
+                target=_worker_main, args=(index, queue, self._build_application),
+                name=f'bot-worker-{index}', daemon=True
+            )
+            process.start()
+            self._processes.append(process)
+
+    def dispatch(self, update: Dict) -> int:
+        """업데이트를 담당 워커로 전달, 워커 번호 반환"""
+        index = shard_for(update, self.workers)
+        self._queues[index].put(update)
+        with self._lock:
+            self.dispatched[index] += 1
+        return index
+
+    def stop(self, timeout: float = 30):
+        """워커에 종료 신호를 보내고 대기"""
+        for queue in self._queues:
+            queue.put(None)
+        for process in self._processes:
+            process.join(timeout)
+            if process.is_alive():
+                process.terminate()
+
+
+def _make_handler(dispatcher: WebhookDispatcher, path: str, secret: str):
+    class WebhookHandler(BaseHTTPRequestHandler):
+        """텔레그램 웹훅 요청 처리 (검증 후 즉시 200 응답)"""
+
+        def do_POST(self):
+            if self.path != path:
+                self.send_error(404)
+                return
+            token = self.headers.get('X-Telegram-Bot-Api-Secret-Token', '')
+            if secret and not hmac.compare_digest(token, secret):
+                self.send_error(403)
+                return
+            try:
+                length = int(self.headers.get('Content-Length', 0))
+                update = json.loads(self.rfile.read(length))
+            except (ValueError, json.JSONDecodeError):
+                self.send_error(400)
+                return
+
+            dispatcher.dispatch(update)
+            self.send_response(200)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+
+        def log_message(self, format, *args):
+            # 요청마다 로그를 남기지 않음
+            pass
+
+    return WebhookHandler
+
+
+def make_server(dispatcher: WebhookDispatcher, listen: str = None, port: int = None,
+                path: str = None, secret: str = None, cert: str = None, key: str = None) -> ThreadingHTTPServer:
+    """웹훅 수신 서버 생성 (cert/key가 있으면 HTTPS)"""
+    listen = listen or Config.WEBHOOK_LISTEN
+    port = Config.WEBHOOK_PORT if port is None else port
+    path = path or Config.WEBHOOK_PATH
+    secret = Config.WEBHOOK_SECRET if secret is None else secret
+    cert = cert or Config.WEBHOOK_CERT
+    key = key or Config.WEBHOOK_KEY
+
+    server = ThreadingHTTPServer((listen, port), _make_handler(dispatcher, path, secret))
+    if cert and key:
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(cert, key)
+        server.socket = context.wrap_socket(server.socket, server_side=True)
+    return server
+
+
+async def _register_webhook(token: str):
+    """텔레그램에 웹훅 URL 등록"""
+    from telegram import Bot, Update
+
+    certificate = None
+    if Config.WEBHOOK_CERT and Config.WEBHOOK_PUBLIC_CERT:
+        certificate = open(Config.WEBHOOK_CERT, 'rb')
+    try:
+        async with Bot(token) as bot:
+            await bot.set_webhook(
+                url=Config.WEBHOOK_URL.rstrip('/') + Config.WEBHOOK_PATH,
+                secret_token=Config.WEBHOOK_SECRET or None,
+                certificate=certificate,
+                allowed_updates=Update.ALL_TYPES,
+                drop_pending_updates=True,
+            )
+    finally:
+        if certificate:
+            certificate.close()
+
+
+def run_webhook(token: str, build_application: Callable, workers: int = None):
+    """웹훅 모드 실행 (Ctrl+C로 종료)"""
+    if not Config.WEBHOOK_URL:
+        raise ValueError("WEBHOOK_URL이 설정되지 않았습니다. .env 파일을 확인하세요.")
+
+    asyncio.run(_register_webhook(token))
+
+    dispatcher = WebhookDispatcher(build_application, workers)
+    dispatcher.start()
+    server = make_server(dispatcher)
+    scheme = 'https' if Config.WEBHOOK_CERT and Config.WEBHOOK_KEY else 'http'
+    print(f"🤖 웹훅 모드: {scheme}://{Config.WEBHOOK_LISTEN}:{Config.WEBHOOK_PORT}{Config.WEBHOOK_PATH} "
+          f"(워커 {dispatcher.workers}개)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        dispatcher.stop()
+        print(f"[웹훅] 종료 (워커별 처리 수: {dispatcher.dispatched})")
@@ -13,11 +13,15 @@ import os
 import sys
 import json
 import asyncio
-from datetime import datetime
-from typing import Dict, List, Set
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from datetime import datetime, time as dt_time
+from functools import partial
+from typing import Dict, List, Set, Tuple
 
 # 텔레그램 봇 라이브러리
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
+from telegram.error import BadRequest, TelegramError
 from telegram.ext import (
     Application,
     CommandHandler,
@@ -31,13 +35,28 @@ from telegram.ext import (
 # 기존 모듈 임포트
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from modules.smart_topic_extractor import SmartTopicExtractor
-from modules.pubmed_search import PubMedSearcher
+from modules.pubmed_search import PubMedError, PubMedSearcher
 from modules.paper_analyzer import PaperAnalyzer
 from modules.blog_generator import BlogGenerator
-from modules.pmc_fulltext import PMCFullTextFetcher
+from modules.pmc_fulltext import PMCError, PMCFullTextFetcher
 from modules.llm_paper_analyzer import save_for_claude_analysis, create_batch_analysis_prompt
 from modules.claude_paper_scorer import score_papers_with_claude
-from modules.auto_blog_generator import generate_blog_auto, get_last_error_log
+from modules.llm_runner import set_llm_concurrency
+from modules.auto_blog_generator import generate_blog_auto
+from modules.analysis_pipeline import AnalysisPipeline
+from modules.job_manager import Job, configure_job_manager, get_job_manager, worker_limits
+from modules.telegram_rate_limiter import OutboundRateLimiter
+from modules.session_store import get_session_store
+from modules.session_cache import SessionCache
+from modules.checkpoint_store import StageCheckpoints, get_checkpoint_store
+from modules.paper_store import get_paper_store
+from modules.webhook_server import run_webhook
+from modules.translation_service import get_translation_service
+from modules.paper_insights import InsightStage, compute_insights
+from modules.warm_cache import get_warm_cache
+from modules.prefetch import run_prefetch, load_report, format_report
+from modules.tracing import bind, get_tracer, span
+from modules.metrics import get_registry, start_metrics_server
 from config import Config
 
 # 대화 상태 정의
@@ -50,6 +69,15 @@ from config import Config
 ) = range(5)
 
 
+def _log_send_error(error: TelegramError):
+    """상태 메시지 전송/수정 실패 기록 (내용이 같거나 이미 삭제된 메시지는 무시)"""
+    if isinstance(error, BadRequest) and (
+        'not modified' in error.message or 'not found' in error.message
+    ):
+        return
+    print(f"[텔레그램] 상태 메시지 전송 실패: {type(error).__name__}: {error}")
+
+
 class LoadingIndicator:
     """로딩 중 상태를 주기적으로 업데이트하는 클래스"""
 
@@ -63,6 +91,7 @@ class LoadingIndicator:
         self.task = None
         self.counter = 0
         self.dots = ["⏳", "⌛"]
+        self.queue_position = None  # 작업 대기열 순번 (대기 중일 때만)
 
     async def start(self):
         """로딩 시작"""
@@ -84,26 +113,37 @@ class LoadingIndicator:
             self.counter += 1
             elapsed = self.counter * self.interval
             dot = self.dots[self.counter % 2]
+            if self.queue_position:
+                status = f"🕒 대기 중... 대기열 {self.queue_position}번째 ({elapsed}초 경과)"
+            else:
+                status = f"⏱️ 진행 중... ({elapsed}초 경과)"
             try:
                 await self.message.edit_text(
-                    f"{dot} {self.base_message}\n\n"
-                    f"⏱️ 진행 중... ({elapsed}초 경과)",
+                    f"{dot} {self.base_message}\n\n{status}",
                     parse_mode='Markdown'
                 )
-            except:
-                pass
+            except TelegramError as e:
+                _log_send_error(e)
 
     async def update(self, new_message: str):
         """메시지 업데이트"""
         self.base_message = new_message
         if self.message:
+            queue_line = f"\n\n🕒 대기열 {self.queue_position}번째" if self.queue_position else ""
             try:
                 await self.message.edit_text(
-                    f"⏳ {new_message}",
+                    f"⏳ {new_message}{queue_line}",
                     parse_mode='Markdown'
                 )
-            except:
-                pass
+            except TelegramError as e:
+                _log_send_error(e)
+
+    async def set_queue_position(self, position):
+        """작업 대기열 순번 표시 (None이면 대기 종료)"""
+        if position == self.queue_position:
+            return
+        self.queue_position = position
+        await self.update(self.base_message)
 
     async def stop(self, final_message: str = None):
         """로딩 종료"""
@@ -117,8 +157,8 @@ class LoadingIndicator:
         if final_message and self.message:
             try:
                 await self.message.edit_text(final_message, parse_mode='Markdown')
-            except:
-                pass
+            except TelegramError as e:
+                _log_send_error(e)
 
     async def delete(self):
         """메시지 삭제"""
@@ -128,8 +168,45 @@ class LoadingIndicator:
         if self.message:
             try:
                 await self.message.delete()
-            except:
-                pass
+            except TelegramError as e:
+                _log_send_error(e)
+
+class StreamPreview:
+    """스트리밍 생성 중인 HTML 끝부분을 메시지 하나로 주기적으로 보여주는 클래스"""
+
+    PREVIEW_CHARS = 800
+
+    def __init__(self, bot, chat_id, loop):
+        self.bot = bot
+        self.chat_id = chat_id
+        self.loop = loop
+        self.message = None
+        self._lock = asyncio.Lock()
+
+    def push(self, html: str):
+        """부분 HTML 전달 (작업 스레드에서 호출)"""
+        asyncio.run_coroutine_threadsafe(self._show(html), self.loop)
+
+    async def _show(self, html: str):
+        text = f"📝 작성 중... ({len(html)}자)\n\n…{html[-self.PREVIEW_CHARS:]}"
+        async with self._lock:
+            try:
+                if self.message is None:
+                    self.message = await self.bot.send_message(chat_id=self.chat_id, text=text)
+                else:
+                    await self.message.edit_text(text)
+            except TelegramError as e:
+                _log_send_error(e)
+
+    async def delete(self):
+        """미리보기 메시지 삭제"""
+        async with self._lock:
+            if self.message:
+                try:
+                    await self.message.delete()
+                except TelegramError as e:
+                    _log_send_error(e)
+                self.message = None
 
 # Hook 스타일 정의
 HOOK_STYLES = {
@@ -187,99 +264,178 @@ class BlogBotSession:
         self.papers: List[Dict] = []
         self.search_queries: List[str] = []  # 실제 사용된 PubMed 검색 쿼리
         self.draft: str = ""
+        self.paper_view: Dict = {'page': 0, 'fulltext_only': False, 'min_score': 0}  # 논문 목록 보기 상태
         self.created_at: datetime = datetime.now()
         self.session_id: str = datetime.now().strftime('%Y%m%d_%H%M%S')
+        self.user_id: int = 0  # 세션 저장소 키 (get_session에서 설정)
+        self.step: str = ""  # 마지막으로 저장한 단계
+        self.persist: bool = True  # False면 세션 저장소에 기록하지 않음 (사전 수집용 임시 세션)
 
-    def save_to_file(self, step: str = ""):
-        """세션 데이터를 파일로 저장"""
-        import json
-        save_dir = "session_data"
-        os.makedirs(save_dir, exist_ok=True)
-
-        filename = f"{save_dir}/{self.keyword}_{self.session_id}_{step}.json"
-        data = {
-            'keyword': self.keyword,
+    def _state(self) -> Dict:
+        """논문 외 저장할 세션 상태"""
+        return {
             'keyword_en': self.keyword_en,
             'topics': self.topics,
             'selected_topics': list(self.selected_topics),
             'hook_style': self.hook_style,
-            'papers': self.papers,
             'search_queries': self.search_queries,
-            'created_at': self.created_at.isoformat(),
-            'step': step
         }
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-        print(f"[세션 저장] {filename}")
+
+    @property
+    def checkpoint_key(self) -> str:
+        """단계 내부 체크포인트 키 (같은 사용자가 /retry로 다시 불러와도 같은 키)"""
+        return f"{self.session_id}:{self.keyword}"
+
+    def save_step(self, step: str = ""):
+        """현재 단계를 세션 저장소에 기록 (논문 목록은 바뀐 경우에만 새로 저장됨)"""
+        self.step = step
+        if not self.persist:
+            return
+        get_session_store().save(
+            self.user_id, self.session_id, self.keyword, step,
+            self.created_at.isoformat(), self._state(), self.papers
+        )
+        print(f"[세션 저장] {self.keyword} ({self.session_id}) - {step}")
 
     @classmethod
-    def load_from_file(cls, filepath: str) -> 'BlogBotSession':
-        """파일에서 세션 불러오기"""
-        import json
-        with open(filepath, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+    def load(cls, user_id: int, session_id: str) -> 'BlogBotSession':
+        """세션 저장소에서 세션 불러오기 (없으면 None)"""
+        record = get_session_store().load(user_id, session_id)
+        if not record:
+            return None
 
+        state = record['state']
         session = cls()
-        session.keyword = data.get('keyword', '')
-        session.keyword_en = data.get('keyword_en', '')
-        session.topics = data.get('topics', {})
-        session.selected_topics = set(data.get('selected_topics', []))
-        session.hook_style = data.get('hook_style', '')
-        session.papers = data.get('papers', [])
-        session.search_queries = data.get('search_queries', [])
-        session.session_id = data.get('created_at', '')[:15].replace('-', '').replace('T', '_').replace(':', '')
+        session.user_id = user_id
+        session.session_id = session_id
+        session.keyword = record['keyword']
+        session.keyword_en = state.get('keyword_en', '')
+        session.topics = state.get('topics', {})
+        session.selected_topics = set(state.get('selected_topics', []))
+        session.hook_style = state.get('hook_style', '')
+        session.papers = record['papers']
+        session.search_queries = state.get('search_queries', [])
+        session.step = record['step']
+        try:
+            session.created_at = datetime.fromisoformat(record['created_at'])
+        except ValueError:
+            pass
         return session
 
     @staticmethod
-    def list_saved_sessions() -> List[Dict]:
-        """저장된 세션 목록 반환"""
-        import glob
-        save_dir = "session_data"
-        if not os.path.exists(save_dir):
-            return []
-
-        # 가장 최근 단계의 파일만 (키워드+세션ID별로 그룹핑)
-        files = glob.glob(f"{save_dir}/*.json")
-        sessions = {}
-
-        for f in files:
-            try:
-                import json
-                with open(f, 'r', encoding='utf-8') as fp:
-                    data = json.load(fp)
-                key = f"{data.get('keyword')}_{data.get('created_at', '')[:10]}"
-                step = data.get('step', '')
-
-                # 더 높은 단계만 저장
-                if key not in sessions or step > sessions[key].get('step', ''):
-                    sessions[key] = {
-                        'filepath': f,
-                        'keyword': data.get('keyword'),
-                        'step': step,
-                        'papers_count': len(data.get('papers', [])),
-                        'created_at': data.get('created_at', '')
-                    }
-            except:
-                pass
+    def list_saved_sessions(user_id: int) -> List[Dict]:
+        """사용자의 저장된 세션 목록 반환 (최근 갱신 순 10개)"""
+        return get_session_store().list_recent(limit=10, user_id=user_id)
 
-        return sorted(sessions.values(), key=lambda x: x.get('created_at', ''), reverse=True)[:10]
 
+def _spill_session(user_id: int, session: BlogBotSession):
+    """메모리에서 내보낼 세션을 저장소에 기록 → 세션 ID (키워드 입력 전 빈 세션은 저장하지 않음)"""
+    if not session.keyword:
+        return None
+    session.save_step(session.step or "0_started")
+    return session.session_id
+
+
+def _has_active_jobs(user_id: int) -> bool:
+    return bool(get_job_manager().jobs_for_user(user_id))
+
+
+# 사용자별 세션 캐시 (오래 안 쓴 세션은 세션 저장소로 내보냈다가 다음 요청 때 다시 불러옴)
+user_sessions: SessionCache[BlogBotSession] = SessionCache(
+    spill=_spill_session,
+    reload=BlogBotSession.load,
+    max_entries=Config.SESSION_CACHE_MAX_ENTRIES,
+    ttl=Config.SESSION_CACHE_TTL,
+    max_papers=Config.SESSION_CACHE_MAX_PAPERS,
+    pinned=_has_active_jobs,
+    size=lambda session: len(session.papers),
+)
 
-# 사용자별 세션 저장소
-user_sessions: Dict[int, BlogBotSession] = {}
+# 세션 메트릭
+_SESSIONS_CREATED = get_registry().counter('blog_sessions_created_total', '새로 시작한 세션 수')
+get_registry().gauge(
+    'blog_session_cache', '세션 캐시 상태 (entries/spilled/papers는 현재 값, 나머지는 누적)', ('stat',)
+).set_function(lambda: {(stat,): n for stat, n in user_sessions.stats().items()})
+_BLOGS_GENERATED = get_registry().counter('blog_blogs_generated_total', '블로그 생성 결과', ('result',))
+
+
+# 사용자별 논문 분석 파이프라인 (점수 평가 중 시작 → 블로그 생성 시 수집)
+analysis_pipelines: Dict[int, AnalysisPipeline] = {}
 
 
 def get_session(user_id: int) -> BlogBotSession:
     """사용자 세션 가져오기 (없으면 생성)"""
-    if user_id not in user_sessions:
-        user_sessions[user_id] = BlogBotSession()
-    return user_sessions[user_id]
+    session = user_sessions.get(user_id)
+    if session is None:
+        session = new_session(user_id)
+        user_sessions.put(user_id, session)
+    return session
+
+
+def new_session(user_id: int) -> BlogBotSession:
+    """사용자의 새 세션 생성"""
+    session = BlogBotSession()
+    session.user_id = user_id
+    _SESSIONS_CREATED.inc()
+    return session
+
+
+def close_pipeline(user_id: int):
+    """사용자의 진행 중인 분석 파이프라인 정리"""
+    pipeline = analysis_pipelines.pop(user_id, None)
+    if pipeline:
+        pipeline.close()
+
+
+# 작업 안에서 제한 시간을 두고 실행할 호출용 (점수 평가)
+_timed_executor = ThreadPoolExecutor(max_workers=Config.JOB_WORKERS, thread_name_prefix='timed')
+
+
+def cancel_user_jobs(user_id: int) -> int:
+    """사용자의 진행 중인 백그라운드 작업과 분석 파이프라인 취소, 취소한 작업 수 반환"""
+    close_pipeline(user_id)
+    return get_job_manager().cancel_user(user_id)
+
+
+def loading_progress(loading: LoadingIndicator):
+    """작업 진행 메시지/대기열 순번을 로딩 표시에 반영하는 콜백 생성"""
+    async def _update(job: Job):
+        await loading.set_queue_position(job.queue_position)
+        if job.progress and job.progress != loading.base_message:
+            await loading.update(job.progress)
+    return _update
+
+
+async def dispatch_job_events(context: ContextTypes.DEFAULT_TYPE):
+    """작업 진행/완료 이벤트를 이벤트 루프에서 처리 (job_queue로 주기 실행)"""
+    for callback, job in get_job_manager().drain_events():
+        try:
+            await callback(job)
+        except Exception as e:
+            print(f"[작업] {job.job_id} 콜백 오류: {type(e).__name__}: {e}")
+
+
+async def sweep_sessions(context: ContextTypes.DEFAULT_TYPE):
+    """유휴 세션을 세션 저장소로 내보내기 (job_queue로 주기 실행)"""
+    before = len(user_sessions)
+    # 내보내기는 세션 저장소(SQLite) 쓰기이므로 이벤트 루프 밖에서
+    await asyncio.to_thread(user_sessions.sweep)
+    if len(user_sessions) < before:
+        print(f"[세션 캐시] {user_sessions.stats()}")
+
+
+async def purge_checkpoints(context: ContextTypes.DEFAULT_TYPE):
+    """CHECKPOINT_TTL이 지난 단계 체크포인트 삭제 (job_queue로 주기 실행, 시작 시 1회)"""
+    removed = await asyncio.to_thread(get_checkpoint_store().purge)
+    if removed:
+        print(f"[체크포인트] 오래된 단위 {removed}개 삭제")
 
 
 async def start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     """봇 시작"""
     user_id = update.effective_user.id
-    user_sessions[user_id] = BlogBotSession()  # 새 세션 시작
+    user_sessions.put(user_id, new_session(user_id))  # 새 세션 시작
+    cancel_user_jobs(user_id)
 
     await update.message.reply_text(
         "👋 *블로그 자동 생성 봇*에 오신 것을 환영합니다!\n\n"
@@ -291,7 +447,7 @@ async def start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
 
 
 async def receive_keyword(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
-    """키워드 수신 및 토픽 분석"""
+    """키워드 수신 후 토픽 분석 작업 등록 (결과는 작업 완료 시 전송)"""
     user_id = update.effective_user.id
     chat_id = update.effective_chat.id
     session = get_session(user_id)
@@ -305,125 +461,145 @@ async def receive_keyword(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     )
     await loading.start()
 
-    try:
-        # 토픽 추출 (별도 스레드에서 실행)
-        from concurrent.futures import ThreadPoolExecutor
-
-        loop = asyncio.get_event_loop()
-        extractor = SmartTopicExtractor()
-
-        with ThreadPoolExecutor() as executor:
-            result = await loop.run_in_executor(
-                executor,
-                extractor.extract_topics,
-                session.keyword,
-                15  # max_blogs
-            )
+    get_job_manager().submit(
+        user_id, 'topics', _extract_topics_job, session.keyword,
+        on_progress=loading_progress(loading),
+        on_done=partial(_on_topics_done, bot=context.bot, chat_id=chat_id, session=session, loading=loading),
+        trace_id=session.session_id
+    )
+    return SELECTING_TOPICS
 
-        # 로딩 종료
-        await loading.delete()
 
-        session.keyword_en = result.get('main_keyword_en', session.keyword)
+def _extract_topics_job(job: Job, keyword: str, refresh: bool = False) -> Dict:
+    """토픽 추출 (작업 스레드, 웜 캐시에 있으면 재사용 - refresh=True면 새로 추출)"""
+    warm_cache = get_warm_cache()
+    if not refresh:
+        cached = warm_cache.get_topics(keyword)
+        if cached is not None:
+            print(f"[웜 캐시] 토픽 재사용: {keyword}")
+            return cached
+
+    extractor = SmartTopicExtractor()
+    result = extractor.extract_topics(keyword, 15)  # max_blogs
+    # 블로그 수집 실패/Claude 실패로 만든 임시 결과는 다른 사용자에게 재사용하지 않음
+    if result.get('fallback') or not result.get('blogs_analyzed'):
+        print(f"[웜 캐시] 토픽 저장 생략 (블로그 {result.get('blogs_analyzed', 0)}개, 폴백 {bool(result.get('fallback'))})")
+    else:
+        warm_cache.put_topics(keyword, result)
+    return result
 
-        # Claude 분석 결과 가져오기
-        by_category = result.get('by_category', {})
-        trending = result.get('trending', [])
 
-        # 카테고리 정의
-        category_names = {
-            'diet': '🍽️ 음식/식이',
-            'treatment': '💊 치료/약물',
-            'lifestyle': '🏃 생활습관',
-            'symptom': '🩺 증상',
-            'general': '📌 기타'
-        }
+# 토픽 분류 (표시 순서)
+TOPIC_CATEGORIES = {
+    'diet': '🍽️ 음식/식이',
+    'treatment': '💊 치료/약물',
+    'lifestyle': '🏃 생활습관',
+    'symptom': '🩺 증상',
+    'general': '📌 기타'
+}
 
-        # 모든 토픽 수집 (카테고리별 + 트렌딩)
-        all_topics = {}  # {topic_name: category}
 
-        # 카테고리별 토픽 수집
-        for cat in category_names.keys():
-            cat_topics = by_category.get(cat, [])
-            for t in cat_topics:
-                topic_name = t['topic']
-                if topic_name not in all_topics:
-                    all_topics[topic_name] = cat
+def _collect_topics(result: Dict) -> Dict[str, str]:
+    """토픽 추출 결과 → {토픽: 분류} (카테고리 순서, 트렌딩은 마지막)"""
+    by_category = result.get('by_category', {})
+    all_topics = {}
 
-        # 트렌딩 토픽 추가
-        for t in trending:
+    # 카테고리별 토픽 수집
+    for cat in TOPIC_CATEGORIES:
+        for t in by_category.get(cat, []):
             topic_name = t['topic']
             if topic_name not in all_topics:
-                all_topics[topic_name] = 'trending'
-
-        # session.topics에 저장
-        session.topics = all_topics
-
-        # 세션 저장 (키워드 분석 완료)
-        session.save_to_file("1_keyword_analyzed")
-
-        # 카테고리별 분석 결과 메시지 생성
-        analysis_msg = ""
-        for cat, cat_name in category_names.items():
-            cat_topics = by_category.get(cat, [])
-            if cat_topics:
-                topic_names = [t['topic'] for t in cat_topics]
-                analysis_msg += f"{cat_name}: {', '.join(topic_names)}\n"
-
-        # 트렌딩 키워드 추가
-        if trending:
-            trending_names = [t['topic'] for t in trending]
-            analysis_msg += f"🆕 신규발견: {', '.join(trending_names)}\n"
-
-        # 토픽 버튼 생성 (카테고리별로 정렬, 모든 토픽 포함)
-        keyboard = []
-        cat_emoji_map = {'diet': '🍽️', 'treatment': '💊', 'lifestyle': '🏃', 'symptom': '🩺', 'general': '📌', 'trending': '🆕'}
-
-        for topic_name, cat in all_topics.items():
-            cat_emoji = cat_emoji_map.get(cat, '📌')
-            keyboard.append([
-                InlineKeyboardButton(
-                    f"⬜ {cat_emoji} {topic_name}",
-                    callback_data=f"topic:{topic_name[:30]}"
-                )
-            ])
+                all_topics[topic_name] = cat
 
-        # 완료/전체선택/건너뛰기 버튼
-        keyboard.append([
-            InlineKeyboardButton("✅ 전체 선택", callback_data="topic:SELECT_ALL"),
-            InlineKeyboardButton("🚀 선택 완료", callback_data="topic:DONE"),
-        ])
-        keyboard.append([
-            InlineKeyboardButton("⏭️ 토픽 없이 키워드만 검색", callback_data="topic:SKIP"),
-        ])
+    # 트렌딩 토픽 추가
+    for t in result.get('trending', []):
+        topic_name = t['topic']
+        if topic_name not in all_topics:
+            all_topics[topic_name] = 'trending'
+    return all_topics
 
-        reply_markup = InlineKeyboardMarkup(keyboard)
 
-        await context.bot.send_message(
-            chat_id=chat_id,
-            text=(
-                f"📊 *'{session.keyword}'* Claude 분석 완료!\n\n"
-                f"📝 분석된 블로그: {result['blogs_analyzed']}개\n\n"
-                f"*[분석 결과]*\n{analysis_msg}\n"
-                f"👇 *글에 포함할 토픽을 선택하세요*"
-            ),
-            reply_markup=reply_markup,
-            parse_mode='Markdown'
-        )
+async def _on_topics_done(job: Job, bot, chat_id: int, session: BlogBotSession, loading: LoadingIndicator):
+    """토픽 분석 완료 - 토픽 선택 키보드 전송"""
+    # 로딩 종료
+    await loading.delete()
 
-        return SELECTING_TOPICS
+    if job.state == Job.CANCELLED:
+        return
 
-    except Exception as e:
-        # 로딩 종료
-        await loading.delete()
-        await context.bot.send_message(
+    if job.state == Job.FAILED:
+        await bot.send_message(
             chat_id=chat_id,
             text=(
                 f"❌ 분석 중 오류가 발생했습니다.\n\n"
-                f"오류: {str(e)}\n\n"
+                f"오류: {str(job.error)}\n\n"
                 "/start 로 다시 시작해주세요."
             )
         )
-        return ConversationHandler.END
+        return
+
+    result = job.result
+    session.keyword_en = result.get('main_keyword_en', session.keyword)
+
+    # Claude 분석 결과 가져오기
+    by_category = result.get('by_category', {})
+    trending = result.get('trending', [])
+
+    # 모든 토픽 수집 (카테고리별 + 트렌딩) → session.topics에 저장
+    all_topics = _collect_topics(result)
+    session.topics = all_topics
+
+    # 세션 저장 (키워드 분석 완료)
+    session.save_step("1_keyword_analyzed")
+
+    # 카테고리별 분석 결과 메시지 생성
+    analysis_msg = ""
+    for cat, cat_name in TOPIC_CATEGORIES.items():
+        cat_topics = by_category.get(cat, [])
+        if cat_topics:
+            topic_names = [t['topic'] for t in cat_topics]
+            analysis_msg += f"{cat_name}: {', '.join(topic_names)}\n"
+
+    # 트렌딩 키워드 추가
+    if trending:
+        trending_names = [t['topic'] for t in trending]
+        analysis_msg += f"🆕 신규발견: {', '.join(trending_names)}\n"
+
+    # 토픽 버튼 생성 (카테고리별로 정렬, 모든 토픽 포함)
+    keyboard = []
+    cat_emoji_map = {'diet': '🍽️', 'treatment': '💊', 'lifestyle': '🏃', 'symptom': '🩺', 'general': '📌', 'trending': '🆕'}
+
+    for topic_name, cat in all_topics.items():
+        cat_emoji = cat_emoji_map.get(cat, '📌')
+        keyboard.append([
+            InlineKeyboardButton(
+                f"⬜ {cat_emoji} {topic_name}",
+                callback_data=f"topic:{topic_name[:30]}"
+            )
+        ])
+
+    # 완료/전체선택/건너뛰기 버튼
+    keyboard.append([
+        InlineKeyboardButton("✅ 전체 선택", callback_data="topic:SELECT_ALL"),
+        InlineKeyboardButton("🚀 선택 완료", callback_data="topic:DONE"),
+    ])
+    keyboard.append([
+        InlineKeyboardButton("⏭️ 토픽 없이 키워드만 검색", callback_data="topic:SKIP"),
+    ])
+
+    reply_markup = InlineKeyboardMarkup(keyboard)
+
+    await bot.send_message(
+        chat_id=chat_id,
+        text=(
+            f"📊 *'{session.keyword}'* Claude 분석 완료!\n\n"
+            f"📝 분석된 블로그: {result['blogs_analyzed']}개\n\n"
+            f"*[분석 결과]*\n{analysis_msg}\n"
+            f"👇 *글에 포함할 토픽을 선택하세요*"
+        ),
+        reply_markup=reply_markup,
+        parse_mode='Markdown'
+    )
 
 
 async def toggle_topic(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
@@ -505,66 +681,19 @@ def escape_markdown(text: str) -> str:
     return text
 
 
-def extract_insight(paper: dict) -> str:
-    """논문에서 결론 추출 후 한글 번역 (전문 > 초록 순서로 시도)"""
-
-    # 1순위: PMC 전문의 결론
-    conclusion = paper.get("conclusion", "")
-    # 2순위: 초록
-    abstract = paper.get("abstract", "")
-
-    # 사용할 텍스트 결정
-    if conclusion and len(conclusion) > 50:
-        source_text = conclusion
-        source_type = "전문"
-    elif abstract:
-        source_text = abstract
-        source_type = "초록"
-    else:
-        return "내용 없음"
-
-    try:
-        from deep_translator import GoogleTranslator
-
-        # 마지막 2-3문장 추출 (결론 부분)
-        sentences = [s.strip() for s in source_text.replace('\n', ' ').split('. ') if s.strip()]
-
-        if len(sentences) >= 3:
-            insight_en = '. '.join(sentences[-3:])
-        elif len(sentences) >= 2:
-            insight_en = '. '.join(sentences[-2:])
-        else:
-            insight_en = sentences[-1] if sentences else source_text[:300]
-
-        if not insight_en.endswith('.'):
-            insight_en += '.'
+def extract_insights(papers: list) -> list:
+    """여러 논문의 인사이트 반환 (논문 레코드에 없거나 오래된 것만 저장소/배치 번역으로 생성)"""
+    compute_insights(papers)
+    return [paper.get('insight', "내용 없음") for paper in papers]
 
-        # 너무 길면 자르기 (번역 API 제한)
-        if len(insight_en) > 1000:
-            insight_en = insight_en[:1000]
 
-        # 한글로 번역
-        translator = GoogleTranslator(source='en', target='ko')
-        insight_kr = translator.translate(insight_en)
-
-        # 출처 표시
-        if paper.get("has_fulltext"):
-            prefix = "[전문]"
-        else:
-            prefix = "[초록]"
-
-        return f"{prefix} {insight_kr}" if insight_kr else f"{prefix} {insight_en}"
-
-    except Exception as e:
-        sentences = [s.strip() for s in source_text.replace('\n', ' ').split('. ') if s.strip()]
-        if len(sentences) >= 2:
-            return "[번역실패] " + '. '.join(sentences[-2:]) + '.'
-        return "[번역실패] " + (sentences[-1] + '.' if sentences else "추출 실패")
+def extract_insight(paper: dict) -> str:
+    """논문에서 결론 추출 후 한글 번역 (전문 > 초록 순서로 시도)"""
+    return extract_insights([paper])[0]
 
 
 async def search_papers_and_show(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
-    """논문 검색 후 결과 표시 (Hook 스타일 선택 전)"""
-    query = update.callback_query
+    """논문 검색 작업 등록 (결과 표시는 작업 완료 시, Hook 스타일 선택 전)"""
     user_id = update.effective_user.id
     chat_id = update.effective_chat.id
     session = get_session(user_id)
@@ -581,115 +710,220 @@ async def search_papers_and_show(update: Update, context: ContextTypes.DEFAULT_T
     )
     await loading.start()
 
-    try:
-        # PubMed 검색
-        await loading.update("*PubMed 논문 검색 중...*")
+    # 채택 논문 분석은 점수 평가 배치가 끝나는 대로 백그라운드에서 시작
+    close_pipeline(user_id)
+    pipeline = None
+    if Config.PIPELINE_ENABLED:
+        pipeline = AnalysisPipeline(session.keyword, list(session.selected_topics))
+        analysis_pipelines[user_id] = pipeline
+
+    get_job_manager().submit(
+        user_id, 'papers', _search_papers_job, session, pipeline,
+        on_progress=loading_progress(loading),
+        on_done=partial(_on_papers_done, bot=context.bot, chat_id=chat_id, session=session, loading=loading),
+        trace_id=session.session_id
+    )
+    return SEARCHING_PAPERS
 
-        searcher = PubMedSearcher(
-            email=Config.PUBMED_EMAIL,
-            api_key=Config.PUBMED_API_KEY
-        )
 
-        all_papers = []
-        search_queries_used = []  # 실제 사용된 검색 쿼리 기록
-
-        if session.selected_topics:
-            # 토픽이 선택된 경우: 키워드 + 토픽 조합 검색
-            for topic in list(session.selected_topics)[:5]:  # 최대 5개 토픽
-                # 토픽을 영어로 변환
-                topic_en = SmartTopicExtractor.KR_TO_EN.get(topic, topic)
-
-                # 토픽이 한글이면 번역 시도
-                if any('\uAC00' <= c <= '\uD7A3' for c in topic_en):  # 한글 포함 체크
-                    try:
-                        from deep_translator import GoogleTranslator
-                        translator = GoogleTranslator(source='ko', target='en')
-                        topic_en = translator.translate(topic)
-                    except:
-                        pass
-
-                query_str = f"{session.keyword_en} AND {topic_en}"
-                search_queries_used.append(query_str)
-                print(f"[PubMed 검색] {query_str}")
-
-                # 토픽당 30편씩 검색
-                papers = searcher.search_and_fetch(query_str, max_results=30)
-                all_papers.extend(papers)
+def _dedupe_papers(papers: List[Dict]) -> List[Dict]:
+    """PMID 기준 중복 제거 (순서 유지)"""
+    seen_pmids = set()
+    unique_papers = []
+    for paper in papers:
+        pmid = paper.get('pmid')
+        if pmid and pmid not in seen_pmids:
+            seen_pmids.add(pmid)
+            unique_papers.append(paper)
+    return unique_papers
+
+
+def _search_papers_job(job: Job, session: BlogBotSession, pipeline: AnalysisPipeline = None,
+                       refresh: bool = False) -> Dict:
+    """PubMed 검색 → PMC 전문 → Claude 점수 평가 → 인사이트 생성 (작업 스레드, refresh=True면 검색 웜 캐시 갱신)"""
+    # PubMed 검색
+    job.report("*PubMed 논문 검색 중...*")
+
+    searcher = PubMedSearcher(
+        email=Config.PUBMED_EMAIL,
+        api_key=Config.PUBMED_API_KEY
+    )
+
+    # 중단 후 /retry 시 이어서 진행할 수 있도록 단계 시작 기록
+    session.save_step("1_papers_searching")
+
+    # 인사이트 생성 단계 (논문이 도착하는 대로 백그라운드에서 번역)
+    insights = InsightStage()
+    try:
+        return _search_papers(job, session, searcher, insights, pipeline, refresh)
+    finally:
+        insights.close()
+
+
+def _search_and_fetch(searcher: PubMedSearcher, checkpoints: StageCheckpoints,
+                      query_str: str, max_results: int, refresh: bool = False) -> List[Dict]:
+    """PubMed 검색 (체크포인트에 완료된 쿼리 → 웜 캐시 → 새 검색 순)"""
+    with span('search', query=query_str, max_results=max_results) as s:
+        unit = f"{query_str}|{max_results}"
+        saved = checkpoints.get(unit)
+        if saved is not None:
+            print(f"[체크포인트] 검색 결과 재사용: {query_str}")
+            papers = get_paper_store().resolve(saved)
+            s.set(source='checkpoint', papers=len(papers))
+            return papers
+
+        warm_cache = get_warm_cache()
+        papers = None if refresh else warm_cache.get_search(query_str, max_results)
+        if papers is not None:
+            print(f"[웜 캐시] 검색 결과 재사용: {query_str}")
+            s.set(source='warm_cache')
         else:
-            # 토픽 선택 없이 키워드만으로 검색
-            query_str = session.keyword_en
+            try:
+                papers = searcher.search_and_fetch(query_str, max_results=max_results, raise_errors=True)
+            except PubMedError as e:
+                # 일시적 실패(시간 초과, 429 등)는 '결과 없음'이 아니므로 웜 캐시/체크포인트에 남기지 않음
+                print(f"[PubMed 검색 실패] {query_str}: {e}")
+                s.set(source='pubmed', error=type(e.__cause__ or e).__name__, papers=0)
+                return []
+            warm_cache.put_search(query_str, max_results, papers)
+            s.set(source='pubmed')
+        checkpoints.put(unit, get_paper_store().put_many(papers))
+        s.set(papers=len(papers))
+        return papers
+
+
+def _lookup_fulltext(pmc_fetcher: PMCFullTextFetcher, checkpoints: StageCheckpoints, pmid: str) -> Tuple[Dict, str]:
+    """
+    PMC 전문 조회 (체크포인트 → 웜 캐시 → PMC 순)
+
+    Returns:
+        (전문 정보 - 없으면 빈 dict, 출처 'checkpoint'/'warm_cache'/'pmc'/'error')
+        PMC가 '전문 없음'이라고 답한 결과만 빈 dict로 기록하고, 요청 실패는 기록하지 않음
+    """
+    saved = checkpoints.get(pmid)
+    if saved is not None:
+        return saved, 'checkpoint'
+
+    warm_cache = get_warm_cache()
+    cached = warm_cache.get_pmc(pmid)
+    if cached is not None:
+        checkpoints.put(pmid, cached)
+        return cached, 'warm_cache'
+
+    try:
+        fetched = pmc_fetcher.get_paper_with_fulltext(pmid, raise_errors=True)
+    except PMCError as e:
+        # 일시적 실패(시간 초과, 429 등)는 이번 실행에서만 전문 없음으로 처리
+        print(f"[PMC 요청 실패] {e}")
+        return {}, 'error'
+
+    fulltext_data = {}
+    if fetched:
+        fulltext_data = {k: fetched.get(k) for k in ('pmcid', 'conclusion', 'results')}
+    warm_cache.put_pmc(pmid, fulltext_data)
+    checkpoints.put(pmid, fulltext_data)
+    return fulltext_data, 'pmc'
+
+
+def _search_papers(job: Job, session: BlogBotSession, searcher: PubMedSearcher,
+                   insights: InsightStage, pipeline: AnalysisPipeline = None, refresh: bool = False) -> Dict:
+    """_search_papers_job 본체"""
+    search_checkpoints = StageCheckpoints(session.checkpoint_key, 'search')
+    pmc_checkpoints = StageCheckpoints(session.checkpoint_key, 'pmc')
+
+    all_papers = []
+    search_queries_used = []  # 실제 사용된 검색 쿼리 기록
+
+    if session.selected_topics:
+        # 토픽이 선택된 경우: 키워드 + 토픽 조합 검색
+        for topic in list(session.selected_topics)[:5]:  # 최대 5개 토픽
+            job.check_cancelled()
+
+            # 토픽을 영어로 변환
+            topic_en = SmartTopicExtractor.KR_TO_EN.get(topic, topic)
+
+            # 토픽이 한글이면 번역 시도
+            if any('\uAC00' <= c <= '\uD7A3' for c in topic_en):  # 한글 포함 체크
+                topic_en = get_translation_service().translate(topic, source='ko', target='en') or topic_en
+
+            query_str = f"{session.keyword_en} AND {topic_en}"
             search_queries_used.append(query_str)
-            print(f"[PubMed 검색] {query_str} (키워드만)")
+            print(f"[PubMed 검색] {query_str}")
 
-            # 키워드만으로 100편 검색
-            papers = searcher.search_and_fetch(query_str, max_results=100)
+            # 토픽당 30편씩 검색
+            papers = _search_and_fetch(searcher, search_checkpoints, query_str, 30, refresh)
             all_papers.extend(papers)
+    else:
+        # 토픽 선택 없이 키워드만으로 검색
+        query_str = session.keyword_en
+        search_queries_used.append(query_str)
+        print(f"[PubMed 검색] {query_str} (키워드만)")
 
-        # 검색 쿼리 세션에 저장
-        session.search_queries = search_queries_used
+        # 키워드만으로 100편 검색
+        papers = _search_and_fetch(searcher, search_checkpoints, query_str, 100, refresh)
+        all_papers.extend(papers)
 
-        # 중복 제거
-        seen_pmids = set()
-        unique_papers = []
-        for paper in all_papers:
-            pmid = paper.get('pmid')
-            if pmid and pmid not in seen_pmids:
-                seen_pmids.add(pmid)
-                unique_papers.append(paper)
-
-        # 논문이 5개 이하면 토픽 제외하고 키워드만으로 재검색
-        if len(unique_papers) <= 5 and session.selected_topics:
-            await loading.update(
-                f"⚠️ *토픽 조합 결과 {len(unique_papers)}편뿐*\n키워드만으로 재검색 중..."
-            )
+    # 검색 쿼리 세션에 저장
+    session.search_queries = search_queries_used
 
-            # 키워드만으로 재검색
-            query_str = session.keyword_en
-            search_queries_used = [f"{query_str} (키워드만 재검색)"]
-            print(f"[PubMed 재검색] {query_str} (토픽 결과 부족으로 키워드만)")
+    # 중복 제거
+    unique_papers = _dedupe_papers(all_papers)
 
-            all_papers = searcher.search_and_fetch(query_str, max_results=100)
+    # 논문이 5개 이하면 토픽 제외하고 키워드만으로 재검색
+    if len(unique_papers) <= 5 and session.selected_topics:
+        job.report(
+            f"⚠️ *토픽 조합 결과 {len(unique_papers)}편뿐*\n키워드만으로 재검색 중..."
+        )
 
-            # 중복 제거
-            seen_pmids = set()
-            unique_papers = []
-            for paper in all_papers:
-                pmid = paper.get('pmid')
-                if pmid and pmid not in seen_pmids:
-                    seen_pmids.add(pmid)
-                    unique_papers.append(paper)
+        # 키워드만으로 재검색
+        query_str = session.keyword_en
+        search_queries_used = [f"{query_str} (키워드만 재검색)"]
+        print(f"[PubMed 재검색] {query_str} (토픽 결과 부족으로 키워드만)")
 
-            session.search_queries = search_queries_used
+        all_papers = _search_and_fetch(searcher, search_checkpoints, query_str, 100, refresh)
+        unique_papers = _dedupe_papers(all_papers)
 
-        session.papers = unique_papers
+        session.search_queries = search_queries_used
 
-        # PMC에서 전문 가져오기 (상위 50편, 총 5분 제한)
-        import time
-        PMC_MAX_PAPERS = 50  # 상위 50편 PMC 검색
-        PMC_TIMEOUT_TOTAL = 300  # 전체 5분 제한
+    session.papers = unique_papers
 
-        papers_to_check = unique_papers[:PMC_MAX_PAPERS]
-        await loading.update(f"*논문 {len(unique_papers)}편 수집 완료!*\nPMC 전문 검색 중... (상위 {len(papers_to_check)}편)")
+    # PMC에서 전문 가져오기 (상위 50편, 총 5분 제한)
+    PMC_MAX_PAPERS = 50  # 상위 50편 PMC 검색
+    PMC_TIMEOUT_TOTAL = 300  # 전체 5분 제한
 
-        pmc_fetcher = PMCFullTextFetcher(
-            email=Config.PUBMED_EMAIL,
-            api_key=Config.PUBMED_API_KEY
-        )
+    # 나머지 논문은 전문 없음으로 표시 → 초록 기준 인사이트 바로 생성
+    for paper in unique_papers[PMC_MAX_PAPERS:]:
+        paper["has_fulltext"] = False
+    insights.submit(unique_papers[PMC_MAX_PAPERS:])
+
+    papers_to_check = unique_papers[:PMC_MAX_PAPERS]
+    job.report(f"*논문 {len(unique_papers)}편 수집 완료!*\nPMC 전문 검색 중... (상위 {len(papers_to_check)}편)")
+
+    pmc_fetcher = PMCFullTextFetcher(
+        email=Config.PUBMED_EMAIL,
+        api_key=Config.PUBMED_API_KEY
+    )
 
-        fulltext_count = 0
-        pmc_start = time.time()
+    fulltext_count = 0
+    pmc_start = time.time()
 
+    with span('pmc.stage', papers=len(papers_to_check)) as pmc_span:
+        warm_hits = 0
         for i, paper in enumerate(papers_to_check):
+            job.check_cancelled()
+
             # 전체 타임아웃 체크
             elapsed = int(time.time() - pmc_start)
             if elapsed > PMC_TIMEOUT_TOTAL:
-                await loading.update(f"⏱️ PMC 검색 타임아웃 ({elapsed}초)\n전문 {fulltext_count}편 확보")
+                job.report(f"⏱️ PMC 검색 타임아웃 ({elapsed}초)\n전문 {fulltext_count}편 확보")
                 break
 
             try:
                 pmid = paper.get('pmid')
                 if pmid:
-                    fulltext_data = pmc_fetcher.get_paper_with_fulltext(pmid)
+                    fulltext_data, source = _lookup_fulltext(pmc_fetcher, pmc_checkpoints, pmid)
+                    if source == 'warm_cache':
+                        warm_hits += 1
                     if fulltext_data:
                         paper["has_fulltext"] = True
                         paper["pmcid"] = fulltext_data.get("pmcid")
@@ -702,187 +936,211 @@ async def search_papers_and_show(update: Update, context: ContextTypes.DEFAULT_T
                 paper["has_fulltext"] = False
                 print(f"[PMC 오류] PMID {paper.get('pmid')}: {e}")
 
+            # 전문 확인이 끝난 논문부터 인사이트 생성
+            insights.submit([paper])
+
             # 5개마다 진행 상황 업데이트
             if (i + 1) % 5 == 0:
                 elapsed = int(time.time() - pmc_start)
-                await loading.update(
+                job.report(
                     f"*PMC 전문 검색 중...*\n({i+1}/{len(papers_to_check)}) 전문: {fulltext_count}편 ({elapsed}초)"
                 )
+        pmc_span.set(fulltext=fulltext_count, checkpoint_hits=pmc_checkpoints.reused, cache_hits=warm_hits)
 
-        # 나머지 논문은 전문 없음으로 표시
-        for paper in unique_papers[PMC_MAX_PAPERS:]:
+    # 타임아웃으로 전문 확인을 못 한 논문
+    for paper in papers_to_check:
+        if "has_fulltext" not in paper:
             paper["has_fulltext"] = False
+    insights.submit([p for p in papers_to_check if not p.get('insight')])
 
-        session.papers = unique_papers
+    session.papers = unique_papers
 
-        # Claude CLI로 관련성 점수 평가 (타임아웃 적용)
-        await loading.update("*Claude가 관련성 점수 평가 중...*\n75점 이상만 채택됩니다 (최대 3분)")
+    # Claude CLI로 관련성 점수 평가 (타임아웃 적용)
+    job.report("*Claude가 관련성 점수 평가 중...*\n75점 이상만 채택됩니다 (최대 3분)")
 
+    try:
+        claude_start = time.time()
+        future = _timed_executor.submit(
+            bind(score_papers_with_claude),
+            unique_papers,
+            session.keyword,
+            session.keyword_en,
+            list(session.selected_topics),
+            pipeline.submit if pipeline else None
+        )
         try:
-            import concurrent.futures
-            claude_start = time.time()
-            with concurrent.futures.ThreadPoolExecutor() as executor:
-                future = executor.submit(
-                    score_papers_with_claude,
-                    unique_papers,
-                    session.keyword,
-                    session.keyword_en,
-                    list(session.selected_topics)
-                )
-                try:
-                    accepted_papers, rejected_papers = future.result(timeout=180)  # 3분 타임아웃
-                except concurrent.futures.TimeoutError:
-                    await loading.update("⚠️ Claude 점수 평가 타임아웃 - 전체 논문 사용")
-                    accepted_papers = unique_papers
-                    rejected_papers = []
-
-            claude_elapsed = int(time.time() - claude_start)
-            print(f"[Claude 점수평가] {claude_elapsed}초, 채택: {len(accepted_papers)}편")
-
-        except Exception as e:
-            print(f"[Claude 점수평가 오류] {e}")
-            await loading.update(f"⚠️ Claude 점수 평가 실패: {str(e)[:100]}")
+            accepted_papers, rejected_papers = future.result(timeout=180)  # 3분 타임아웃
+        except FutureTimeoutError:
+            job.report("⚠️ Claude 점수 평가 타임아웃 - 전체 논문 사용")
             accepted_papers = unique_papers
             rejected_papers = []
 
-        session.papers = accepted_papers if accepted_papers else unique_papers  # 채택된 논문만 저장
+        claude_elapsed = int(time.time() - claude_start)
+        print(f"[Claude 점수평가] {claude_elapsed}초, 채택: {len(accepted_papers)}편")
 
-        # 전문 통계 계산
-        fulltext_papers = [p for p in session.papers if p.get('has_fulltext')]
+    except Exception as e:
+        print(f"[Claude 점수평가 오류] {e}")
+        job.report(f"⚠️ Claude 점수 평가 실패: {str(e)[:100]}")
+        accepted_papers = unique_papers
+        rejected_papers = []
 
-        # 검색 쿼리 표시 (최대 3개)
-        queries_display = "\n".join([f"  • {q}" for q in session.search_queries[:3]])
-        if len(session.search_queries) > 3:
-            queries_display += f"\n  ...외 {len(session.search_queries)-3}개"
+    session.papers = accepted_papers if accepted_papers else unique_papers  # 채택된 논문만 저장
 
-        # 세션 저장 (논문 검색 완료)
-        session.save_to_file("2_papers_searched")
+    # 세션 저장 (논문 검색 완료) - 단계 내부 체크포인트는 더 이상 필요 없음
+    session.save_step("2_papers_searched")
+    if search_checkpoints.reused or pmc_checkpoints.reused:
+        print(f"[체크포인트] 검색 {search_checkpoints.reused}건, PMC {pmc_checkpoints.reused}편 재사용")
+    search_checkpoints.clear()
+    pmc_checkpoints.clear()
 
-        # 로딩 종료
-        await loading.delete()
+    # 인사이트는 검색/전문 수집 중 미리 생성됨 - 남은 것만 마무리
+    try:
+        insights.wait(unique_papers)
+    except Exception as e:
+        print(f"[인사이트 생성 오류] {e}")
 
-        # 첫 번째 메시지: 요약 정보
-        header_msg = (
-            f"📚 *논문 검색 완료!*\n\n"
-            f"━━━━━━━━━━━━━━━━━━━━━\n"
-            f"📌 키워드: {session.keyword} ({session.keyword_en})\n"
-            f"🏷️ 선택 토픽: {', '.join(list(session.selected_topics))}\n"
-            f"📄 수집 논문: {len(unique_papers)}편\n"
-            f"✅ *채택 논문: {len(accepted_papers)}편* (75점 이상)\n"
-            f"❌ 미채택: {len(rejected_papers)}편\n"
-            f"📗 전문 확보: {len(fulltext_papers)}편\n"
-            f"━━━━━━━━━━━━━━━━━━━━━\n\n"
-            f"🔍 *실제 검색 쿼리:*\n{queries_display}\n\n"
-            f"📗 = 전문 | 📄 = 초록 | 🎯 = 관련성 점수\n\n"
-            f"📑 *채택된 논문 목록:*\n"
-        )
+    return {
+        'unique_count': len(unique_papers),
+        'fulltext_count': fulltext_count,
+        'accepted_count': len(accepted_papers),
+        'rejected_count': len(rejected_papers),
+    }
 
-        await context.bot.send_message(chat_id=chat_id, text=header_msg, parse_mode='Markdown')
 
-        # 진행 상황 메시지
-        progress_msg = await context.bot.send_message(
-            chat_id=chat_id,
-            text=f"📖 논문 분석 중... (0/{len(unique_papers)})"
+# 논문 목록 보기 설정
+PAPER_PAGE_SIZE = 8               # 페이지당 논문 수
+PAPER_SCORE_FILTERS = (0, 80, 90)  # 점수 필터 순환 (0 = 전체)
+
+
+def _filtered_papers(session: BlogBotSession) -> List[tuple]:
+    """보기 필터 적용 → [(원래 번호, 논문)]"""
+    view = session.paper_view
+    result = []
+    for i, paper in enumerate(session.papers, 1):
+        if view.get('fulltext_only') and not paper.get('has_fulltext'):
+            continue
+        score = paper.get('관련성점수')
+        if view.get('min_score') and (score is None or score < view['min_score']):
+            continue
+        result.append((i, paper))
+    return result
+
+
+def render_paper_page(session: BlogBotSession):
+    """세션 논문 목록의 현재 페이지 → (메시지 텍스트, 인라인 키보드)"""
+    view = session.paper_view
+    papers = _filtered_papers(session)
+    total_pages = max(1, (len(papers) + PAPER_PAGE_SIZE - 1) // PAPER_PAGE_SIZE)
+    page = min(max(view.get('page', 0), 0), total_pages - 1)
+    view['page'] = page
+
+    filters_desc = []
+    if view.get('fulltext_only'):
+        filters_desc.append("전문만")
+    if view.get('min_score'):
+        filters_desc.append(f"{view['min_score']}점 이상")
+    header = f"📑 논문 목록 ({len(papers)}/{len(session.papers)}편"
+    header += f", {' · '.join(filters_desc)})" if filters_desc else ")"
+
+    lines = [header, f"페이지 {page + 1}/{total_pages}", ""]
+    for i, paper in papers[page * PAPER_PAGE_SIZE:(page + 1) * PAPER_PAGE_SIZE]:
+        title = paper.get('title', '제목 없음')
+        journal = paper.get('journal', '저널 미상')
+        year = paper.get('year', '연도 미상')
+        relevance_score = paper.get('관련성점수')
+
+        # 전문 여부 표시
+        fulltext_marker = "📗" if paper.get('has_fulltext') else "📄"
+
+        # 관련성 점수 표시 (0점도 표시)
+        score_display = f"🎯{relevance_score}점" if relevance_score is not None else ""
+
+        lines.append(
+            f"{fulltext_marker} {i}. [{score_display}] {title}\n"
+            f"   📰 {journal}, {year}\n"
+            f"   💡 {paper.get('insight', '내용 없음')}\n"
         )
+    if not papers:
+        lines.append("조건에 맞는 논문이 없습니다.")
 
-        paper_messages = []
-        current_msg = ""
-
-        for i, paper in enumerate(unique_papers, 1):
-            # 진행 상황 업데이트 (10개마다)
-            if i % 10 == 0:
-                try:
-                    await progress_msg.edit_text(f"📖 논문 분석 중... ({i}/{len(unique_papers)})")
-                except:
-                    pass
-
-            title = paper.get('title', '제목 없음')
-            journal = paper.get('journal', '저널 미상')
-            year = paper.get('year', '연도 미상')
-            has_fulltext = paper.get('has_fulltext', False)
-            relevance_score = paper.get('관련성점수')
-            score_reason = paper.get('점수근거', '')
-
-            try:
-                insight = extract_insight(paper)
-            except Exception as e:
-                insight = "번역 실패"
-
-            # 전문 여부 표시
-            fulltext_marker = "📗" if has_fulltext else "📄"
-
-            # 관련성 점수 표시 (0점도 표시)
-            score_display = f"🎯{relevance_score}점" if relevance_score is not None else ""
-
-            # 전문 여부에 따라 다른 아이콘 표시
-            paper_text = (
-                f"{fulltext_marker} {i}. [{score_display}] {title}\n"
-                f"   📰 {journal}, {year}\n"
-                f"   💡 {insight}\n\n"
-            )
-
-            # 메시지 길이 체크 (3500자 넘으면 분리)
-            if len(current_msg) + len(paper_text) > 3500:
-                paper_messages.append(current_msg)
-                current_msg = paper_text
-            else:
-                current_msg += paper_text
+    text = "\n".join(lines)
+    if len(text) > 4000:
+        text = text[:4000] + "..."
 
-        if current_msg:
-            paper_messages.append(current_msg)
+    # 페이지 이동
+    nav = []
+    if page > 0:
+        nav.append(InlineKeyboardButton("◀ 이전", callback_data=f"papers:PAGE:{page - 1}"))
+    nav.append(InlineKeyboardButton(f"{page + 1}/{total_pages}", callback_data="papers:NOOP"))
+    if page < total_pages - 1:
+        nav.append(InlineKeyboardButton("다음 ▶", callback_data=f"papers:PAGE:{page + 1}"))
 
-        # 진행 메시지 삭제
-        try:
-            await progress_msg.delete()
-        except:
-            pass
+    # 필터 (같은 메시지에서 전환)
+    fulltext_label = "📗 전문만 ✓" if view.get('fulltext_only') else "📗 전문만"
+    score_label = f"🎯 {view['min_score']}점+ ✓" if view.get('min_score') else "🎯 점수 필터"
 
-        # 논문 목록 메시지들 전송 (Markdown 없이 일반 텍스트)
-        for msg in paper_messages:
-            try:
-                await context.bot.send_message(
-                    chat_id=chat_id,
-                    text=msg
-                )
-            except Exception as e:
-                # 실패시 짧게 잘라서 재시도
-                await context.bot.send_message(
-                    chat_id=chat_id,
-                    text=msg[:4000] + "..."
-                )
+    keyboard = [
+        nav,
+        [
+            InlineKeyboardButton(fulltext_label, callback_data="papers:FULLTEXT"),
+            InlineKeyboardButton(score_label, callback_data="papers:SCORE"),
+        ],
+        [InlineKeyboardButton("✅ 논문 확인 완료, 도입부 스타일 선택", callback_data="papers:CONFIRM")],
+    ]
+    return text, InlineKeyboardMarkup(keyboard)
 
-        # 마지막: 확인 버튼
-        keyboard = [
-            [InlineKeyboardButton("✅ 논문 확인 완료, 도입부 스타일 선택", callback_data="papers:CONFIRM")]
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
 
-        await context.bot.send_message(
-            chat_id=chat_id,
-            text=(
-                f"━━━━━━━━━━━━━━━━━━━━━\n"
-                f"총 *{len(session.papers)}편*의 논문을 수집했습니다.\n\n"
-                f"위 논문들을 기반으로 블로그를 작성합니다.\n"
-                f"확인 후 도입부 스타일을 선택해주세요."
-            ),
-            reply_markup=reply_markup,
-            parse_mode='Markdown'
-        )
+async def _on_papers_done(job: Job, bot, chat_id: int, session: BlogBotSession, loading: LoadingIndicator):
+    """논문 검색 완료 - 요약, 논문 목록, 확인 버튼 전송"""
+    # 로딩 종료
+    await loading.delete()
 
-        return SEARCHING_PAPERS
+    if job.state == Job.CANCELLED:
+        return
 
-    except Exception as e:
-        # 로딩 종료
-        await loading.delete()
-        await context.bot.send_message(
+    if job.state == Job.FAILED:
+        await bot.send_message(
             chat_id=chat_id,
             text=(
                 f"❌ 논문 검색 중 오류가 발생했습니다.\n\n"
-                f"오류: {str(e)}\n\n"
+                f"오류: {str(job.error)}\n\n"
                 "/start 로 다시 시작해주세요."
             )
         )
-        return ConversationHandler.END
+        return
+
+    result = job.result
+
+    # 전문 통계 계산
+    fulltext_papers = [p for p in session.papers if p.get('has_fulltext')]
+
+    # 검색 쿼리 표시 (최대 3개)
+    queries_display = "\n".join([f"  • {q}" for q in session.search_queries[:3]])
+    if len(session.search_queries) > 3:
+        queries_display += f"\n  ...외 {len(session.search_queries)-3}개"
+
+    # 첫 번째 메시지: 요약 정보
+    header_msg = (
+        f"📚 *논문 검색 완료!*\n\n"
+        f"━━━━━━━━━━━━━━━━━━━━━\n"
+        f"📌 키워드: {session.keyword} ({session.keyword_en})\n"
+        f"🏷️ 선택 토픽: {', '.join(list(session.selected_topics))}\n"
+        f"📄 수집 논문: {result['unique_count']}편\n"
+        f"✅ *채택 논문: {result['accepted_count']}편* (75점 이상)\n"
+        f"❌ 미채택: {result['rejected_count']}편\n"
+        f"📗 전문 확보: {len(fulltext_papers)}편\n"
+        f"━━━━━━━━━━━━━━━━━━━━━\n\n"
+        f"🔍 *실제 검색 쿼리:*\n{queries_display}\n\n"
+        f"📗 = 전문 | 📄 = 초록 | 🎯 = 관련성 점수\n\n"
+        f"아래 목록에서 *{len(session.papers)}편*의 채택 논문을 확인한 뒤 도입부 스타일을 선택해주세요."
+    )
+
+    await bot.send_message(chat_id=chat_id, text=header_msg, parse_mode='Markdown')
+
+    # 논문 목록: 메시지 하나를 보내고 페이지 이동/필터는 같은 메시지를 수정
+    session.paper_view = {'page': 0, 'fulltext_only': False, 'min_score': 0}
+    text, reply_markup = render_paper_page(session)
+    await bot.send_message(chat_id=chat_id, text=text, reply_markup=reply_markup)
 
 
 async def handle_paper_result(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
@@ -895,6 +1153,28 @@ async def handle_paper_result(update: Update, context: ContextTypes.DEFAULT_TYPE
     if action == "CONFIRM":
         return await show_hook_styles(update, context)
 
+    # 목록 페이지 이동 / 필터 전환 (같은 메시지 수정)
+    session = get_session(update.effective_user.id)
+    view = session.paper_view
+    if action.startswith("PAGE:"):
+        view['page'] = int(action.split(":", 1)[1])
+    elif action == "FULLTEXT":
+        view['fulltext_only'] = not view.get('fulltext_only')
+        view['page'] = 0
+    elif action == "SCORE":
+        current = view.get('min_score', 0)
+        idx = PAPER_SCORE_FILTERS.index(current) if current in PAPER_SCORE_FILTERS else 0
+        view['min_score'] = PAPER_SCORE_FILTERS[(idx + 1) % len(PAPER_SCORE_FILTERS)]
+        view['page'] = 0
+    else:
+        return SEARCHING_PAPERS
+
+    text, reply_markup = render_paper_page(session)
+    try:
+        await query.edit_message_text(text=text, reply_markup=reply_markup)
+    except TelegramError as e:
+        _log_send_error(e)
+
     return SEARCHING_PAPERS
 
 
@@ -962,7 +1242,7 @@ async def select_hook_style(update: Update, context: ContextTypes.DEFAULT_TYPE)
     style_info = HOOK_STYLES[style_id]
 
     # 세션 저장 (스타일 선택 완료)
-    session.save_to_file("3_style_selected")
+    session.save_step("3_style_selected")
 
     # 초안 생성 확인 (논문은 이미 검색되어 있음)
     keyboard = [
@@ -1003,6 +1283,7 @@ async def confirm_generation(update: Update, context: ContextTypes.DEFAULT_TYPE)
     action = query.data.replace("confirm:", "")
 
     if action == "CANCEL":
+        cancel_user_jobs(user_id)
         await query.edit_message_text(
             "❌ 취소되었습니다.\n\n"
             "/start 로 다시 시작할 수 있습니다."
@@ -1031,139 +1312,191 @@ async def confirm_generation(update: Update, context: ContextTypes.DEFAULT_TYPE)
         )
 
         # 세션 저장 (블로그 생성 시작 전)
-        session.save_to_file("4_generation_started")
-
-        # 로딩 표시 시작
-        loading = LoadingIndicator(
-            context.bot,
-            chat_id,
+        session.save_step("4_generation_started")
+
+        # 디버그 로깅
+        print(f"[TG DEBUG] keyword={session.keyword}")
+        print(f"[TG DEBUG] topics={list(session.selected_topics)}")
+        print(f"[TG DEBUG] papers={len(session.papers)}편")
+        print(f"[TG DEBUG] hook_style={session.hook_style}")
+        if session.papers:
+            print(f"[TG DEBUG] 첫 논문: {session.papers[0].get('title', 'N/A')[:50]}")
+
+        await enqueue_blog_generation(
+            context, user_id, chat_id, session, style_info,
             "*논문 분석 및 블로그 생성 중...*\nClaude가 논문을 분석하고 HTML을 생성합니다."
         )
-        await loading.start()
+        return ConversationHandler.END
 
+
+async def enqueue_blog_generation(context: ContextTypes.DEFAULT_TYPE, user_id: int, chat_id: int,
+                                  session: BlogBotSession, style_info: Dict, loading_message: str) -> Job:
+    """블로그 생성 작업 등록 (결과 파일은 작업 완료 시 전송)"""
+    # 로딩 표시 시작
+    loading = LoadingIndicator(context.bot, chat_id, loading_message)
+    await loading.start()
+
+    # 세션 데이터 구성
+    session_data = {
+        'keyword': session.keyword,
+        'keyword_en': session.keyword_en,
+        'topics': list(session.selected_topics),
+        'hook_style': session.hook_style,
+        'hook_style_name': style_info['name'],
+        'hook_style_desc': style_info['desc'],
+        'hook_style_template': style_info.get('template', ''),
+        'papers': session.papers,
+    }
+
+    # 스타일 선택 중 미리 진행된 논문 분석 (작업에서 남은 분석만 대기)
+    pipeline = analysis_pipelines.pop(user_id, None)
+
+    # 스트리밍 중 미리보기 표시
+    preview = StreamPreview(context.bot, chat_id, asyncio.get_running_loop())
+
+    return get_job_manager().submit(
+        user_id, 'blog', _generate_blog_job, session_data, pipeline, preview,
+        checkpoint_key=session.checkpoint_key,
+        on_progress=loading_progress(loading),
+        on_done=partial(_on_blog_done, bot=context.bot, chat_id=chat_id, session=session,
+                        style_info=style_info, loading=loading, preview=preview),
+        trace_id=session.session_id
+    )
+
+
+def _generate_blog_job(job: Job, session_data: Dict, pipeline: AnalysisPipeline, preview: StreamPreview,
+                       checkpoint_key: str = None) -> str:
+    """미리 분석된 결과 수집 → 블로그 자동 생성 (작업 스레드)"""
+    checkpoints = StageCheckpoints(checkpoint_key, 'blog') if checkpoint_key else None
+
+    # 이전 실행에서 분석 단계까지 끝났으면 HTML 생성부터
+    saved_analysis = checkpoints.get('analysis') if checkpoints else None
+    if saved_analysis:
+        print(f"[체크포인트] 논문 분석 결과 재사용 ({len(saved_analysis)}자)")
+        session_data['analysis_result'] = saved_analysis
+        if pipeline:
+            pipeline.close()
+            pipeline = None
+
+    if pipeline:
         try:
-            # 세션 데이터 구성
-            session_data = {
-                'keyword': session.keyword,
-                'keyword_en': session.keyword_en,
-                'topics': list(session.selected_topics),
-                'hook_style': session.hook_style,
-                'hook_style_name': style_info['name'],
-                'hook_style_desc': style_info['desc'],
-                'hook_style_template': style_info['template'],
-                'papers': session.papers,
-            }
-
-            # 디버그 로깅
-            print(f"[TG DEBUG] keyword={session.keyword}")
-            print(f"[TG DEBUG] topics={list(session.selected_topics)}")
-            print(f"[TG DEBUG] papers={len(session.papers)}편")
-            print(f"[TG DEBUG] hook_style={session.hook_style}")
-            if session.papers:
-                print(f"[TG DEBUG] 첫 논문: {session.papers[0].get('title', 'N/A')[:50]}")
-
-            # 자동 블로그 생성 (별도 스레드에서 실행)
-            import asyncio
-            from concurrent.futures import ThreadPoolExecutor
-
-            # 진행 상황 업데이트 함수
-            async def update_progress(step: int, message: str):
-                try:
-                    await context.bot.send_message(
-                        chat_id=chat_id,
-                        text=f"⏳ *{step}단계:* {message}",
-                        parse_mode='Markdown'
-                    )
-                except:
-                    pass
-
-            # 블로그 생성 실행
-            loop = asyncio.get_event_loop()
-            with ThreadPoolExecutor() as executor:
-                html_path = await loop.run_in_executor(
-                    executor,
-                    generate_blog_auto,
-                    session_data,
-                    "output"
-                )
+            done, total = pipeline.progress()
+            print(f"[파이프라인] 분석 {done}/{total}편 완료 상태에서 생성 시작")
+            analysis_result = pipeline.collect(session_data['papers'])
+        finally:
+            pipeline.close()
+        if analysis_result:
+            session_data['analysis_result'] = analysis_result
+
+    job.check_cancelled()
+    on_analysis = partial(checkpoints.put, 'analysis') if checkpoints else None
+    filepath = generate_blog_auto(session_data, "output", preview.push, on_analysis=on_analysis, error_log=job.log)
+    if filepath and checkpoints:
+        checkpoints.clear()
+    return filepath
+
+
+# 단계별 히스토그램 파일 (웹훅 워커는 워커별 파일 - build_application에서 설정)
+_histogram_path = os.path.join(Config.TRACE_DIR, 'stages.json')
+
+
+def export_session_trace(session: BlogBotSession):
+    """세션의 단계 기록을 Chrome trace JSON으로 저장하고 단계별 히스토그램 갱신"""
+    tracer = get_tracer()
+    if not tracer.enabled:
+        return
+    try:
+        path = tracer.export_chrome_trace(
+            os.path.join(Config.TRACE_DIR, f"{session.session_id}.json"), session.session_id
+        )
+        tracer.export_histograms(_histogram_path)
+        print(f"[추적] 세션 trace 저장: {path}")
+    except OSError as e:
+        print(f"[추적] trace 저장 실패: {e}")
 
-            # 로딩 종료
-            await loading.delete()
-
-            if html_path and os.path.exists(html_path):
-                # 성공 - HTML 파일 전송
-                await context.bot.send_message(
-                    chat_id=chat_id,
-                    text=(
-                        f"✅ *블로그 생성 완료!*\n\n"
-                        f"━━━━━━━━━━━━━━━━━━━━━\n"
-                        f"📌 키워드: {session.keyword}\n"
-                        f"🏷️ 토픽: {', '.join(list(session.selected_topics)[:3])}\n"
-                        f"📄 참고 논문: {len(session.papers)}편\n"
-                        f"✍️ 스타일: {style_info['name']}\n"
-                        f"━━━━━━━━━━━━━━━━━━━━━\n\n"
-                        f"📁 HTML 파일을 전송합니다..."
-                    ),
-                    parse_mode='Markdown'
-                )
 
-                # HTML 파일 전송
-                with open(html_path, 'rb') as f:
-                    await context.bot.send_document(
-                        chat_id=chat_id,
-                        document=f,
-                        filename=os.path.basename(html_path),
-                        caption=f"📝 {session.keyword} 블로그 HTML\n네이버 블로그에 HTML 모드로 붙여넣기 하세요!"
-                    )
-
-                # HTML 미리보기 (일부)
-                with open(html_path, 'r', encoding='utf-8') as f:
-                    html_preview = f.read()[:500] + "..."
-
-                await context.bot.send_message(
-                    chat_id=chat_id,
-                    text=f"📄 *HTML 미리보기:*\n```html\n{html_preview}\n```\n\n/start 로 새 블로그 작성",
-                    parse_mode='Markdown'
-                )
+async def _on_blog_done(job: Job, bot, chat_id: int, session: BlogBotSession, style_info: Dict,
+                        loading: LoadingIndicator, preview: StreamPreview):
+    """블로그 생성 완료 - HTML 파일 또는 에러 로그 전송"""
+    # 로딩 종료
+    await loading.delete()
+    await preview.delete()
+    export_session_trace(session)
 
-            else:
-                # 실패 - 에러 로그 표시
-                error_logs = get_last_error_log()
-                error_text = "\n".join(error_logs[-10:]) if error_logs else "알 수 없는 오류"
-
-                await context.bot.send_message(
-                    chat_id=chat_id,
-                    text=(
-                        f"❌ *블로그 생성 실패*\n\n"
-                        f"논문: {len(session.papers)}편\n"
-                        f"토픽: {', '.join(list(session.selected_topics)[:3]) if session.selected_topics else '없음'}\n\n"
-                        f"📋 *에러 로그:*\n```\n{error_text[:1500]}\n```\n\n"
-                        f"/start 로 새 블로그 작성"
-                    ),
-                    parse_mode='Markdown'
-                )
+    if job.state == Job.CANCELLED:
+        return
 
-            return ConversationHandler.END
+    if job.state == Job.FAILED:
+        _BLOGS_GENERATED.inc(result='failed')
+        # 에러 로그 포함 (이 작업의 로그만)
+        error_text = "\n".join(job.log[-5:])
 
-        except Exception as e:
-            # 로딩 종료
-            await loading.delete()
+        await bot.send_message(
+            chat_id=chat_id,
+            text=(
+                f"❌ 블로그 생성 중 오류가 발생했습니다.\n\n"
+                f"오류: {str(job.error)}\n\n"
+                f"📋 로그:\n```\n{error_text[:1000]}\n```\n\n"
+                "/start 로 다시 시작해주세요."
+            ),
+            parse_mode='Markdown'
+        )
+        return
+
+    html_path = job.result
 
-            # 에러 로그 포함
-            error_logs = get_last_error_log()
-            error_text = "\n".join(error_logs[-5:]) if error_logs else ""
+    _BLOGS_GENERATED.inc(result='ok' if html_path and os.path.exists(html_path) else 'failed')
+    if html_path and os.path.exists(html_path):
+        # 성공 - HTML 파일 전송
+        await bot.send_message(
+            chat_id=chat_id,
+            text=(
+                f"✅ *블로그 생성 완료!*\n\n"
+                f"━━━━━━━━━━━━━━━━━━━━━\n"
+                f"📌 키워드: {session.keyword}\n"
+                f"🏷️ 토픽: {', '.join(list(session.selected_topics)[:3])}\n"
+                f"📄 참고 논문: {len(session.papers)}편\n"
+                f"✍️ 스타일: {style_info['name']}\n"
+                f"━━━━━━━━━━━━━━━━━━━━━\n\n"
+                f"📁 HTML 파일을 전송합니다..."
+            ),
+            parse_mode='Markdown'
+        )
 
-            await context.bot.send_message(
+        # HTML 파일 전송
+        with open(html_path, 'rb') as f:
+            await bot.send_document(
                 chat_id=chat_id,
-                text=(
-                    f"❌ 블로그 생성 중 오류가 발생했습니다.\n\n"
-                    f"오류: {str(e)}\n\n"
-                    f"📋 로그:\n```\n{error_text[:1000]}\n```\n\n"
-                    "/start 로 다시 시작해주세요."
-                ),
-                parse_mode='Markdown'
+                document=f,
+                filename=os.path.basename(html_path),
+                caption=f"📝 {session.keyword} 블로그 HTML\n네이버 블로그에 HTML 모드로 붙여넣기 하세요!"
             )
-            return ConversationHandler.END
+
+        # HTML 미리보기 (일부)
+        with open(html_path, 'r', encoding='utf-8') as f:
+            html_preview = f.read()[:500] + "..."
+
+        await bot.send_message(
+            chat_id=chat_id,
+            text=f"📄 *HTML 미리보기:*\n```html\n{html_preview}\n```\n\n/start 로 새 블로그 작성",
+            parse_mode='Markdown'
+        )
+
+    else:
+        # 실패 - 에러 로그 표시
+        error_text = "\n".join(job.log[-10:]) or "알 수 없는 오류"
+
+        await bot.send_message(
+            chat_id=chat_id,
+            text=(
+                f"❌ *블로그 생성 실패*\n\n"
+                f"논문: {len(session.papers)}편\n"
+                f"토픽: {', '.join(list(session.selected_topics)[:3]) if session.selected_topics else '없음'}\n\n"
+                f"📋 *에러 로그:*\n```\n{error_text[:1500]}\n```\n\n"
+                f"/start 로 새 블로그 작성"
+            ),
+            parse_mode='Markdown'
+        )
 
 
 def generate_blog_html(session: BlogBotSession) -> str:
@@ -1442,10 +1775,12 @@ def generate_intro_by_style(session: BlogBotSession) -> str:
 
 
 async def cancel(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
-    """대화 취소"""
+    """대화 취소 (진행 중인 백그라운드 작업도 중단)"""
+    cancelled = cancel_user_jobs(update.effective_user.id)
     await update.message.reply_text(
         "❌ 취소되었습니다.\n\n"
-        "/start 로 다시 시작할 수 있습니다."
+        + (f"진행 중이던 작업 {cancelled}개를 중단했습니다.\n" if cancelled else "")
+        + "/start 로 다시 시작할 수 있습니다."
     )
     return ConversationHandler.END
 
@@ -1461,6 +1796,7 @@ async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
         "5️⃣ 도입부 스타일 선택\n"
         "6️⃣ 블로그 생성 및 다운로드\n\n"
         "/retry - 이전 세션 이어서 진행\n"
+        "/prefetch - 인기 키워드 사전 수집 결과\n"
         "/cancel - 진행 중인 작업 취소\n"
         "/help - 이 도움말 보기",
         parse_mode='Markdown'
@@ -1470,7 +1806,7 @@ async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
 async def retry_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     """저장된 세션 목록 표시 및 재시도"""
     user_id = update.effective_user.id
-    sessions = BlogBotSession.list_saved_sessions()
+    sessions = BlogBotSession.list_saved_sessions(user_id)
 
     if not sessions:
         await update.message.reply_text(
@@ -1484,6 +1820,7 @@ async def retry_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> i
     for i, s in enumerate(sessions[:5]):  # 최대 5개
         step_name = {
             '1_keyword_analyzed': '키워드분석',
+            '1_papers_searching': '논문검색중단',
             '2_papers_searched': '논문검색완료',
             '3_style_selected': '스타일선택',
             '4_generation_started': '생성시작'
@@ -1531,11 +1868,13 @@ async def handle_retry_selection(update: Update, context: ContextTypes.DEFAULT_T
             return ConversationHandler.END
 
         selected = sessions[idx]
-        filepath = selected['filepath']
 
-        # 세션 불러오기
-        session = BlogBotSession.load_from_file(filepath)
-        user_sessions[user_id] = session
+        # 세션 불러오기 (본인 세션만)
+        session = BlogBotSession.load(user_id, selected['session_id'])
+        if session is None:
+            await query.edit_message_text("❌ 세션을 찾을 수 없습니다.\n\n/start 로 새로 시작하세요.")
+            return ConversationHandler.END
+        user_sessions.put(user_id, session)
 
         step = selected['step']
 
@@ -1554,6 +1893,21 @@ async def handle_retry_selection(update: Update, context: ContextTypes.DEFAULT_T
             # 블로그 생성 시작
             return await _generate_blog_from_session(update, context, session)
 
+        elif step == '1_papers_searching':
+            # 논문 검색 도중 중단: 완료된 검색 쿼리/PMC 조회/점수 평가 배치는 재사용하며 이어서 진행
+            checkpoints = get_checkpoint_store()
+            done_queries = checkpoints.count(session.checkpoint_key, 'search')
+            done_pmc = checkpoints.count(session.checkpoint_key, 'pmc')
+            await query.edit_message_text(
+                f"✅ *세션 불러오기 완료!*\n\n"
+                f"📌 키워드: {session.keyword}\n"
+                f"🏷️ 토픽: {len(session.selected_topics)}개\n"
+                f"♻️ 완료된 작업: 검색 {done_queries}건, PMC 전문 조회 {done_pmc}편\n\n"
+                f"중단된 지점부터 논문 검색을 이어갑니다...",
+                parse_mode='Markdown'
+            )
+            return await search_papers_and_show(update, context)
+
         elif step == '2_papers_searched':
             # 스타일 선택부터
             await query.edit_message_text(
@@ -1581,6 +1935,7 @@ async def handle_retry_selection(update: Update, context: ContextTypes.DEFAULT_T
 
 async def _generate_blog_from_session(update: Update, context: ContextTypes.DEFAULT_TYPE, session: BlogBotSession) -> int:
     """세션에서 블로그 생성"""
+    user_id = update.effective_user.id
     chat_id = update.effective_chat.id
 
     # Hook 스타일 정보 가져오기 (키가 없으면 첫 번째 스타일 사용)
@@ -1591,70 +1946,10 @@ async def _generate_blog_from_session(update: Update, context: ContextTypes.DEFA
         style_info = HOOK_STYLES[first_key]
         session.hook_style = first_key
 
-    # 로딩 표시 시작
-    loading = LoadingIndicator(
-        context.bot,
-        chat_id,
+    await enqueue_blog_generation(
+        context, user_id, chat_id, session, style_info,
         "*논문 분석 및 블로그 생성 중...*\n(재시도)"
     )
-    await loading.start()
-
-    try:
-        from concurrent.futures import ThreadPoolExecutor
-        from modules.auto_blog_generator import generate_blog_auto, get_last_error_log
-
-        session_data = {
-            'keyword': session.keyword,
-            'keyword_en': session.keyword_en,
-            'topics': list(session.selected_topics),
-            'hook_style': session.hook_style,
-            'hook_style_name': style_info['name'],
-            'hook_style_desc': style_info['desc'],
-            'hook_style_template': style_info.get('template', ''),
-            'papers': session.papers
-        }
-
-        loop = asyncio.get_event_loop()
-        with ThreadPoolExecutor() as executor:
-            html_path = await loop.run_in_executor(
-                executor,
-                generate_blog_auto,
-                session_data,
-                "output"
-            )
-
-        await loading.delete()
-
-        if html_path:
-            await context.bot.send_message(
-                chat_id=chat_id,
-                text=f"✅ *블로그 생성 완료!*\n\n📄 파일: `{html_path}`",
-                parse_mode='Markdown'
-            )
-
-            # 파일 전송
-            with open(html_path, 'rb') as f:
-                await context.bot.send_document(
-                    chat_id=chat_id,
-                    document=f,
-                    filename=os.path.basename(html_path)
-                )
-        else:
-            error_logs = get_last_error_log()
-            error_text = "\n".join(error_logs[-10:]) if error_logs else "알 수 없는 오류"
-            await context.bot.send_message(
-                chat_id=chat_id,
-                text=f"❌ *블로그 생성 실패*\n\n```\n{error_text[:1500]}\n```",
-                parse_mode='Markdown'
-            )
-
-    except Exception as e:
-        await loading.delete()
-        await context.bot.send_message(
-            chat_id=chat_id,
-            text=f"❌ 오류: {e}"
-        )
-
     return ConversationHandler.END
 
 
@@ -1662,20 +1957,202 @@ async def _generate_blog_from_session(update: Update, context: ContextTypes.DEFA
 SELECTING_RETRY = 99
 
 
-def main():
-    """봇 실행"""
-    # Config에서 토큰 가져오기 (dotenv 자동 로드)
-    token = Config.TELEGRAM_BOT_TOKEN
+# ===== 인기 키워드 사전 수집 =====
+
+PREFETCH_USER_ID = 0  # 사전 수집 작업의 작업 관리자 사용자 키 (실제 사용자와 겹치지 않음)
+
+
+def _prefetch_keyword(job: Job, keyword: str) -> Dict:
+    """
+    키워드 하나 사전 수집 (작업 스레드)
+    - 토픽 추출 결과와 키워드 단독/상위 토픽별 검색 결과를 새로 받아 웜 캐시 갱신
+    - 검색 웜 캐시는 쿼리('키워드 AND 토픽') 단위라 상위 토픽을 여러 개 고른 세션도 그대로 적중
+    - 점수 평가는 선택한 토픽 조합 단위로 저장되므로 키워드 단독, 토픽 하나씩,
+      상위 토픽 전체를 함께 고른 조합까지 실행 (그 밖의 조합은 검색/PMC 캐시만 적중)
+    - PMC 전문은 웜 캐시에 없거나 만료된 논문만 조회
+    - 점수 평가/인사이트 번역 결과는 각 저장소에 남음
+    """
+    result = _extract_topics_job(job, keyword, refresh=True)
+    keyword_en = result.get('main_keyword_en', keyword)
+    topics = list(_collect_topics(result))[:Config.PREFETCH_TOPICS]
+
+    topic_sets = [set()] + [{topic} for topic in topics]
+    if len(topics) > 1:
+        topic_sets.append(set(topics))
+
+    stats = {'topics': len(topics), 'runs': 0, 'papers': 0, 'fulltext': 0, 'accepted': 0}
+    for topic_set in topic_sets:
+        job.check_cancelled()
+        session = BlogBotSession()
+        session.persist = False
+        session.session_id = f"prefetch_{session.session_id}"
+        session.keyword = keyword
+        session.keyword_en = keyword_en
+        session.selected_topics = topic_set
+        try:
+            # 여러 토픽 조합의 쿼리는 앞의 토픽별 실행에서 이미 새로 받았으므로 웜 캐시 사용
+            searched = _search_papers_job(job, session, refresh=len(topic_set) <= 1)
+        finally:
+            get_checkpoint_store().clear(session.checkpoint_key)
+        stats['runs'] += 1
+        stats['papers'] += searched['unique_count']
+        stats['fulltext'] += searched['fulltext_count']
+        stats['accepted'] += searched['accepted_count']
+    return stats
+
+
+def _prefetch_job(job: Job, keywords: List[str]) -> Dict:
+    """설정된 키워드 사전 수집 (작업 스레드) → 보고서"""
+    return run_prefetch(keywords, partial(_prefetch_keyword, job), should_stop=lambda: job.cancelled)
+
+
+async def _on_prefetch_done(job: Job):
+    """사전 수집 완료 기록"""
+    if job.state == Job.FAILED:
+        print(f"[사전수집] 실패: {job.error}")
+    elif job.state == Job.DONE:
+        print(f"[사전수집] 완료\n{format_report(job.result)}")
+
+
+def submit_prefetch(keywords: List[str] = None) -> Job:
+    """사전 수집 작업 등록 (가장 낮은 우선순위, 이미 실행/대기 중이면 None)"""
+    keywords = keywords or Config.PREFETCH_KEYWORDS
+    manager = get_job_manager()
+    if not keywords or manager.jobs_for_user(PREFETCH_USER_ID):
+        return None
+    return manager.submit(PREFETCH_USER_ID, 'prefetch', _prefetch_job, keywords, on_done=_on_prefetch_done,
+                          trace_id=f"prefetch_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+
+
+async def scheduled_prefetch(context: ContextTypes.DEFAULT_TYPE):
+    """매일 한가한 시간대에 사전 수집 시작 (job_queue)"""
+    if submit_prefetch():
+        print(f"[사전수집] 시작: {', '.join(Config.PREFETCH_KEYWORDS)}")
+
+
+async def prefetch_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """마지막 사전 수집 보고서"""
+    await update.message.reply_text(format_report(load_report()))
+
+
+# ===== 운영 통계 =====
+
+def _rate(hits: float, total: float) -> str:
+    return f"{hits / total:.0%}" if total else "-"
+
+
+def format_stats() -> str:
+    """/stats 응답 텍스트 (이 프로세스의 메트릭 + 단계별 지연)"""
+    registry = get_registry()
+
+    def value(name: str, **labels) -> int:
+        metric = registry.get(name)
+        return int(metric.value(**labels)) if metric else 0
+
+    uptime = int(time.time() - registry.started_at)
+    sessions = user_sessions.stats()
+    jobs = get_job_manager().stats()
+    lines = [
+        f"📊 봇 상태 (가동 {uptime // 3600}시간 {uptime % 3600 // 60}분, PID {os.getpid()})",
+        "",
+        f"👤 세션: 메모리 {sessions['entries']}개 / 내보냄 {sessions['spilled']}개, "
+        f"누적 시작 {value('blog_sessions_created_total')}개",
+        f"⚙️ 작업: 실행 {jobs['running']} / 대기 {jobs['queued']}, "
+        f"완료 {value('blog_jobs_finished_total', state=Job.DONE)}, "
+        f"실패 {value('blog_jobs_finished_total', state=Job.FAILED)}, "
+        f"취소 {value('blog_jobs_finished_total', state=Job.CANCELLED)}",
+        f"📝 블로그: 성공 {value('blog_blogs_generated_total', result='ok')} / "
+        f"실패 {value('blog_blogs_generated_total', result='failed')}",
+    ]
 
-    if not token:
-        print("❌ TELEGRAM_BOT_TOKEN이 설정되지 않았습니다.")
-        print("   .env 파일에 TELEGRAM_BOT_TOKEN=your_token 을 추가하세요.")
-        print("   토큰은 @BotFather 에서 발급받을 수 있습니다.")
+    llm_total = value('blog_llm_calls_total')
+    llm_failed = value('blog_llm_calls_total', result='error') + value('blog_llm_calls_total', result='timeout')
+    lines.append(
+        f"🤖 LLM 호출: {llm_total}회 (캐시 적중 {_rate(value('blog_llm_calls_total', result='cache_hit'), llm_total)}, "
+        f"오류/시간초과 {llm_failed}회)"
+    )
+
+    cache_requests = registry.get('blog_cache_requests_total')
+    caches = sorted({labels['cache'] for _, labels, _ in cache_requests.samples()}) if cache_requests else []
+    if caches:
+        rates = [f"{c} {_rate(cache_requests.value(cache=c, result='hit'), cache_requests.value(cache=c))}"
+                 for c in caches]
+        lines.append(f"💾 캐시 적중률: {', '.join(rates)}")
+
+    lines.append(
+        f"🔬 NCBI 요청: {value('blog_http_client_requests_total', service='ncbi')}회, "
+        f"429 {value('blog_http_client_requests_total', service='ncbi', status=429)}회, "
+        f"연결 오류 {value('blog_http_client_requests_total', service='ncbi', status='error')}회"
+    )
+
+    tg_ok = value('blog_telegram_requests_total', result='ok')
+    tg_coalesced = value('blog_telegram_requests_total', result='coalesced')
+    tg_retry = value('blog_telegram_requests_total', result='retry_after')
+    tg_errors = value('blog_telegram_requests_total') - tg_ok - tg_coalesced - tg_retry
+    lines.append(f"✈️ 텔레그램 발신: {tg_ok}회, 병합 {tg_coalesced}, 429 {tg_retry}, 오류 {tg_errors}")
+
+    # 누적 소요 시간이 큰 단계부터
+    stages = get_tracer().histograms()
+    if stages:
+        lines += ["", "⏱️ 단계 지연 (p50 / p95, 누적 시간 순)"]
+        top = sorted(stages.items(), key=lambda item: item[1]['mean_ms'] * item[1]['count'], reverse=True)
+        for name, h in top[:8]:
+            lines.append(f"  {name}: {h['p50_ms'] / 1000:.1f}초 / {h['p95_ms'] / 1000:.1f}초 ({h['count']}회)")
+    return "\n".join(lines)
+
+
+async def stats_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """운영 통계 (ADMIN_USER_IDS에 있는 사용자만)"""
+    if update.effective_user.id not in Config.ADMIN_USER_IDS:
+        await update.message.reply_text("⛔ 관리자만 사용할 수 있는 명령입니다.")
         return
+    await update.message.reply_text(format_stats())
 
-    # 봇 애플리케이션 생성
-    application = Application.builder().token(token).build()
 
+async def _shutdown_jobs(app: Application):
+    """종료 시 백그라운드 작업 정리 (단계별 히스토그램 저장)"""
+    get_job_manager().shutdown()
+    tracer = get_tracer()
+    if tracer.enabled:
+        try:
+            tracer.export_histograms(_histogram_path)
+            print(tracer.format_histograms())
+        except OSError as e:
+            print(f"[추적] 히스토그램 저장 실패: {e}")
+
+
+def build_application(webhook: bool = False, worker_index: int = 0) -> Application:
+    """
+    봇 애플리케이션 생성 (핸들러, 주기 작업 등록)
+
+    Args:
+        webhook: True면 업데이터 없이 생성 (웹훅 워커 프로세스가 업데이트를 직접 전달)
+        worker_index: 웹훅 워커 번호 (사전 수집은 0번 워커만 예약)
+    """
+    global _histogram_path
+    # 모든 발신 요청은 속도 제한기를 거침 (수정 요청 병합, 429 재시도)
+    # 웹훅 모드에서는 워커마다 제한기가 따로 있으므로 전역 한도를 워커 수로 나눔
+    rate_limiter = OutboundRateLimiter(
+        global_rate=Config.TG_GLOBAL_RATE / Config.BOT_WORKERS if webhook else None
+    )
+    builder = (
+        Application.builder()
+        .token(Config.TELEGRAM_BOT_TOKEN)
+        .rate_limiter(rate_limiter)
+        .post_shutdown(_shutdown_jobs)
+    )
+    if webhook:
+        builder = builder.updater(None)
+        # 작업 관리자/LLM 호출 슬롯도 워커마다 따로 있으므로 전체 상한을 워커 수로 나눔
+        configure_job_manager(**worker_limits(Config.BOT_WORKERS))
+        set_llm_concurrency(Config.LLM_MAX_CONCURRENCY // Config.BOT_WORKERS)
+        _histogram_path = os.path.join(Config.TRACE_DIR, f"stages_worker{worker_index}.json")
+    application = builder.build()
+    # 진행 이벤트 전달/세션 정리/사전 수집이 모두 job_queue에 의존하므로 없으면 바로 중단
+    if application.job_queue is None:
+        raise RuntimeError(
+            "job_queue를 사용할 수 없습니다. pip install \"python-telegram-bot[job-queue]\" 로 설치하세요."
+        )
     # 대화 핸들러 설정
     conv_handler = ConversationHandler(
         entry_points=[
@@ -1703,10 +2180,49 @@ def main():
             ],
         },
         fallbacks=[CommandHandler("cancel", cancel)],
+        # 무거운 단계는 작업으로 처리되므로 결과를 기다리는 중에도 /start, /retry 허용
+        allow_reentry=True,
     )
 
     application.add_handler(conv_handler)
     application.add_handler(CommandHandler("help", help_command))
+    application.add_handler(CommandHandler("prefetch", prefetch_command))
+    application.add_handler(CommandHandler("stats", stats_command))
+
+    # 백그라운드 작업 진행/완료 이벤트 전달
+    application.job_queue.run_repeating(dispatch_job_events, interval=Config.JOB_DISPATCH_INTERVAL, first=0)
+    # 유휴 세션 정리 (TTL 지난 세션을 저장소로 내보냄)
+    application.job_queue.run_repeating(sweep_sessions, interval=Config.SESSION_CACHE_SWEEP_INTERVAL)
+    # 버려진 세션의 단계 체크포인트 정리
+    application.job_queue.run_repeating(purge_checkpoints, interval=Config.CHECKPOINT_PURGE_INTERVAL, first=0)
+    # Prometheus 메트릭 (웹훅 워커는 워커마다 포트 하나씩: METRICS_PORT + 워커 번호)
+    if Config.METRICS_PORT:
+        start_metrics_server(Config.METRICS_PORT + worker_index)
+
+    # 인기 키워드 사전 수집 (매일 한가한 시간대, 웹훅 모드에서는 한 워커만)
+    if Config.PREFETCH_KEYWORDS and worker_index == 0:
+        application.job_queue.run_daily(scheduled_prefetch, time=dt_time(hour=Config.PREFETCH_HOUR, tzinfo=datetime.now().astimezone().tzinfo))
+
+    return application
+
+
+def main():
+    """봇 실행"""
+    # Config에서 토큰 가져오기 (dotenv 자동 로드)
+    token = Config.TELEGRAM_BOT_TOKEN
+
+    if not token:
+        print("❌ TELEGRAM_BOT_TOKEN이 설정되지 않았습니다.")
+        print("   .env 파일에 TELEGRAM_BOT_TOKEN=your_token 을 추가하세요.")
+        print("   토큰은 @BotFather 에서 발급받을 수 있습니다.")
+        return
+
+    # 웹훅 모드: 업데이트를 user_id 기준으로 여러 워커 프로세스에 분배
+    if Config.BOT_MODE == 'webhook':
+        run_webhook(token, build_application)
+        return
+
+    application = build_application()
 
     # 봇 실행
     print("🤖 블로그 생성 봇이 시작되었습니다!")
@@ -0,0 +1,13 @@
+"""테스트 공통 설정 - 캐시/세션 저장소를 임시 디렉터리로 돌리고 외부 서비스 사용 안 함"""
+import os
+import sys
+import tempfile
+
+_tmp = tempfile.mkdtemp(prefix='blog_tests_')
+os.environ.setdefault('CACHE_DIR', os.path.join(_tmp, 'cache'))
+os.environ.setdefault('SESSION_DIR', os.path.join(_tmp, 'session_data'))
+os.environ.setdefault('TRACE_DIR', os.path.join(_tmp, 'traces'))
+os.environ.setdefault('TRANSLATION_BACKEND', 'local')
+os.environ.setdefault('METRICS_PORT', '0')
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
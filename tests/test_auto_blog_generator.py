@@ -0,0 +1,73 @@
+"""자동 블로그 생성 테스트 (호출별 로그, 스트리밍 HTML 파일 쓰기)"""
+import threading
+
+from modules import auto_blog_generator
+from modules.auto_blog_generator import StreamingHTMLWriter, generate_blog_auto
+
+
+def test_error_log_is_per_call(tmp_path):
+    logs = {}
+
+    def run(keyword):
+        logs[keyword] = []
+        generate_blog_auto({'keyword': keyword, 'papers': []}, str(tmp_path), error_log=logs[keyword])
+
+    threads = [threading.Thread(target=run, args=(k,)) for k in ('커피', '수면', '비타민')]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    for keyword, log in logs.items():
+        assert any(keyword in line for line in log)
+        assert all(other not in line for line in log for other in logs if other != keyword)
+        assert log[-1] == "[오류] 논문이 없습니다"
+
+
+def test_extracts_only_on_interval_and_close(tmp_path, monkeypatch):
+    calls = []
+    original = auto_blog_generator._extract_html
+    monkeypatch.setattr(auto_blog_generator, '_extract_html', lambda text: calls.append(text) or original(text))
+
+    path = tmp_path / 'blog.html'
+    part = tmp_path / 'blog.html.part'
+    previews = []
+    writer = StreamingHTMLWriter(str(path), on_partial=previews.append, interval=3600)
+    for chunk in ['```html\n', '<h1>제목</h1>', '<p>본문</p>', '\n```']:
+        writer.feed(chunk)
+    assert calls == [] and part.read_text(encoding='utf-8') == ''
+
+    writer.close()
+    writer.close()
+    assert len(calls) == 1
+    assert part.read_text(encoding='utf-8') == '<h1>제목</h1><p>본문</p>'
+    assert previews == []
+
+
+def test_appends_between_ticks_and_notifies(tmp_path):
+    path = tmp_path / 'blog.html'
+    part = tmp_path / 'blog.html.part'
+    previews = []
+    writer = StreamingHTMLWriter(str(path), on_partial=previews.append, interval=0)
+    writer.feed('```html\n<h1>제목</h1>')
+    assert part.read_text(encoding='utf-8') == '<h1>제목</h1>'
+    assert not path.exists()
+    writer.feed('<p>본문</p>')
+    writer.commit()
+    writer.discard()
+    assert path.read_text(encoding='utf-8') == '<h1>제목</h1><p>본문</p>'
+    assert not part.exists()
+    assert previews == ['<h1>제목</h1>', '<h1>제목</h1><p>본문</p>']
+
+
+def test_failed_stream_leaves_no_file(tmp_path, monkeypatch):
+    def failing_stream(prompt, on_chunk, **kwargs):
+        on_chunk('```html\n<h1>제목</h1>')
+        raise TimeoutError('stream stalled')
+
+    monkeypatch.setattr(auto_blog_generator, 'stream_claude_cli', failing_stream)
+    path = tmp_path / 'blog.html'
+    html, error = auto_blog_generator.generate_html_with_claude(
+        '커피', [], '분석', 'question', '', stream_path=str(path))
+    assert html is None and 'TimeoutError' in error
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,47 @@
+"""단계 체크포인트 저장소 테스트"""
+import sqlite3
+import time
+
+from modules.checkpoint_store import CheckpointStore
+
+
+def test_purge_removes_only_old_units(tmp_path):
+    store = CheckpointStore(str(tmp_path / 'checkpoints.db'))
+    store.put('old', 'search', 'q1', [1])
+    store.put('new', 'search', 'q1', [2])
+    with store._conn:
+        store._conn.execute("UPDATE checkpoints SET created_at = ? WHERE session_key = 'old'", (time.time() - 100,))
+
+    assert store.purge(max_age=50) == 1
+    assert store.get('old', 'search', 'q1') is None
+    assert store.get('new', 'search', 'q1') == [2]
+
+
+def test_rewrite_keeps_created_at(tmp_path):
+    store = CheckpointStore(str(tmp_path / 'checkpoints.db'))
+    store.put('s', 'pmc', '1', {})
+    with store._conn:
+        store._conn.execute("UPDATE checkpoints SET created_at = 1")
+    store.put('s', 'pmc', '1', {'pmcid': 'PMC1'})
+
+    assert store.get('s', 'pmc', '1') == {'pmcid': 'PMC1'}
+    assert store.purge(max_age=50) == 1
+
+
+def test_migrates_table_without_created_at(tmp_path):
+    path = str(tmp_path / 'checkpoints.db')
+    conn = sqlite3.connect(path)
+    conn.execute("""
+        CREATE TABLE checkpoints (
+            session_key TEXT NOT NULL, stage TEXT NOT NULL, unit TEXT NOT NULL,
+            payload TEXT NOT NULL, done_at REAL NOT NULL,
+            PRIMARY KEY (session_key, stage, unit)
+        )
+    """)
+    conn.execute("INSERT INTO checkpoints VALUES ('s', 'search', 'q', '[]', 1)")
+    conn.commit()
+    conn.close()
+
+    store = CheckpointStore(path)
+    assert store.get('s', 'search', 'q') == []
+    assert store.purge(max_age=50) == 1
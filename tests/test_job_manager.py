@@ -0,0 +1,13 @@
+"""작업 관리자 테스트"""
+from config import Config
+from modules.job_manager import worker_limits
+
+
+def test_worker_limits_split_across_workers():
+    limits = worker_limits(2)
+    assert limits['max_workers'] == max(1, Config.JOB_WORKERS // 2)
+    for kind, limit in Config.JOB_KIND_LIMITS.items():
+        assert limits['kind_limits'][kind] == max(1, limit // 2)
+
+    # 상한보다 워커가 많아도 워커마다 최소 1
+    assert set(worker_limits(100)['kind_limits'].values()) == {1}
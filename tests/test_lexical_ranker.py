@@ -0,0 +1,35 @@
+"""로컬 어휘 사전 평가 테스트"""
+from modules.lexical_ranker import keyword_terms, prerank_papers
+
+
+def _papers():
+    return [
+        {'pmid': '1', 'title': 'Proton pump inhibitors for gastroesophageal reflux disease',
+         'abstract': 'GERD symptoms improved with PPI therapy in adults.'},
+        {'pmid': '2', 'title': 'Coffee intake and reflux symptoms',
+         'abstract': 'Coffee consumption was associated with heartburn.'},
+        {'pmid': '3', 'title': 'Knee osteoarthritis and exercise',
+         'abstract': 'Exercise therapy reduced knee pain.'},
+    ]
+
+
+def test_keyword_terms_korean_only():
+    assert keyword_terms('역류성식도염', '역류성식도염') == []
+    assert keyword_terms('역류성식도염', 'GERD reflux') == ['gerd', 'reflux']
+    assert keyword_terms('GERD', 'gastroesophageal reflux') == ['gastroesophageal', 'reflux', 'gerd']
+
+
+def test_prerank_korean_only_keyword_sends_all_to_llm():
+    papers = _papers()
+    for topics in ([], ['커피']):
+        accepted, rejected, uncertain = prerank_papers(papers, '역류성식도염', '역류성식도염', topics)
+        assert accepted == [] and rejected == []
+        assert [p['pmid'] for p in uncertain] == ['1', '2', '3']
+
+
+def test_prerank_english_keyword_rejects_unrelated():
+    accepted, rejected, uncertain = prerank_papers(
+        _papers(), '역류성식도염', 'gastroesophageal reflux disease', [], reject_score=15
+    )
+    assert '3' in [p['pmid'] for p in rejected]
+    assert '1' not in [p['pmid'] for p in rejected]
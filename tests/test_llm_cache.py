@@ -0,0 +1,66 @@
+"""LLM 응답 캐시 테스트"""
+import os
+import time
+
+from modules.llm_cache import LLMResponseCache
+
+
+def _age(cache, key, created_ago, used_ago):
+    """항목의 저장 시각/마지막 사용 시각을 과거로 이동"""
+    now = time.time()
+    os.utime(cache._path(key), (now - used_ago, now - created_ago))
+
+
+def test_expired_entry_is_miss_even_if_recently_used(tmp_path):
+    cache = LLMResponseCache(cache_dir=str(tmp_path), ttl=100, max_bytes=0, enabled=True)
+    cache.set('aa01', 'old')
+    _age(cache, 'aa01', created_ago=200, used_ago=1)
+
+    assert cache.get('aa01') is None
+    assert not os.path.exists(cache._path('aa01'))
+
+
+def test_get_keeps_created_time(tmp_path):
+    cache = LLMResponseCache(cache_dir=str(tmp_path), ttl=100, max_bytes=0, enabled=True)
+    cache.set('aa01', 'value')
+    _age(cache, 'aa01', created_ago=90, used_ago=90)
+
+    assert cache.get('aa01') == 'value'
+    st = os.stat(cache._path('aa01'))
+    assert time.time() - st.st_mtime > 80  # 사용해도 만료 시계는 그대로
+    assert time.time() - st.st_atime < 5
+
+    _age(cache, 'aa01', created_ago=110, used_ago=0)
+    assert cache.get('aa01') is None
+
+
+def test_eviction_drops_expired_then_least_recently_used(tmp_path):
+    cache = LLMResponseCache(cache_dir=str(tmp_path), ttl=1000, max_bytes=10 ** 6, enabled=True)
+    for key in ('aa01', 'aa02', 'aa03', 'aa04'):
+        cache.set(key, 'x' * 200)
+    entry_size = os.path.getsize(cache._path('aa01'))
+
+    # aa01: 최근 사용했지만 만료 / aa02: 오래전 저장, 최근 사용 / aa03: 최근 저장, 오래 안 씀
+    _age(cache, 'aa01', created_ago=2000, used_ago=1)
+    _age(cache, 'aa02', created_ago=900, used_ago=2)
+    _age(cache, 'aa03', created_ago=10, used_ago=500)
+    _age(cache, 'aa04', created_ago=5, used_ago=5)
+
+    # 2개만 남도록 용량 축소 후 저장으로 정리 유발
+    cache.max_bytes = int(entry_size * 3.2)
+    cache.set('aa05', 'x' * 200)
+
+    left = {key for key in ('aa01', 'aa02', 'aa03', 'aa04', 'aa05') if os.path.exists(cache._path(key))}
+    assert 'aa01' not in left  # 만료
+    assert 'aa03' not in left  # 가장 오래 안 씀
+    assert {'aa02', 'aa05'} <= left
+
+
+def test_overwrite_does_not_inflate_total_size(tmp_path):
+    cache = LLMResponseCache(cache_dir=str(tmp_path), ttl=100, max_bytes=0, enabled=True)
+    cache.set('aa01', 'first')
+    cache.set('aa02', 'other')
+    for _ in range(5):
+        cache.set('aa01', 'second value')
+
+    assert cache._total_bytes == cache._scan_total_bytes()
@@ -0,0 +1,91 @@
+"""LLM 호출 동시 실행 제한 테스트"""
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from config import Config
+from modules import llm_runner
+from modules.analysis_pipeline import AnalysisPipeline
+
+
+def test_cli_calls_share_process_wide_limit(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    running, peak = [0], [0]
+    lock = threading.Lock()
+
+    def fake_run(args, **kwargs):
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        time.sleep(0.05)
+        with lock:
+            running[0] -= 1
+        return subprocess.CompletedProcess(args, 0, stdout='ok', stderr='')
+
+    monkeypatch.setattr(llm_runner.subprocess, 'run', fake_run)
+
+    # 세션별 풀 여러 개가 동시에 호출해도 전체 상한을 넘지 않음
+    def session(n):
+        with ThreadPoolExecutor(max_workers=5) as pool:
+            list(pool.map(lambda i: llm_runner.run_claude_cli(f"prompt {n}-{i}", use_cache=False), range(5)))
+
+    threads = [threading.Thread(target=session, args=(n,)) for n in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert peak[0] == Config.LLM_MAX_CONCURRENCY
+
+
+def test_pipelines_share_one_executor():
+    first = AnalysisPipeline('커피', [])
+    second = AnalysisPipeline('수면', [])
+    assert first._executor is second._executor
+    first.close()
+    assert not second._executor._shutdown
+
+
+def test_stream_does_not_block_on_large_stderr(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    script = (
+        "import json, sys\n"
+        "sys.stderr.write('x' * 500000)\n"
+        "sys.stderr.flush()\n"
+        "print(json.dumps({'type': 'result', 'result': 'done'}))\n"
+    )
+    popen = subprocess.Popen
+    monkeypatch.setattr(llm_runner.subprocess, 'Popen',
+                        lambda args, **kwargs: popen([sys.executable, '-c', script], **kwargs))
+
+    chunks = []
+    result = llm_runner.stream_claude_cli('prompt', chunks.append, timeout=20, use_cache=False)
+    assert result.returncode == 0
+    assert result.stdout == 'done'
+    assert len(result.stderr) == 500000
+
+
+def test_latency_model_saves_are_throttled(tmp_path, monkeypatch):
+    from modules.prompt_packer import LatencyModel
+
+    path = tmp_path / 'llm_latency.json'
+    model = LatencyModel(str(path))
+    writes = []
+    original = model._save
+    monkeypatch.setattr(model, '_save', lambda: writes.append(1) or original())
+
+    for _ in range(20):
+        model.record('scoring', 2000, 1.0)
+    assert len(writes) == 1  # 첫 기록만 바로 저장
+
+    model.record('scoring', 2000, 300.0, timed_out=True)
+    assert len(writes) == 2  # 타임아웃은 즉시 저장
+
+    model.record('scoring', 2000, 1.0)
+    model.flush()
+    model.flush()
+    assert len(writes) == 3
+    assert LatencyModel(str(path))._state['scoring']['calls'] == 22
+    assert [p.name for p in tmp_path.iterdir()] == ['llm_latency.json']
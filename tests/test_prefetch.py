@@ -0,0 +1,30 @@
+"""인기 키워드 사전 수집 테스트"""
+import telegram_bot
+from modules.job_manager import Job
+
+
+def test_prefetch_covers_multi_topic_signature(monkeypatch):
+    monkeypatch.setattr(telegram_bot.Config, 'PREFETCH_TOPICS', 3)
+    monkeypatch.setattr(telegram_bot, '_extract_topics_job', lambda job, keyword, refresh=False: {
+        'main_keyword_en': 'coffee',
+        'topics': ['수면', '카페인', '불안', '위염'],
+    })
+    monkeypatch.setattr(telegram_bot, '_collect_topics',
+                        lambda result: {t: t for t in result['topics']})
+    runs = []
+
+    def fake_search(job, session, pipeline=None, refresh=False):
+        runs.append((frozenset(session.selected_topics), refresh))
+        return {'unique_count': 1, 'fulltext_count': 0, 'accepted_count': 1}
+
+    monkeypatch.setattr(telegram_bot, '_search_papers_job', fake_search)
+
+    stats = telegram_bot._prefetch_keyword(Job(telegram_bot.PREFETCH_USER_ID, 'prefetch', manager=None), '커피')
+    assert runs == [
+        (frozenset(), True),
+        (frozenset({'수면'}), True),
+        (frozenset({'카페인'}), True),
+        (frozenset({'불안'}), True),
+        (frozenset({'수면', '카페인', '불안'}), False),
+    ]
+    assert stats['runs'] == 5
@@ -0,0 +1,59 @@
+"""세션 캐시 내보내기 테스트"""
+import threading
+import time
+
+from modules.session_cache import SessionCache
+
+
+def _wait_for(predicate, timeout=2.0):
+    deadline = time.time() + timeout
+    while not predicate():
+        if time.time() > deadline:
+            raise AssertionError("시간 초과")
+        time.sleep(0.01)
+
+
+def test_spill_runs_outside_lock_and_off_caller_thread():
+    started, release = threading.Event(), threading.Event()
+    spill_threads = []
+
+    def spill(user_id, session):
+        spill_threads.append(threading.current_thread())
+        started.set()
+        release.wait(2)
+        return f"s{user_id}"
+
+    cache = SessionCache(spill=spill, reload=lambda uid, sid: f"reloaded-{sid}", max_entries=1, ttl=3600)
+    cache.put(1, 'one')
+    cache.put(2, 'two')  # 상한 초과 → 별도 스레드에서 1번 내보냄
+    assert started.wait(2)
+    assert spill_threads[0] is not threading.current_thread()
+
+    # 저장하는 동안에도 캐시는 잠겨 있지 않음
+    assert cache.get(2) == 'two'
+    assert len(cache) == 1
+    release.set()
+    _wait_for(lambda: cache.stats()['spilled'] == 1)
+    assert cache.get(1) == 'reloaded-s1'
+
+
+def test_session_requested_during_spill_stays_in_memory():
+    started, release = threading.Event(), threading.Event()
+
+    def spill(user_id, session):
+        started.set()
+        release.wait(2)
+        return f"s{user_id}"
+
+    cache = SessionCache(spill=spill, reload=lambda uid, sid: None, max_entries=10, ttl=0)
+    cache.put(1, 'one')
+    time.sleep(0.01)
+    sweeper = threading.Thread(target=cache.sweep)
+    sweeper.start()
+    assert started.wait(2)
+
+    assert cache.get(1) == 'one'  # 저장 중인 세션을 그대로 되돌림
+    release.set()
+    sweeper.join(2)
+    assert cache.stats()['spilled'] == 0
+    assert cache.get(1) == 'one'
@@ -0,0 +1,60 @@
+"""/retry 세션 목록 테스트"""
+import json
+from datetime import datetime
+
+from modules.session_store import get_session_store
+from telegram_bot import BlogBotSession
+
+
+def test_saved_sessions_are_per_user():
+    store = get_session_store()
+    now = datetime.now().isoformat()
+    store.save(101, 'retry_a', '커피', '2_papers_searched', now, {}, [])
+    store.save(202, 'retry_b', '수면', '3_style_selected', now, {}, [])
+
+    mine = BlogBotSession.list_saved_sessions(101)
+    assert [s['session_id'] for s in mine] == ['retry_a']
+    assert BlogBotSession.load(101, 'retry_b') is None
+    assert BlogBotSession.load(202, 'retry_b').keyword == '수면'
+
+
+def test_legacy_sessions_need_an_owner(tmp_path, monkeypatch):
+    from config import Config
+    from modules.session_store import SessionStore
+
+    legacy = tmp_path / 'legacy'
+    legacy.mkdir()
+    (legacy / 'a.json').write_text(json.dumps({
+        'keyword': '커피', 'created_at': '2024-01-02T03:04:05', 'step': '2_papers_searched', 'papers': [],
+    }), encoding='utf-8')
+
+    monkeypatch.setattr(Config, 'LEGACY_SESSION_OWNER', None)
+    store = SessionStore(str(tmp_path / 'sessions.db'), legacy_dir=str(legacy))
+    assert store.list_recent() == []
+
+    monkeypatch.setattr(Config, 'LEGACY_SESSION_OWNER', 303)
+    store = SessionStore(str(tmp_path / 'sessions.db'), legacy_dir=str(legacy))
+    assert [(s['user_id'], s['session_id']) for s in store.list_recent()] == [(303, '20240102_030405')]
+
+
+def test_unchanged_papers_skip_paper_store(tmp_path, monkeypatch):
+    from modules import session_store as session_store_module
+    from modules.session_store import SessionStore
+
+    calls = []
+    paper_store = session_store_module.get_paper_store()
+    original = paper_store.put_many
+    monkeypatch.setattr(paper_store, 'put_many', lambda papers: calls.append(len(papers)) or original(papers))
+
+    store = SessionStore(str(tmp_path / 'sessions.db'), legacy_dir=str(tmp_path))
+    papers = [{'pmid': '1', 'title': 'A'}, {'pmid': '2', 'title': 'B'}]
+    now = datetime.now().isoformat()
+    store.save(7, 's', '커피', '2_papers_searched', now, {}, papers)
+    store.save(7, 's', '커피', '3_style_selected', now, {'hook_style': 'q'}, papers)
+    assert calls == [2]
+    assert store.load(7, 's')['step'] == '3_style_selected'
+
+    papers[0]['insight'] = '요약'  # 제자리 주석 추가도 변경으로 봄
+    store.save(7, 's', '커피', '4_generation_started', now, {}, papers)
+    assert calls == [2, 2]
+    assert store.load(7, 's')['papers'][0]['insight'] == '요약'
@@ -0,0 +1,68 @@
+"""번역 서비스 테스트 (LocalBackend 사용)"""
+import threading
+
+from modules.translation_service import LocalBackend, TranslationService
+
+
+def _service(tmp_path, max_chars=4500):
+    backend = LocalBackend()
+    backend.MAX_CHARS = max_chars
+    return TranslationService(backend=backend, db_path=str(tmp_path / 'translations.db'), max_workers=4), backend
+
+
+def test_cache_keyed_by_text_and_direction(tmp_path):
+    service, backend = _service(tmp_path)
+    assert service.translate('coffee') == '[en→ko] coffee'
+    assert service.misses == 1 and backend.calls == 1
+
+    assert service.translate('coffee') == '[en→ko] coffee'
+    assert service.hits == 1 and backend.calls == 1
+
+    # 같은 원문이라도 방향이 다르면 별도 항목
+    assert service.translate('coffee', source='ko', target='en') == '[ko→en] coffee'
+    assert backend.calls == 2
+
+
+def test_misses_batched_into_few_requests(tmp_path):
+    service, backend = _service(tmp_path, max_chars=100)
+    texts = [f"sentence number {i}" for i in range(30)]
+    results = service.translate_many(texts + texts[:5])
+
+    assert results == [f"[en→ko] {t}" for t in texts + texts[:5]]
+    assert service.misses == 30  # 중복 제거
+    # 한 문장 20자 전후 → 요청당 4문장 안팎
+    assert 5 <= backend.calls <= 10
+
+
+def test_order_preserved_across_concurrent_calls(tmp_path):
+    service, backend = _service(tmp_path, max_chars=60)
+    results = {}
+
+    def run(n):
+        texts = [f"user {n} text {i}" for i in range(25)]
+        results[n] = (texts, service.translate_many(texts))
+
+    threads = [threading.Thread(target=run, args=(n,)) for n in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    for texts, translated in results.values():
+        assert translated == [f"[en→ko] {t}" for t in texts]
+
+
+def test_second_call_makes_no_backend_calls(tmp_path):
+    service, backend = _service(tmp_path, max_chars=100)
+    keywords = ['reflux', 'heartburn', 'proton pump inhibitor', 'esophagitis', 'coffee']
+    first = service.translate_many(keywords)
+    calls = backend.calls
+
+    second = service.translate_many(keywords)
+    assert second == first
+    assert backend.calls == calls
+
+    # 새 서비스(재시작)에서도 영구 캐시로 바로 반환
+    restarted = TranslationService(backend=backend, db_path=str(tmp_path / 'translations.db'))
+    assert restarted.translate_many(keywords) == first
+    assert backend.calls == calls
@@ -0,0 +1,120 @@
+"""웜 캐시/체크포인트에 실패 결과가 남지 않는지 테스트"""
+import requests
+
+import telegram_bot
+from modules.checkpoint_store import StageCheckpoints
+from modules.pubmed_search import PubMedSearcher
+from modules.warm_cache import get_warm_cache
+
+
+class Response:
+    def __init__(self, status_code=200, content=b''):
+        self.status_code = status_code
+        self.content = content
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code}")
+
+
+ESEARCH = b'<eSearchResult><IdList><Id>111</Id></IdList></eSearchResult>'
+EFETCH = (b'<PubmedArticleSet><PubmedArticle><MedlineCitation><PMID>111</PMID><Article>'
+          b'<ArticleTitle>Reflux</ArticleTitle><Abstract><AbstractText>GERD</AbstractText></Abstract>'
+          b'</Article></MedlineCitation></PubmedArticle></PubmedArticleSet>')
+
+
+def _searcher(monkeypatch, responses):
+    def fake_get(service, endpoint, url, **kwargs):
+        response = responses[endpoint]
+        if isinstance(response, Exception):
+            raise response
+        return response
+    monkeypatch.setattr('modules.pubmed_search.http_get', fake_get)
+    return PubMedSearcher(email='test@example.com')
+
+
+def test_failed_search_is_not_cached(monkeypatch):
+    searcher = _searcher(monkeypatch, {'esearch': Response(429)})
+    checkpoints = StageCheckpoints('search_fail', 'search')
+
+    assert telegram_bot._search_and_fetch(searcher, checkpoints, 'gerd failing', 30) == []
+    assert get_warm_cache().get_search('gerd failing', 30) is None
+    assert checkpoints.get('gerd failing|30') is None
+
+
+def test_zero_hits_and_success_are_cached(monkeypatch):
+    searcher = _searcher(monkeypatch, {'esearch': Response(content=b'<eSearchResult><IdList/></eSearchResult>')})
+    checkpoints = StageCheckpoints('search_ok', 'search')
+    assert telegram_bot._search_and_fetch(searcher, checkpoints, 'nothing here', 30) == []
+    assert get_warm_cache().get_search('nothing here', 30) == []
+
+    searcher = _searcher(monkeypatch, {'esearch': Response(content=ESEARCH), 'efetch': Response(content=EFETCH)})
+    papers = telegram_bot._search_and_fetch(searcher, checkpoints, 'gerd', 30)
+    assert [p['pmid'] for p in papers] == ['111']
+    assert [p['pmid'] for p in get_warm_cache().get_search('gerd', 30)] == ['111']
+
+
+def test_failed_fetch_after_search_is_not_cached(monkeypatch):
+    searcher = _searcher(monkeypatch, {'esearch': Response(content=ESEARCH),
+                                       'efetch': requests.ConnectionError('reset')})
+    checkpoints = StageCheckpoints('fetch_fail', 'search')
+    assert telegram_bot._search_and_fetch(searcher, checkpoints, 'gerd efetch', 30) == []
+    assert get_warm_cache().get_search('gerd efetch', 30) is None
+
+
+def _fetcher(monkeypatch, responses):
+    from modules.pmc_fulltext import PMCFullTextFetcher
+
+    def fake_get(service, endpoint, url, **kwargs):
+        response = responses[endpoint]
+        if isinstance(response, Exception):
+            raise response
+        return response
+    monkeypatch.setattr('modules.pmc_fulltext.http_get', fake_get)
+    monkeypatch.setattr('modules.pmc_fulltext.time.sleep', lambda s: None)
+    return PMCFullTextFetcher(email='test@example.com')
+
+
+class JSONResponse(Response):
+    def __init__(self, data, status_code=200):
+        super().__init__(status_code)
+        self._data = data
+
+    def json(self):
+        return self._data
+
+
+def test_pmc_failure_is_not_cached(monkeypatch):
+    fetcher = _fetcher(monkeypatch, {'elink': requests.Timeout('slow')})
+    checkpoints = StageCheckpoints('pmc_fail', 'pmc')
+    assert telegram_bot._lookup_fulltext(fetcher, checkpoints, '901') == ({}, 'error')
+    assert get_warm_cache().get_pmc('901') is None
+    assert checkpoints.get('901') is None
+
+    fetcher = _fetcher(monkeypatch, {'elink': JSONResponse({}, status_code=429)})
+    assert telegram_bot._lookup_fulltext(fetcher, checkpoints, '901') == ({}, 'error')
+    assert get_warm_cache().get_pmc('901') is None
+
+
+def test_pmc_no_fulltext_is_cached(monkeypatch):
+    fetcher = _fetcher(monkeypatch, {'elink': JSONResponse({'linksets': [{'linksetdbs': []}]})})
+    checkpoints = StageCheckpoints('pmc_none', 'pmc')
+    assert telegram_bot._lookup_fulltext(fetcher, checkpoints, '902') == ({}, 'pmc')
+    assert get_warm_cache().get_pmc('902') == {}
+    assert telegram_bot._lookup_fulltext(fetcher, StageCheckpoints('pmc_none2', 'pmc'), '902') == ({}, 'warm_cache')
+
+
+def test_degraded_topics_are_not_cached(monkeypatch):
+    results = {
+        '폴백': {'main_keyword': '폴백', 'blogs_analyzed': 10, 'top_topics': ['커피'], 'fallback': True},
+        '블로그없음': {'main_keyword': '블로그없음', 'blogs_analyzed': 0, 'top_topics': [], 'fallback': False},
+        '정상': {'main_keyword': '정상', 'blogs_analyzed': 10, 'top_topics': ['커피'], 'fallback': False},
+    }
+    monkeypatch.setattr(telegram_bot.SmartTopicExtractor, '__init__', lambda self: None)
+    monkeypatch.setattr(telegram_bot.SmartTopicExtractor, 'extract_topics', lambda self, keyword, n: results[keyword])
+
+    for keyword, result in results.items():
+        assert telegram_bot._extract_topics_job(None, keyword) == result
+    assert get_warm_cache().get_topics('폴백') is None
+    assert get_warm_cache().get_topics('블로그없음') is None
+    assert get_warm_cache().get_topics('정상') == results['정상']
@@ -0,0 +1,122 @@
+"""웹훅 수신 서버 테스트 (로컬 HTTP/HTTPS 서버 + 가짜 분배기)"""
+import http.client
+import json
+import shutil
+import ssl
+import subprocess
+import threading
+
+import pytest
+
+from modules.webhook_server import extract_user_id, make_server, shard_for
+
+
+class StubDispatcher:
+    """워커 프로세스 대신 분배 결과만 기록"""
+
+    def __init__(self, workers=4):
+        self.workers = workers
+        self.received = []
+
+    def dispatch(self, update):
+        index = shard_for(update, self.workers)
+        self.received.append((index, update))
+        return index
+
+
+@pytest.fixture
+def server():
+    def start(secret='', cert=None, key=None):
+        dispatcher = StubDispatcher()
+        httpd = make_server(dispatcher, listen='127.0.0.1', port=0, path='/telegram',
+                            secret=secret, cert=cert, key=key)
+        threading.Thread(target=httpd.serve_forever, daemon=True).start()
+        started.append(httpd)
+        return httpd, dispatcher
+
+    started = []
+    yield start
+    for httpd in started:
+        httpd.shutdown()
+        httpd.server_close()
+
+
+def _post(httpd, body, path='/telegram', headers=None, context=None):
+    host, port = httpd.server_address
+    if context:
+        conn = http.client.HTTPSConnection(host, port, context=context, timeout=5)
+    else:
+        conn = http.client.HTTPConnection(host, port, timeout=5)
+    data = body if isinstance(body, bytes) else json.dumps(body).encode()
+    conn.request('POST', path, body=data, headers={'Content-Type': 'application/json', **(headers or {})})
+    status = conn.getresponse().status
+    conn.close()
+    return status
+
+
+def _message(update_id, user_id, chat_id=None):
+    return {'update_id': update_id,
+            'message': {'message_id': 1, 'from': {'id': user_id}, 'chat': {'id': chat_id or user_id}, 'text': 'hi'}}
+
+
+def test_extract_user_id():
+    assert extract_user_id(_message(1, 42)) == 42
+    assert extract_user_id({'update_id': 2, 'callback_query': {'id': 'x', 'from': {'id': 7},
+                                                              'message': {'chat': {'id': -100}}}}) == 7
+    assert extract_user_id({'update_id': 3, 'channel_post': {'chat': {'id': -200}}}) == -200
+    assert extract_user_id({'update_id': 4}) is None
+
+
+def test_same_user_same_shard():
+    for user_id in (1, 42, 123456789, -1001):
+        shards = {shard_for(_message(n, user_id), 4) for n in range(20)}
+        callback = {'update_id': 99, 'callback_query': {'id': 'x', 'from': {'id': user_id}}}
+        shards.add(shard_for(callback, 4))
+        assert len(shards) == 1
+    assert {shard_for(_message(1, u), 4) for u in range(8)} == {0, 1, 2, 3}
+
+
+def test_dispatches_updates(server):
+    httpd, dispatcher = server()
+    for n, user_id in enumerate([11, 12, 11, 13, 11]):
+        assert _post(httpd, _message(n, user_id)) == 200
+
+    assert len(dispatcher.received) == 5
+    shards = {index for index, update in dispatcher.received if update['message']['from']['id'] == 11}
+    assert shards == {shard_for(_message(0, 11), 4)}
+
+
+def test_rejects_bad_requests(server):
+    httpd, dispatcher = server(secret='s3cret')
+    assert _post(httpd, _message(1, 1), headers={'X-Telegram-Bot-Api-Secret-Token': 's3cret'}) == 200
+    assert _post(httpd, _message(2, 1)) == 403
+    assert _post(httpd, _message(3, 1), headers={'X-Telegram-Bot-Api-Secret-Token': 'wrong'}) == 403
+    assert _post(httpd, _message(4, 1), path='/other', headers={'X-Telegram-Bot-Api-Secret-Token': 's3cret'}) == 404
+    assert _post(httpd, b'{not json', headers={'X-Telegram-Bot-Api-Secret-Token': 's3cret'}) == 400
+    assert len(dispatcher.received) == 1
+
+
+@pytest.mark.skipif(not shutil.which('openssl'), reason='openssl 없음')
+def test_https_termination(server, tmp_path):
+    cert, key = tmp_path / 'cert.pem', tmp_path / 'key.pem'
+    subprocess.run(['openssl', 'req', '-x509', '-newkey', 'rsa:2048', '-nodes', '-days', '1',
+                    '-subj', '/CN=127.0.0.1', '-keyout', str(key), '-out', str(cert)],
+                   check=True, capture_output=True)
+    httpd, dispatcher = server(cert=str(cert), key=str(key))
+
+    context = ssl.create_default_context(cafile=str(cert))
+    context.check_hostname = False
+    assert _post(httpd, _message(1, 5), context=context) == 200
+    assert dispatcher.received[0][1]['message']['from']['id'] == 5
+
+
+@pytest.mark.filterwarnings("ignore:No `JobQueue` set up")
+def test_build_application_requires_job_queue(monkeypatch):
+    import telegram_bot
+
+    builder = telegram_bot.Application.builder
+    monkeypatch.setattr(telegram_bot.Config, 'TELEGRAM_BOT_TOKEN', '123456:TEST')
+    monkeypatch.setattr(telegram_bot.Application, 'builder', staticmethod(lambda: builder().job_queue(None)))
+
+    with pytest.raises(RuntimeError, match='job-queue'):
+        telegram_bot.build_application()